@@ -0,0 +1,173 @@
+"""
+In-process API for the backend guard.
+
+`check_root`, `check_paths` and `check_source` run the same rules as the
+command line and yield `Violation`s as each file is checked. They take a
+`GuardConfig` instead of flags and write nothing: no report files, result
+cache or rule cost history, and nothing is printed. A declarative rule file
+that cannot be loaded raises `RuleFileError`.
+
+    from backend_guard.api import GuardConfig, check_root
+
+    for violation in check_root("lumos-api-service", GuardConfig(only=("i18n",))):
+        print(violation.to_console())
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from .core import (
+    DEFAULT_EXCLUDE_GLOBS,
+    DEFAULT_PREFETCH_DEPTH,
+    DEFAULT_RULE_TIME_BUDGET_SECONDS,
+    FileContext,
+    JAVA_EXTENSION,
+    JAVA_SOURCE_ROOTS,
+    ProjectContext,
+    ProjectIndexBuilder,
+    ProjectRule,
+    Rule,
+    RuleEngine,
+    RunScope,
+    Violation,
+    build_file_context,
+    changed_scope,
+    check_auxiliary_rules,
+    load_declared_rules,
+    resolve_jobs,
+    run_project_rules,
+    select_rules,
+    stream_file_rules,
+    streaming_scope,
+)
+from .discovery import SourceDiscovery
+from .git_changes import ChangeSet
+from .read_ahead import ReadStats
+from .rules import RuleFileError, unknown_selection
+
+if TYPE_CHECKING:
+    from .rules.declarative import DeclarativeRule
+
+
+@dataclass(frozen=True)
+class GuardConfig:
+    # Rule ids or groups, as for --only; empty runs every rule.
+    only: tuple[str, ...] = ()
+    # Scanned besides src/main/java and src/test/java, as for --source-root.
+    source_roots: tuple[str, ...] = ()
+    # Added to the default excludes, as for --exclude.
+    excludes: tuple[str, ...] = ()
+    use_gitignore: bool = True
+    strict: bool = False
+    # Worker processes for the file rules; 0 uses one per CPU core.
+    jobs: int = 1
+    prefetch: int = DEFAULT_PREFETCH_DEPTH
+    rule_time_budget: float = DEFAULT_RULE_TIME_BUDGET_SECONDS
+    # Declarative rule file, as for --rules, relative to the project root.
+    rules_file: str = ""
+
+
+def check_root(root: str | Path, config: GuardConfig | None = None) -> Iterator[Violation]:
+    # Every source under the project root. Files are read and checked one at
+    # a time; project rules and message bundle checks follow the last file.
+    config = config or GuardConfig()
+    root = Path(root).resolve()
+    rules = _load_selected_rules(config, load_declared_rules(root, config.rules_file))
+    discovery = _discover_sources(root, config)
+    scope = streaming_scope(discovery, config.prefetch, ReadStats())
+    return _iter_scope(scope, rules, _project_context(discovery.root, [], config), config)
+
+
+def check_paths(root: str | Path, paths: Iterable[str | Path], config: GuardConfig | None = None) -> Iterator[Violation]:
+    # The given files under the project root, with the same rules for
+    # project-wide and message bundle checks as --changed-since. Paths that
+    # do not exist count as deleted; paths the discovery excludes are skipped.
+    config = config or GuardConfig()
+    root = Path(root).resolve()
+    rules = _load_selected_rules(config, load_declared_rules(root, config.rules_file))
+    discovery = _discover_sources(root, config)
+    change_set = ChangeSet()
+    for path in paths:
+        rel_path = _relative_path(discovery.root, Path(path))
+        target = change_set.modified if (discovery.root / rel_path).exists() else change_set.deleted
+        target.append(rel_path)
+    scope = changed_scope(discovery, change_set, False, config.prefetch, ReadStats())
+    return _iter_scope(scope, rules, _project_context(discovery.root, scope.project_files, config), config)
+
+
+def check_source(text: str, rel_path: str, config: GuardConfig | None = None) -> Iterator[Violation]:
+    # One in-memory source under a virtual project-relative path, which
+    # decides its tags as it would on disk. Only the file rules run: project
+    # rules and message bundle checks need the rest of the tree. There is no
+    # project root, so declarative rules come only from a configured file,
+    # relative to the working directory.
+    config = config or GuardConfig()
+    declared = load_declared_rules(Path.cwd(), config.rules_file) if config.rules_file != "" else []
+    rules = _load_selected_rules(config, declared)
+    file_ctx = build_file_context(Path("."), rel_path, text)
+    engine = RuleEngine([rule for rule in rules if not isinstance(rule, ProjectRule)], rule_time_budget=config.rule_time_budget)
+    return iter(engine.check(file_ctx, _project_context(Path("."), [], config)))
+
+
+def _load_selected_rules(config: GuardConfig, declared: list[DeclarativeRule]) -> list[Rule]:
+    # Checked when the call is made, not when the first violation is pulled.
+    only_filters = set(config.only)
+    unknown = unknown_selection(only_filters, (rule.name for rule in declared))
+    if len(unknown) > 0:
+        raise ValueError(f"unknown rule id or group: {', '.join(unknown)}")
+    return select_rules(only_filters, declared)
+
+
+def _discover_sources(root: Path, config: GuardConfig) -> SourceDiscovery:
+    return SourceDiscovery(
+        root,
+        JAVA_SOURCE_ROOTS + config.source_roots,
+        JAVA_EXTENSION,
+        excludes=DEFAULT_EXCLUDE_GLOBS + config.excludes,
+        use_gitignore=config.use_gitignore,
+    )
+
+
+def _project_context(root: Path, java_files: list[FileContext], config: GuardConfig) -> ProjectContext:
+    return ProjectContext(root=root, java_files=java_files, strict=config.strict, only_filters=set(config.only))
+
+
+def _relative_path(root: Path, path: Path) -> str:
+    if not path.is_absolute():
+        return path.as_posix()
+    try:
+        return path.resolve().relative_to(root).as_posix()
+    except ValueError:
+        raise ValueError(f"{path} is not under {root}") from None
+
+
+def _iter_scope(scope: RunScope, rules: list[Rule], project_ctx: ProjectContext, config: GuardConfig) -> Iterator[Violation]:
+    file_rules = [rule for rule in rules if not isinstance(rule, ProjectRule)]
+    project_rules = [rule for rule in rules if isinstance(rule, ProjectRule)]
+    # Streamed files feed the project index as they pass, as in --stream.
+    builder = ProjectIndexBuilder()
+
+    def indexed(files: Iterable[FileContext]) -> Iterator[FileContext]:
+        for file_ctx in files:
+            builder.add(file_ctx)
+            yield file_ctx
+
+    files = indexed(scope.file_stream) if scope.file_stream is not None else scope.java_files
+    engine = RuleEngine(file_rules, rule_time_budget=config.rule_time_budget)
+    for found in stream_file_rules(files, engine, project_ctx, resolve_jobs(config.jobs), None):
+        yield from found
+
+    if len(project_rules) > 0:
+        if scope.file_stream is not None and builder.anchor != "":
+            yield from run_project_rules(project_rules, builder.build())
+        elif len(project_ctx.java_files) > 0:
+            yield from run_project_rules(project_rules, project_ctx.index)
+    yield from check_auxiliary_rules(
+        scope.read_text,
+        project_ctx.only_filters,
+        scope.check_vietnamese_messages,
+        scope.check_message_keys,
+    )
@@ -0,0 +1,124 @@
+"""
+Violation baseline for --baseline and --write-baseline.
+
+A fingerprint hashes the rule, the file, the whitespace-normalized snippet and
+the nearest non-blank line above the violation, so it survives lines being
+inserted or removed elsewhere in the file. Identical violations in one file
+are told apart by their occurrence order. The baseline file is a sorted list
+of fingerprints, one per line, and is matched through an in-memory set.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+from typing import Callable, Iterable, Protocol
+
+
+BASELINE_HEADER = "# backend_guard baseline v1"
+FINGERPRINT_BYTES = 8
+
+
+class BaselineError(Exception):
+    pass
+
+
+class FingerprintedViolation(Protocol):
+    rule: str
+    file: str
+    line: int
+    snippet: str
+
+
+class Fingerprinter:
+    # Reads each file lazily for the context line. Violations arrive grouped
+    # by file, so only the last file read is kept.
+    def __init__(self, read_text: Callable[[str], str | None]) -> None:
+        self._read_text = read_text
+        self._lines_path: str | None = None
+        self._lines: list[str] = []
+        self._occurrences: dict[bytes, int] = {}
+
+    def fingerprint(self, violation: FingerprintedViolation) -> str:
+        hasher = hashlib.blake2b(digest_size=FINGERPRINT_BYTES)
+        for part in (violation.rule, violation.file, _normalize(violation.snippet), self._context(violation)):
+            hasher.update(part.encode("utf-8"))
+            hasher.update(b"\0")
+        key = hasher.digest()
+        occurrence = self._occurrences.get(key, 0)
+        self._occurrences[key] = occurrence + 1
+        hasher.update(str(occurrence).encode("ascii"))
+        return hasher.hexdigest()
+
+    def _context(self, violation: FingerprintedViolation) -> str:
+        lines = self._file_lines(violation.file)
+        for index in range(min(violation.line, len(lines) + 1) - 2, -1, -1):
+            normalized = _normalize(lines[index])
+            if normalized != "":
+                return normalized
+        return ""
+
+    def _file_lines(self, rel_path: str) -> list[str]:
+        if rel_path != self._lines_path:
+            try:
+                text = self._read_text(rel_path)
+            except (OSError, UnicodeDecodeError):
+                text = None
+            self._lines_path = rel_path
+            self._lines = text.splitlines() if text is not None else []
+        return self._lines
+
+
+class BaselineFilter:
+    # Drops violations whose fingerprint is in the baseline.
+    def __init__(self, known: frozenset[str], fingerprinter: Fingerprinter) -> None:
+        self.known = known
+        self.fingerprinter = fingerprinter
+        self.suppressed = 0
+        self._matched: set[str] = set()
+
+    def __call__(self, violations: list) -> list:
+        fresh = []
+        for violation in violations:
+            fingerprint = self.fingerprinter.fingerprint(violation)
+            if fingerprint in self.known:
+                self.suppressed += 1
+                self._matched.add(fingerprint)
+                continue
+            fresh.append(violation)
+        return fresh
+
+    def stale(self) -> int:
+        return len(self.known) - len(self._matched)
+
+
+class BaselineRecorder:
+    # Passes every violation through and keeps its fingerprint.
+    def __init__(self, fingerprinter: Fingerprinter) -> None:
+        self.fingerprinter = fingerprinter
+        self.fingerprints: set[str] = set()
+
+    def __call__(self, violations: list) -> list:
+        for violation in violations:
+            self.fingerprints.add(self.fingerprinter.fingerprint(violation))
+        return violations
+
+
+def load_baseline(path: Path) -> frozenset[str]:
+    try:
+        text = path.read_text(encoding="utf-8")
+    except OSError as error:
+        raise BaselineError(f"cannot read baseline {path}: {error}") from error
+    lines = text.splitlines()
+    if len(lines) == 0 or lines[0] != BASELINE_HEADER:
+        raise BaselineError(f"{path} is not a backend guard baseline")
+    return frozenset(line.strip() for line in lines[1:] if line.strip() != "")
+
+
+def write_baseline(path: Path, fingerprints: Iterable[str]) -> None:
+    body = "".join(f"{fingerprint}\n" for fingerprint in sorted(set(fingerprints)))
+    path.write_text(f"{BASELINE_HEADER}\n{body}", encoding="utf-8")
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split())
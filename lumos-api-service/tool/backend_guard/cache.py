@@ -0,0 +1,92 @@
+"""
+On-disk result cache for incremental backend guard runs.
+
+Entries are keyed by file path and validated against a content digest, and the
+whole cache is discarded when the rule set or the guard sources change.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Iterable
+
+
+CACHE_FILE = ".backend_guard_cache.json"
+CACHE_SCHEMA_VERSION = 1
+
+
+def content_digest(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def combined_digest(parts: Iterable[str]) -> str:
+    hasher = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        hasher.update(part.encode("utf-8"))
+        hasher.update(b"\0")
+    return hasher.hexdigest()
+
+
+def rule_set_fingerprint(rule_names: Iterable[str], definitions: Iterable[str] = ()) -> str:
+    # `definitions` are digests of rules defined outside the package, such as declarative ones.
+    package_dir = Path(__file__).resolve().parent
+    parts = [f"schema={CACHE_SCHEMA_VERSION}"]
+    for source in sorted(package_dir.rglob("*.py")):
+        parts.append(f"{source.relative_to(package_dir).as_posix()}={content_digest(source.read_text(encoding='utf-8'))}")
+    parts.extend(sorted(rule_names))
+    parts.extend(sorted(definitions))
+    return combined_digest(parts)
+
+
+class ResultCache:
+    def __init__(self, path: Path, fingerprint: str, entries: dict[str, dict]) -> None:
+        self.path = path
+        self.fingerprint = fingerprint
+        self._entries = entries
+        self._touched: dict[str, dict] = {}
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: Path, fingerprint: str) -> "ResultCache":
+        if not path.exists():
+            return cls(path, fingerprint, {})
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cls(path, fingerprint, {})
+        if not isinstance(payload, dict) or payload.get("fingerprint") != fingerprint:
+            return cls(path, fingerprint, {})
+        entries = payload.get("entries")
+        if not isinstance(entries, dict):
+            return cls(path, fingerprint, {})
+        return cls(path, fingerprint, entries)
+
+    def get(self, key: str, digest: str) -> list[list] | None:
+        entry = self._entries.get(key)
+        if entry is None or entry.get("digest") != digest:
+            return None
+        self._touched[key] = entry
+        return entry["rows"]
+
+    def put(self, key: str, digest: str, rows: list[list]) -> None:
+        entry = {"digest": digest, "rows": rows}
+        self._entries[key] = entry
+        self._touched[key] = entry
+        self._dirty = True
+
+    def save(self, prune: bool = True) -> None:
+        if not self._dirty and (not prune or len(self._touched) == len(self._entries)):
+            return
+        # A full run keeps only the entries it saw, so deleted files drop out;
+        # a partial run keeps everything it did not revisit.
+        kept = self._touched if prune else self._entries
+        payload = {
+            "fingerprint": self.fingerprint,
+            "entries": {key: kept[key] for key in sorted(kept)},
+        }
+        try:
+            self.path.write_text(json.dumps(payload, ensure_ascii=True, separators=(",", ":")), encoding="utf-8")
+        except OSError:
+            return
@@ -11,189 +11,159 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import re
 import sys
+import time
+from collections import deque
 from dataclasses import dataclass
+from functools import cached_property
+from itertools import accumulate
 from pathlib import Path
-from typing import Iterable
-
-
-RULE_CLASS_MAX_LINES = "CLASS_MAX_LINES"
-RULE_CONTROLLER_REST = "CONTROLLER_REST_CONTROLLER"
-RULE_CONTROLLER_TX = "CONTROLLER_NO_TRANSACTIONAL"
-RULE_CONTROLLER_ENTITY_RESPONSE = "CONTROLLER_NO_ENTITY_RESPONSE"
-RULE_CONTROLLER_API_VERSION = "CONTROLLER_API_VERSIONING"
-RULE_CONTROLLER_API_DOC = "CONTROLLER_API_DOC_REQUIRED"
-RULE_REPOSITORY_EXTENDS_JPA = "REPOSITORY_EXTENDS_JPA_REPOSITORY"
-RULE_ENTITY_NO_DATA = "ENTITY_NO_LOMBOK_DATA"
-RULE_ENTITY_HAS_ID = "ENTITY_HAS_ID"
-RULE_ENTITY_NO_LAYER_DEP = "ENTITY_NO_SERVICE_REPOSITORY_DEP"
-RULE_ENTITY_RELATION_FETCH = "ENTITY_RELATION_FETCH_LAZY"
-RULE_ENTITY_MANY_TO_ONE_JOIN = "ENTITY_MANY_TO_ONE_HAS_JOIN_COLUMN"
-RULE_ENTITY_AUDIT_LIFECYCLE = "ENTITY_AUDIT_LIFECYCLE"
-RULE_SHARED_MAPPED_SUPERCLASS = "ENTITY_SHARED_FIELDS_MAPPED_SUPERCLASS"
-RULE_ENTITY_OPTIMISTIC_LOCK = "ENTITY_HAS_VERSION_FOR_OPTIMISTIC_LOCK"
-RULE_ENTITY_ENUM_STRING = "ENTITY_ENUMERATED_STRING"
-RULE_SOFT_DELETE_NO_HARD_DELETE = "SOFT_DELETE_NO_HARD_DELETE_CALL"
-RULE_SOFT_DELETE_FIND_FILTER = "SOFT_DELETE_FIND_QUERY_FILTER"
-RULE_MAPSTRUCT_MAPPER_REQUIRED = "MAPSTRUCT_MAPPER_REQUIRED"
-RULE_MAPSTRUCT_NO_MANUAL_MAPPING = "MAPSTRUCT_NO_MANUAL_MAPPING_IN_SERVICE_CONTROLLER"
-RULE_DTO_VALIDATION_ANNOTATION = "DTO_REQUEST_VALIDATION_ANNOTATION_REQUIRED"
-RULE_DTO_VALIDATION_MESSAGE_CONSTANT = "DTO_VALIDATION_MESSAGE_MUST_USE_STATIC_CONSTANT"
-RULE_LOMBOK_REQUIRED_ARGS_CONSTRUCTOR = "LOMBOK_REQUIRED_ARGS_CONSTRUCTOR_FOR_SPRING_BEAN"
-RULE_LOMBOK_ENTITY_GETTER_SETTER = "LOMBOK_ENTITY_GETTER_SETTER_REQUIRED"
-RULE_LOMBOK_BUILDER_PREFERRED = "LOMBOK_BUILDER_PREFERRED_FOR_DTO_CLASS"
-RULE_NESTED_FOR_STREAM = "NESTED_FOR_SHOULD_USE_STREAM_INNER_LOOP"
-RULE_NO_ELSE = "NO_ELSE_ALLOWED"
-RULE_AUDIT_ENTITY_SEPARATE_CLASS = "AUDIT_FIELDS_ENTITY_MUST_USE_SEPARATE_BASE_CLASS"
-RULE_AUDIT_DTO_SEPARATE_CLASS = "AUDIT_FIELDS_DTO_MUST_USE_SEPARATE_MODEL"
-RULE_EXCEPTION_SERIAL_VERSION_UID = "EXCEPTION_MUST_DECLARE_SERIAL_VERSION_UID"
-RULE_VI_MESSAGES_ACCENTED = "VI_MESSAGES_MUST_BE_VIETNAMESE_ACCENTED"
-RULE_NO_DIRECT_TRIM = "NO_DIRECT_TRIM_USE_STRINGUTILS"
-RULE_NO_DIRECT_BLANK_CHECK = "NO_DIRECT_BLANK_CHECK_USE_STRINGUTILS"
-RULE_NO_DIRECT_STRING_PREDICATE = "NO_DIRECT_STRING_PREDICATE_USE_STRINGUTILS"
-RULE_QUERY_NATIVE_SQL_ONLY = "QUERY_MUST_USE_NATIVE_SQL"
-RULE_QUERY_KEYWORD_UPPERCASE = "QUERY_SQL_KEYWORDS_MUST_BE_UPPERCASE"
-RULE_JAVADOC_CONTROLLER_REQUIRED = "JAVADOC_REQUIRED_FOR_CONTROLLER_AND_ENDPOINTS"
-RULE_JAVADOC_SERVICE_REQUIRED = "JAVADOC_REQUIRED_FOR_SERVICE_METHODS"
-RULE_IF_REQUIRES_COMMENT = "IF_STATEMENT_REQUIRES_PRECEDING_COMMENT"
-RULE_THROW_REQUIRES_COMMENT = "THROW_STATEMENT_REQUIRES_PRECEDING_COMMENT"
-RULE_FOR_REQUIRES_COMMENT = "FOR_STATEMENT_REQUIRES_PRECEDING_COMMENT"
-RULE_STREAM_REQUIRES_COMMENT = "STREAM_CALL_REQUIRES_PRECEDING_COMMENT"
-RULE_RETURN_REQUIRES_COMMENT = "RETURN_STATEMENT_REQUIRES_PRECEDING_COMMENT"
-RULE_EXCEPTION_MESSAGE_I18N = "EXCEPTION_MESSAGE_MUST_USE_I18N_KEY"
-RULE_MESSAGE_KEYS_BUNDLE = "ERROR_MESSAGE_KEYS_MUST_EXIST_IN_MESSAGE_BUNDLES"
-
-SEVERITY_ERROR = "ERROR"
-SEVERITY_WARNING = "WARN"
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
+
+from .cache import CACHE_FILE, ResultCache, content_digest, rule_set_fingerprint
+from .java_lexer import TOKEN_PATTERN, LexedSource, lex_java
+from .line_index import LineIndex
+from .literal_scan import LiteralScanner
+from .reporting import (
+    DEFAULT_FORMATS,
+    REPORT_FILE,
+    REPORT_FORMATS,
+    SEVERITY_ERROR,
+    SEVERITY_WARNING,
+    JsonSink,
+    ReportCounts,
+    ReportWriter,
+    build_sinks,
+    count_violations,
+    parse_formats,
+    summary_header,
+)
+from .rule_costs import RULE_COSTS_FILE, RuleCostHistory
+from .rules import (
+    DECLARATIVE_RULES_FILE,
+    REGISTERED_RULES,
+    RULE_MESSAGE_KEYS_BUNDLE,
+    RULE_VI_MESSAGES_ACCENTED,
+    RuleFileError,
+    load_rule_module,
+    load_rules,
+    resolve_selection,
+    rule_modules,
+    unknown_selection,
+)
+
+# The watch, language server, git, read-ahead, profiling and baseline modules
+# pull in sockets, threads and subprocesses, so they are imported by the code
+# paths that use them rather than on every start.
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ProcessPoolExecutor
+
+    from .baseline import BaselineFilter
+    from .discovery import SourceDiscovery
+    from .git_changes import ChangeSet
+    from .profiling import RunProfile
+    from .read_ahead import ReadStats
+    from .regex_audit import AuditTarget
+    from .rules.declarative import DeclarativeRule
+    from .violation_store import ViolationStore
+    from .watch import FileStamp
+
+
+# Reported by the rule engine itself when it skips work.
+RULE_LINE_TOO_LONG = "GUARD_LINE_TOO_LONG_SKIPPED"
+RULE_TIME_BUDGET = "GUARD_RULE_TIME_BUDGET_EXCEEDED"
 
 JAVA_EXTENSION = ".java"
-CLASS_MAX_LINES = 300
-REPORT_FILE = "backend_guard_report.json"
-I18N_ALLOW_TECHNICAL_LITERAL_MARKER = "backend-guard: allow-technical-literal"
+JAVA_SOURCE_ROOTS = ("src/main/java", "src/test/java")
+# Annotation-processor output such as MapStruct implementations is never checked.
+DEFAULT_EXCLUDE_GLOBS = ("**/generated/**", "**/generated-sources/**")
+# Longer lines are generated or minified code; line rules skip them.
+MAX_LINE_LENGTH = 2000
+# Off unless asked for: timing every visit costs about a third of the line
+# checks, and what gets stopped depends on the machine, not on the sources.
+DEFAULT_RULE_TIME_BUDGET_SECONDS = 0.0
+SKIPPED_SNIPPET_LENGTH = 120
+BASELINE_FILE = "backend_guard_baseline.txt"
+DEFAULT_PROFILE_TOP = 10
+PARALLEL_CHUNKS_PER_JOB = 4
+DEFAULT_PREFETCH_DEPTH = 64
 MESSAGE_BUNDLE_FILES = (
     "src/main/resources/messages.properties",
     "src/main/resources/messages_en.properties",
     "src/main/resources/messages_vi.properties",
 )
+VI_MESSAGES_FILE = "src/main/resources/messages_vi.properties"
+ERROR_MESSAGE_KEYS_FILE = "src/main/java/com/lumos/common/error/ErrorMessageKeys.java"
+AUXILIARY_RULE_FILES = (VI_MESSAGES_FILE, ERROR_MESSAGE_KEYS_FILE, *MESSAGE_BUNDLE_FILES)
+DEFAULT_POLL_INTERVAL_SECONDS = 1.0
+PROJECT_RULE_PATH_TOKENS = ("/entity/", "/dto/", "/mapper/")
+
+TAG_MAIN_SOURCE = "source:main"
+TAG_TEST_SOURCE = "source:test"
+TAG_CONTROLLER_LAYER = "layer:controller"
+TAG_SERVICE_LAYER = "layer:service"
+TAG_REPOSITORY_LAYER = "layer:repository"
+TAG_REPOSITORY_PROJECTION_LAYER = "layer:repository_projection"
+TAG_ENTITY_LAYER = "layer:entity"
+TAG_DTO_LAYER = "layer:dto"
+TAG_DTO_REQUEST_LAYER = "layer:dto_request"
+TAG_MAPPER_LAYER = "layer:mapper"
+TAG_EXCEPTION_LAYER = "layer:exception"
+TAG_ERROR_LAYER = "layer:error"
+TAG_MODE_LAYER = "layer:mode"
+TAG_SECURITY_LAYER = "layer:security"
+TAG_ENTITY = "stereotype:entity"
+TAG_MAPPED_SUPERCLASS = "stereotype:mapped_superclass"
+TAG_REST_CONTROLLER = "stereotype:rest_controller"
+TAG_SERVICE = "stereotype:service"
+TAG_MAPPER = "stereotype:mapper"
+TAG_SPRING_BEAN = "stereotype:spring_bean"
+# Suffixed with the first declared type keyword: class, interface, enum or record.
+TAG_KIND_PREFIX = "kind:"
+SOURCE_SET_TAGS = (
+    ("src/main/java/", TAG_MAIN_SOURCE),
+    ("src/test/java/", TAG_TEST_SOURCE),
+)
+# Extra source sets such as src/integrationTest/java are classified as tests.
+EXTRA_SOURCE_SET_PATTERN = re.compile(r"src/[^/]+/java/")
+LAYER_PATH_TAGS = (
+    ("/controller/", TAG_CONTROLLER_LAYER),
+    ("/service/", TAG_SERVICE_LAYER),
+    ("/repository/", TAG_REPOSITORY_LAYER),
+    ("/repository/projection/", TAG_REPOSITORY_PROJECTION_LAYER),
+    ("/entity/", TAG_ENTITY_LAYER),
+    ("/dto/", TAG_DTO_LAYER),
+    ("/dto/request/", TAG_DTO_REQUEST_LAYER),
+    ("/mapper/", TAG_MAPPER_LAYER),
+    ("/exception/", TAG_EXCEPTION_LAYER),
+    ("/error/", TAG_ERROR_LAYER),
+    ("/mode/", TAG_MODE_LAYER),
+    ("/security/", TAG_SECURITY_LAYER),
+)
 
-RELATION_PATTERN = re.compile(r"@\s*(OneToMany|ManyToOne|ManyToMany|OneToOne)\s*(\((.*?)\))?")
-REQUEST_MAPPING_PATTERN = re.compile(r'@\s*RequestMapping\s*\(\s*"([^"]+)"')
-ENTITY_RESPONSE_PATTERN = re.compile(r"\bResponseEntity<\s*\w+Entity\s*>")
-DIRECT_ENTITY_RETURN_PATTERN = re.compile(r"\bpublic\s+(\w+Entity)\s+\w+\s*\(")
 INTERFACE_PATTERN = re.compile(r"\binterface\s+\w+")
-EXTENDS_JPA_PATTERN = re.compile(r"\bextends\s+JpaRepository<")
-IMPORT_SERVICE_OR_REPO_PATTERN = re.compile(r"^import\s+.*\.(service|repository)\.", re.MULTILINE)
 ENTITY_CLASS_PATTERN = re.compile(r"@\s*Entity\b")
 MAPPED_SUPERCLASS_PATTERN = re.compile(r"@\s*MappedSuperclass\b")
 MAPSTRUCT_MAPPER_PATTERN = re.compile(r"@\s*Mapper\b")
-ID_ANNOTATION_PATTERN = re.compile(r"@\s*Id\b")
-LOMBOK_DATA_PATTERN = re.compile(r"@\s*Data\b")
-PRE_PERSIST_PATTERN = re.compile(r"@\s*PrePersist\b")
-PRE_UPDATE_PATTERN = re.compile(r"@\s*PreUpdate\b")
-CREATED_DATE_PATTERN = re.compile(r"@\s*CreatedDate\b")
-LAST_MODIFIED_DATE_PATTERN = re.compile(r"@\s*LastModifiedDate\b")
-VERSION_PATTERN = re.compile(r"@\s*Version\b")
-ENUMERATED_PATTERN = re.compile(r"@\s*Enumerated\b")
-ENUMERATED_STRING_PATTERN = re.compile(r"@\s*Enumerated\s*\(\s*EnumType\.STRING\s*\)")
-HARD_DELETE_CALL_PATTERN = re.compile(r"\.\s*delete(ById|All|AllById)?\s*\(")
-FIND_METHOD_PATTERN = re.compile(r"^\s*(?:Page<.*>|List<.*>|Optional<.*>|[\w<>?,\s]+)\s+find\w*\s*\(")
-MAPPING_ANNOTATION_PATTERN = re.compile(r"^\s*@\s*(GetMapping|PostMapping|PutMapping|PatchMapping|DeleteMapping)\b")
-OPERATION_ANNOTATION_PATTERN = re.compile(r"^\s*@\s*Operation\b")
-QUERY_ANNOTATION_PATTERN = re.compile(r"^\s*@\s*Query\b")
-REST_CONTROLLER_ANNOTATION_PATTERN = re.compile(r"^\s*@\s*RestController\b")
-PUBLIC_METHOD_START_PATTERN = re.compile(r"^\s*public\s+.+\(.+\).*")
-IF_STATEMENT_PATTERN = re.compile(r"^\s*if\s*\(")
-THROW_STATEMENT_PATTERN = re.compile(r"^\s*throw\b")
-STREAM_CALL_PATTERN = re.compile(r"\.\s*stream\s*\(")
-RETURN_STATEMENT_PATTERN = re.compile(r"^\s*return\b")
-THROW_NEW_EXCEPTION_LITERAL_PATTERN = re.compile(
-    r'throw\s+new\s+[A-Za-z_][A-Za-z0-9_]*Exception\s*\([^)]*"([^"]+)"'
-)
-RESPONSE_STATUS_EXCEPTION_LITERAL_PATTERN = re.compile(
-    r'new\s+ResponseStatusException\s*\([^)]*"([^"]+)"'
-)
-MESSAGE_SOURCE_LITERAL_PATTERN = re.compile(
-    r'messageSource\s*\.\s*getMessage\s*\(\s*"([^"]+)"'
-)
-MESSAGE_KEY_CONSTANT_PATTERN = re.compile(
-    r'public\s+static\s+final\s+String\s+[A-Z0-9_]+\s*=\s*"([^"]+)";'
-)
-MANUAL_MAPPING_NEW_PATTERN = re.compile(r"\bnew\s+\w+(Entity|Dto|DTO|Response|Request)\s*\(")
-DTO_VALIDATION_ANNOTATION_PATTERN = re.compile(
-    r"@\s*(Valid|NotNull|NotBlank|NotEmpty|Size|Pattern|Min|Max|Positive|PositiveOrZero|Negative|NegativeOrZero|Email|Past|PastOrPresent|Future|FutureOrPresent|AssertTrue|AssertFalse)\b"
-)
-VALIDATION_ANNOTATION_START_PATTERN = re.compile(
-    r"@\s*(NotNull|NotBlank|NotEmpty|Size|Pattern|Min|Max|Positive|PositiveOrZero|Negative|NegativeOrZero|Email|Past|PastOrPresent|Future|FutureOrPresent|AssertTrue|AssertFalse)\b"
-)
-VALIDATION_LITERAL_MESSAGE_PATTERN = re.compile(r'message\s*=\s*"[^"]*"')
+LEADING_TOKEN_PATTERN = re.compile(r"^\s*(@|\w+)")
 SPRING_BEAN_PATTERN = re.compile(r"@\s*(Service|Component|RestController|Controller|Configuration)\b")
-REQUIRED_ARGS_CONSTRUCTOR_PATTERN = re.compile(r"@\s*RequiredArgsConstructor\b")
-FINAL_FIELD_PATTERN = re.compile(r"^\s*private\s+final\s+[\w<>, ?]+\s+\w+\s*;")
-CONSTRUCTOR_PATTERN = re.compile(r"^\s*public\s+([A-Z]\w*)\s*\(")
-LOMBOK_GETTER_OR_SETTER_PATTERN = re.compile(r"@\s*(Getter|Setter)\b")
-MANUAL_GETTER_OR_SETTER_PATTERN = re.compile(r"^\s*public\s+[\w<>, ?\[\]]+\s+(get|set|is)[A-Z]\w*\s*\(")
-LOMBOK_BUILDER_PATTERN = re.compile(r"@\s*Builder\b")
-RECORD_PATTERN = re.compile(r"\brecord\s+[A-Z]\w*\s*\(")
-PRIVATE_FIELD_PATTERN = re.compile(r"^\s*private\s+[\w<>, ?\[\]]+\s+\w+\s*;")
-FOR_PATTERN = re.compile(r"^\s*for\s*\(")
-ELSE_PATTERN = re.compile(r"\belse\b")
-CLASS_DECLARATION_PATTERN = re.compile(r"\bclass\s+([A-Z]\w*)\s*(?:extends\s+([A-Z]\w*))?")
-AUDIT_FIELD_DECLARATION_PATTERN = re.compile(
-    r"\b(createdAt|updatedAt|deletedAt|deleted|isDeleted)\b"
-)
-EXCEPTION_CLASS_PATTERN = re.compile(r"\bclass\s+([A-Z]\w*Exception)\s+extends\s+[\w.]*Exception\b")
-SERIAL_VERSION_UID_PATTERN = re.compile(
-    r"private\s+static\s+final\s+long\s+serialVersionUID\s*=\s*[-]?\d+L\s*;"
-)
-VIETNAMESE_ACCENTED_CHAR_PATTERN = re.compile(r"[àáạảãâầấậẩẫăằắặẳẵèéẹẻẽêềếệểễìíịỉĩòóọỏõôồốộổỗơờớợởỡùúụủũưừứựửữỳýỵỷỹđÀÁẠẢÃÂẦẤẬẨẪĂẰẮẶẲẴÈÉẸẺẼÊỀẾỆỂỄÌÍỊỈĨÒÓỌỎÕÔỒỐỘỔỖƠỜỚỢỞỠÙÚỤỦŨƯỪỨỰỬỮỲÝỴỶỸĐ]")
-DIRECT_TRIM_PATTERN = re.compile(r"\.\s*trim\s*\(")
-DIRECT_IS_BLANK_PATTERN = re.compile(r"\.\s*isBlank\s*\(")
-NULL_OR_BLANK_PATTERN = re.compile(r"==\s*null.*\|\|.*\.isBlank\s*\(")
-DIRECT_STARTS_WITH_PATTERN = re.compile(r"\.\s*startsWith\s*\(")
-DIRECT_ENDS_WITH_PATTERN = re.compile(r"\.\s*endsWith\s*\(")
-DIRECT_CONTAINS_PATTERN = re.compile(r"\.\s*contains\s*\(")
-DIRECT_EQUALS_PATTERN = re.compile(r"\.\s*equals\s*\(")
-DIRECT_EQUALS_IGNORE_CASE_PATTERN = re.compile(r"\.\s*equalsIgnoreCase\s*\(")
-DEPRECATED_STRINGUTILS_EQUALS_PATTERN = re.compile(r"StringUtils\.equals\s*\(")
-DEPRECATED_STRINGUTILS_EQUALS_IGNORE_CASE_PATTERN = re.compile(r"StringUtils\.equalsIgnoreCase\s*\(")
-DEPRECATED_STRINGUTILS_COMPARE_IGNORE_CASE_PATTERN = re.compile(r"StringUtils\.compareIgnoreCase\s*\(")
-NULL_OR_EMPTY_SAME_VAR_PATTERN = re.compile(r"\b([A-Za-z_][A-Za-z0-9_]*)\s*==\s*null\s*\|\|\s*\1\s*\.\s*isEmpty\s*\(")
-NOT_NULL_AND_EMPTY_SAME_VAR_PATTERN = re.compile(r"\b([A-Za-z_][A-Za-z0-9_]*)\s*!=\s*null\s*&&\s*\1\s*\.\s*isEmpty\s*\(")
-NOT_NULL_AND_NOT_EMPTY_SAME_VAR_PATTERN = re.compile(
-    r"\b([A-Za-z_][A-Za-z0-9_]*)\s*!=\s*null\s*&&\s*!\s*\1\s*\.\s*isEmpty\s*\("
+REST_CONTROLLER_PATTERN = re.compile(r"@\s*RestController\b")
+SERVICE_ANNOTATION_PATTERN = re.compile(r"@\s*Service\b")
+TYPE_DECLARATION_PATTERN = re.compile(r"\b(class|interface|enum|record)\s+[A-Z]\w*")
+# (tag, literal that must be present before the pattern is tried, pattern)
+STEREOTYPE_TAG_PATTERNS = (
+    (TAG_ENTITY, "Entity", ENTITY_CLASS_PATTERN),
+    (TAG_MAPPED_SUPERCLASS, "MappedSuperclass", MAPPED_SUPERCLASS_PATTERN),
+    (TAG_REST_CONTROLLER, "RestController", REST_CONTROLLER_PATTERN),
+    (TAG_SERVICE, "Service", SERVICE_ANNOTATION_PATTERN),
+    (TAG_MAPPER, "Mapper", MAPSTRUCT_MAPPER_PATTERN),
+    (TAG_SPRING_BEAN, "@", SPRING_BEAN_PATTERN),
 )
-JPQL_ENTITY_FROM_PATTERN = re.compile(r"\bfrom\s+[A-Z]\w+\b")
-LOWERCASE_SQL_KEYWORD_PATTERNS = [
-    re.compile(r"\bselect\b"),
-    re.compile(r"\bfrom\b"),
-    re.compile(r"\bwhere\b"),
-    re.compile(r"\bjoin\b"),
-    re.compile(r"\bleft\b"),
-    re.compile(r"\bright\b"),
-    re.compile(r"\binner\b"),
-    re.compile(r"\bouter\b"),
-    re.compile(r"\bon\b"),
-    re.compile(r"\band\b"),
-    re.compile(r"\bor\b"),
-    re.compile(r"\bunion\b"),
-    re.compile(r"\ball\b"),
-    re.compile(r"\bwith\b"),
-    re.compile(r"\brecursive\b"),
-    re.compile(r"\border\s+by\b"),
-    re.compile(r"\bgroup\s+by\b"),
-    re.compile(r"\bupdate\b"),
-    re.compile(r"\bset\b"),
-    re.compile(r"\bin\b"),
-    re.compile(r"\bis\b"),
-    re.compile(r"\bnull\b"),
-    re.compile(r"\blower\s*\("),
-    re.compile(r"\bupper\s*\("),
-    re.compile(r"\bcount\s*\("),
-]
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Violation:
     rule: str
     severity: str
@@ -213,14 +183,114 @@ class FileContext:
     text: str
     lines: list[str]
 
+    @cached_property
+    def lexed(self) -> LexedSource:
+        return lex_java(self.text)
+
+    @cached_property
+    def tags(self) -> frozenset[str]:
+        return _classify_file(self.rel_path, self.text)
+
+    @cached_property
+    def line_index(self) -> LineIndex:
+        return LineIndex(self.lines)
+
+    @cached_property
+    def line_starts(self) -> list[int]:
+        # Offsets follow the same line breaks as `lines`, whatever the newline style.
+        starts = list(accumulate((len(raw) for raw in self.text.splitlines(keepends=True)), initial=0))
+        starts.pop()
+        return starts if len(starts) > 0 else [0]
+
+
+@dataclass(frozen=True)
+class TagFilter:
+    all_of: tuple[str, ...] = ()
+    any_of: tuple[str, ...] = ()
+    none_of: tuple[str, ...] = ()
+
+    def matches(self, tags: frozenset[str]) -> bool:
+        if not all(tag in tags for tag in self.all_of):
+            return False
+        if len(self.any_of) > 0 and not any(tag in tags for tag in self.any_of):
+            return False
+        return not any(tag in tags for tag in self.none_of)
+
 
 class Rule:
     name: str
+    # Files are routed to the rule only when their classification tags match.
+    tag_filter = TagFilter()
+    # The rule can only report when the file text contains one of these; empty means always run.
+    required_literals: tuple[str, ...] = ()
 
     def check(self, file_ctx: FileContext, project_ctx: "ProjectContext") -> Iterable[Violation]:
         raise NotImplementedError
 
 
+class ProjectRule(Rule):
+    def check_project(self, index: "ProjectIndex") -> Iterable[Violation]:
+        raise NotImplementedError
+
+
+@dataclass(frozen=True)
+class ProjectIndex:
+    anchor: str
+    entity_files: list[str]
+    audited_entity_files: list[str]
+    mapper_files: list[str]
+    has_entity_in_entity_package: bool
+    has_dto: bool
+    has_mapstruct_mapper: bool
+    has_mapped_superclass: bool
+
+
+class ProjectIndexBuilder:
+    def __init__(self) -> None:
+        self.anchor = ""
+        self.entity_files: list[str] = []
+        self.audited_entity_files: list[str] = []
+        self.mapper_files: list[str] = []
+        self.has_entity_in_entity_package = False
+        self.has_dto = False
+        self.has_mapstruct_mapper = False
+        self.has_mapped_superclass = False
+
+    def add(self, file_ctx: FileContext) -> None:
+        rel_path = file_ctx.rel_path
+        text = file_ctx.text
+        if self.anchor == "":
+            self.anchor = rel_path
+        if "/dto/" in rel_path:
+            self.has_dto = True
+        # The literal checks skip the regexes for most files.
+        if "MappedSuperclass" in text and MAPPED_SUPERCLASS_PATTERN.search(text) is not None:
+            self.has_mapped_superclass = True
+        if "/mapper/" in rel_path:
+            self.mapper_files.append(rel_path)
+            if MAPSTRUCT_MAPPER_PATTERN.search(text) is not None and INTERFACE_PATTERN.search(text) is not None:
+                self.has_mapstruct_mapper = True
+        if "Entity" not in text or ENTITY_CLASS_PATTERN.search(text) is None:
+            return
+        self.entity_files.append(rel_path)
+        if "/entity/" in rel_path:
+            self.has_entity_in_entity_package = True
+        if "createdAt" in text and "updatedAt" in text:
+            self.audited_entity_files.append(rel_path)
+
+    def build(self) -> ProjectIndex:
+        return ProjectIndex(
+            anchor=self.anchor,
+            entity_files=self.entity_files,
+            audited_entity_files=self.audited_entity_files,
+            mapper_files=self.mapper_files,
+            has_entity_in_entity_package=self.has_entity_in_entity_package,
+            has_dto=self.has_dto,
+            has_mapstruct_mapper=self.has_mapstruct_mapper,
+            has_mapped_superclass=self.has_mapped_superclass,
+        )
+
+
 @dataclass
 class ProjectContext:
     root: Path
@@ -228,1795 +298,1319 @@ class ProjectContext:
     strict: bool
     only_filters: set[str]
 
+    @cached_property
+    def index(self) -> ProjectIndex:
+        return _build_project_index(self.java_files)
 
-class MaxClassLinesRule(Rule):
-    name = RULE_CLASS_MAX_LINES
 
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        line_count = len(file_ctx.lines)
-        if line_count <= CLASS_MAX_LINES:
-            return []
-        return [
-            Violation(
-                rule=self.name,
-                severity=SEVERITY_WARNING,
-                file=file_ctx.rel_path,
-                line=1,
-                reason=f"Class file exceeds {CLASS_MAX_LINES} lines (found {line_count}).",
-                snippet=file_ctx.rel_path,
-            )
-        ]
+@dataclass
+class RunScope:
+    java_files: list[FileContext]
+    project_files: list[FileContext]
+    read_text: Callable[[str], str | None]
+    check_vietnamese_messages: bool = True
+    check_message_keys: bool = True
+    partial: bool = False
+    # Set in streaming mode; files are then read lazily and java_files stays empty.
+    file_stream: Iterable[FileContext] | None = None
+
+    def is_empty(self) -> bool:
+        return len(self.java_files) == 0 and self.file_stream is None
+
+
+class LineScan:
+    def __init__(self, file_ctx: FileContext) -> None:
+        self.file_ctx = file_ctx
+        self.rel_path = file_ctx.rel_path
+        self.lines = file_ctx.lines
+        self.index = 0
+        self.raw = ""
+        self._stripped: str | None = None
+        self._code: str | None = None
+        self._masked: str | None = None
+        self._memo: dict[str, object] = {}
+
+    def advance(self, index: int, raw: str) -> None:
+        self.index = index
+        self.raw = raw
+        self._stripped = None
+        self._code = None
+        self._masked = None
+
+    @property
+    def stripped(self) -> str:
+        if self._stripped is None:
+            self._stripped = self.raw.strip()
+        return self._stripped
+
+    @property
+    def code(self) -> str:
+        if self._code is None:
+            self._code = self.file_ctx.lexed.code_lines[self.index - 1].strip()
+        return self._code
+
+    @property
+    def masked(self) -> str:
+        if self._masked is None:
+            self._masked = self.file_ctx.lexed.masked_lines[self.index - 1].strip()
+        return self._masked
+
+    def memo(self, key: str, factory: Callable[[], object]) -> object:
+        if key not in self._memo:
+            self._memo[key] = factory()
+        return self._memo[key]
 
 
-class ControllerRestRule(Rule):
-    name = RULE_CONTROLLER_REST
+@dataclass(frozen=True)
+class LineCheck:
+    # Returns None when the line does not match; a list (possibly empty) otherwise.
+    visit: Callable[[LineScan], list[Violation] | None]
+    literals: tuple[str, ...] = ()
+    leading: tuple[str, ...] = ()
+    first_match_only: bool = False
+
+
+class LineRule(Rule):
+    def trigger_literals(self, checks: list[LineCheck]) -> tuple[str, ...]:
+        if len(self.required_literals) > 0:
+            return self.required_literals
+        # A line can only be dispatched when it contains a trigger literal, so the
+        # file must contain one too. Leading keywords are too common to be worth it.
+        if any(len(check.literals) == 0 for check in checks):
+            return ()
+        return tuple(literal for check in checks for literal in check.literals)
+
+    def line_checks(self) -> list[LineCheck]:
+        raise NotImplementedError
 
     def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if "/controller/" not in file_ctx.rel_path:
-            return []
-        if "@RestController" in file_ctx.text:
-            return []
-        line = _first_line_of(file_ctx.lines, "@Controller")
-        if line > 0:
-            return [
-                Violation(
-                    rule=self.name,
-                    severity=SEVERITY_ERROR,
-                    file=file_ctx.rel_path,
-                    line=line,
-                    reason="Controller must use @RestController.",
-                    snippet=file_ctx.lines[line - 1].strip(),
-                )
-            ]
-        line = _first_line_by_contains_any(
-            file_ctx.lines,
-            ["@GetMapping", "@PostMapping", "@PutMapping", "@PatchMapping", "@DeleteMapping"],
-        )
-        if line <= 0:
-            return []
-        return [
-            Violation(
-                rule=self.name,
-                severity=SEVERITY_WARNING,
-                file=file_ctx.rel_path,
-                line=line,
-                reason="Controller-like file should declare @RestController.",
-                snippet=file_ctx.lines[line - 1].strip(),
-            )
-        ]
+        return RuleEngine([self]).check(file_ctx, project_ctx)
 
 
-class ControllerTransactionalRule(Rule):
-    name = RULE_CONTROLLER_TX
-
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if "/controller/" not in file_ctx.rel_path:
-            return []
-        line = _first_line_regex(file_ctx.lines, r"@\s*Transactional\b")
-        if line <= 0:
-            return []
-        return [
-            Violation(
-                rule=self.name,
-                severity=SEVERITY_ERROR,
-                file=file_ctx.rel_path,
-                line=line,
-                reason="Do not put @Transactional in controller layer.",
-                snippet=file_ctx.lines[line - 1].strip(),
-            )
-        ]
+class RuleEngine:
+    def __init__(
+        self,
+        rules: list[Rule],
+        profile: RunProfile | None = None,
+        rule_time_budget: float = DEFAULT_RULE_TIME_BUDGET_SECONDS,
+    ) -> None:
+        self.rules = rules
+        self.profile = profile
+        # Seconds of line checks each rule may spend on one file; 0 disables it.
+        self.rule_time_budget = rule_time_budget
+        # Totals over every file this engine checked, for the rule cost history.
+        # Line rules are timed per check only while a budget or profile is
+        # active; otherwise each active line rule gets an equal share of the
+        # file's line walk, timed once.
+        self.rule_seconds: dict[str, float] = {}
+        self.rule_errors: dict[str, int] = {}
+        self._line_checks: dict[str, list[LineCheck]] = {
+            rule.name: rule.line_checks() for rule in rules if isinstance(rule, LineRule)
+        }
+        self._required_literals: dict[str, tuple[str, ...]] = {}
+        for rule in rules:
+            if isinstance(rule, LineRule):
+                self._required_literals[rule.name] = rule.trigger_literals(self._line_checks[rule.name])
+                continue
+            self._required_literals[rule.name] = rule.required_literals
+        self._line_literals = frozenset(
+            literal for checks in self._line_checks.values() for check in checks for literal in check.literals
+        )
+        self._routes: dict[frozenset[str], _Route] = {}
+        self._plans: dict[tuple[tuple[str, ...], frozenset[str]], _DispatchPlan] = {}
+
+    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> list[Violation]:
+        if self.profile is None:
+            return self._check(file_ctx, project_ctx, None)
+        violations, timings = self.check_timed(file_ctx, project_ctx)
+        self.profile.record_file(file_ctx.rel_path, timings)
+        return violations
 
+    def check_timed(self, file_ctx: FileContext, project_ctx: ProjectContext) -> tuple[list[Violation], dict[str, float]]:
+        from .profiling import FRAME_DISPATCH
 
-class ControllerEntityResponseRule(Rule):
-    name = RULE_CONTROLLER_ENTITY_RESPONSE
+        timings: dict[str, float] = {}
+        started = time.perf_counter()
+        violations = self._check(file_ctx, project_ctx, timings)
+        # Whatever no rule or shared frame was charged for is the line walk itself.
+        timings[FRAME_DISPATCH] = max(time.perf_counter() - started - sum(timings.values()), 0.0)
+        return violations, timings
 
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if "/controller/" not in file_ctx.rel_path:
-            return []
+    def _check(
+        self,
+        file_ctx: FileContext,
+        project_ctx: ProjectContext,
+        timings: dict[str, float] | None,
+    ) -> list[Violation]:
+        started = time.perf_counter() if timings is not None else 0.0
+        route = self._route(file_ctx.tags)
+        present = route.scanner.scan(file_ctx.text)
+        candidates = self._candidate_rules(route.rules, present)
+        if timings is not None:
+            from .profiling import FRAME_LEX, FRAME_PREFILTER
+
+            scanned = time.perf_counter()
+            timings[FRAME_PREFILTER] = scanned - started
+            if len(candidates) > 0:
+                # Build the shared per-file structures up front so that the
+                # first rule to touch them is not charged for them.
+                file_ctx.lexed
+                file_ctx.line_index
+                timings[FRAME_LEX] = time.perf_counter() - scanned
+        active = tuple(rule.name for rule in candidates if isinstance(rule, LineRule))
+        line_results, skipped = self._run_line_checks(file_ctx, active, present, timings) if len(active) > 0 else ({}, [])
         violations: list[Violation] = []
-        for index, raw in enumerate(file_ctx.lines, start=1):
-            stripped = raw.strip()
-            if ENTITY_RESPONSE_PATTERN.search(stripped) is not None:
-                violations.append(
-                    Violation(
-                        rule=self.name,
-                        severity=SEVERITY_ERROR,
-                        file=file_ctx.rel_path,
-                        line=index,
-                        reason="Controller must not return Entity directly; use DTO.",
-                        snippet=stripped,
-                    )
-                )
-                continue
-            if DIRECT_ENTITY_RETURN_PATTERN.search(stripped) is None:
-                continue
-            violations.append(
-                Violation(
-                    rule=self.name,
-                    severity=SEVERITY_ERROR,
-                    file=file_ctx.rel_path,
-                    line=index,
-                    reason="Controller method return type must not be Entity.",
-                    snippet=stripped,
-                )
-            )
+        for rule in candidates:
+            if isinstance(rule, LineRule):
+                for found in line_results.get(rule.name, []):
+                    violations.extend(found)
+                continue
+            rule_started = time.perf_counter()
+            violations.extend(rule.check(file_ctx, project_ctx))
+            elapsed = time.perf_counter() - rule_started
+            self.rule_seconds[rule.name] = self.rule_seconds.get(rule.name, 0.0) + elapsed
+            if timings is not None:
+                timings[rule.name] = elapsed
+        violations.extend(skipped)
+        for violation in violations:
+            if violation.severity == SEVERITY_ERROR:
+                self.rule_errors[violation.rule] = self.rule_errors.get(violation.rule, 0) + 1
         return violations
 
+    def _route(self, tags: frozenset[str]) -> _Route:
+        route = self._routes.get(tags)
+        if route is not None:
+            return route
+        rules = [rule for rule in self.rules if rule.tag_filter.matches(tags)]
+        literals = [literal for rule in rules for literal in self._required_literals[rule.name]]
+        for rule in rules:
+            for check in self._line_checks.get(rule.name, []):
+                literals.extend(check.literals)
+        route = _Route(rules, LiteralScanner(literals))
+        self._routes[tags] = route
+        # A route is built for a file about to be checked, so its rules have
+        # run even where the literal prefilter leaves nothing to time.
+        for rule in rules:
+            self.rule_seconds.setdefault(rule.name, 0.0)
+        return route
 
-class ControllerApiVersionRule(Rule):
-    name = RULE_CONTROLLER_API_VERSION
+    def _candidate_rules(self, rules: list[Rule], present: set[str]) -> list[Rule]:
+        candidates: list[Rule] = []
+        for rule in rules:
+            required = self._required_literals[rule.name]
+            if len(required) > 0 and present.isdisjoint(required):
+                continue
+            candidates.append(rule)
+        return candidates
 
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if "/controller/" not in file_ctx.rel_path:
-            return []
+    def _run_line_checks(
+        self,
+        file_ctx: FileContext,
+        active: tuple[str, ...],
+        present: set[str],
+        timings: dict[str, float] | None = None,
+    ) -> tuple[dict[str, list[list[Violation]]], list[Violation]]:
+        # Returns each rule's findings and the engine's own reports of what it skipped.
+        # Literals missing from the whole file cannot trigger on any line, so the
+        # per-line pattern only alternates over the ones this file contains.
+        key = (active, self._line_literals.intersection(present))
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = _DispatchPlan([(name, self._line_checks[name]) for name in active], key[1])
+            self._plans[key] = plan
+
+        checks = plan.checks
+        results: list[list[Violation]] = [[] for _ in checks]
+        finished = [False] * len(checks)
+        budget = self.rule_time_budget
+        timed = timings is not None or budget > 0
+        spent = [0.0] * len(plan.rule_positions)
+        skipped: list[Violation] = []
+        long_lines: list[int] = []
+        scan = LineScan(file_ctx)
+        walk_started = time.perf_counter() if not timed else 0.0
+        # Walk the file once; each line only reaches checks whose trigger it contains.
         for index, raw in enumerate(file_ctx.lines, start=1):
-            match = REQUEST_MAPPING_PATTERN.search(raw)
-            if match is None:
-                continue
-            value = match.group(1)
-            if re.match(r"^/api/v\d+/", value) is not None:
-                return []
-            return [
-                Violation(
-                    rule=self.name,
-                    severity=SEVERITY_WARNING,
-                    file=file_ctx.rel_path,
-                    line=index,
-                    reason='Request mapping should be versioned, example: "/api/v1/...".',
-                    snippet=raw.strip(),
-                )
-            ]
-        return []
+            if len(raw) > MAX_LINE_LENGTH:
+                long_lines.append(index)
+                continue
+            candidates = set(plan.always)
+            leading_match = LEADING_TOKEN_PATTERN.match(raw)
+            if leading_match is not None:
+                candidates.update(plan.by_leading.get(leading_match.group(1), ()))
+            if plan.literal_pattern is not None:
+                for literal in plan.literal_pattern.findall(raw):
+                    candidates.update(plan.by_literal[literal])
+            if len(candidates) == 0:
+                continue
+            scan.advance(index, raw)
+            for position in candidates:
+                if finished[position]:
+                    continue
+                if not timed:
+                    found = checks[position].visit(scan)
+                else:
+                    visit_started = time.perf_counter()
+                    found = checks[position].visit(scan)
+                    elapsed = time.perf_counter() - visit_started
+                    owner = plan.owners[position]
+                    if timings is not None:
+                        timings[owner] = timings.get(owner, 0.0) + elapsed
+                    rule_index = plan.rule_indexes[position]
+                    spent[rule_index] += elapsed
+                    if budget > 0 and spent[rule_index] > budget:
+                        # Stop the rule for the rest of the file rather than let
+                        # one pathological file stall the run.
+                        for other in plan.rule_positions[rule_index]:
+                            finished[other] = True
+                        skipped.append(_time_budget_violation(file_ctx, owner, index, budget))
+                if found is None:
+                    continue
+                results[position].extend(found)
+                if checks[position].first_match_only:
+                    finished[position] = True
+
+        grouped: dict[str, list[list[Violation]]] = {}
+        for rule_name, found in zip(plan.owners, results):
+            grouped.setdefault(rule_name, []).append(found)
+        if timed:
+            for rule_name, seconds in zip(plan.rule_names, spent):
+                self.rule_seconds[rule_name] = self.rule_seconds.get(rule_name, 0.0) + seconds
+        else:
+            share = (time.perf_counter() - walk_started) / len(plan.rule_names)
+            for rule_name in plan.rule_names:
+                self.rule_seconds[rule_name] = self.rule_seconds.get(rule_name, 0.0) + share
+        if len(long_lines) > 0:
+            skipped.insert(0, _long_lines_violation(file_ctx, long_lines))
+        return grouped, skipped
 
 
-class ControllerApiDocRule(Rule):
-    name = RULE_CONTROLLER_API_DOC
+@dataclass(frozen=True)
+class _Route:
+    rules: list[Rule]
+    scanner: LiteralScanner
+
+
+class _DispatchPlan:
+    def __init__(self, rule_checks: list[tuple[str, list[LineCheck]]], present: frozenset[str]) -> None:
+        self.checks: list[LineCheck] = []
+        self.owners: list[str] = []
+        # The positions of each rule's checks, and the rule of each position.
+        self.rule_names: list[str] = []
+        self.rule_positions: list[list[int]] = []
+        self.rule_indexes: list[int] = []
+        self.always: list[int] = []
+        self.by_leading: dict[str, list[int]] = {}
+        literal_checks: list[tuple[int, tuple[str, ...]]] = []
+        for rule_index, (rule_name, checks) in enumerate(rule_checks):
+            self.rule_names.append(rule_name)
+            self.rule_positions.append([])
+            for check in checks:
+                position = len(self.checks)
+                self.checks.append(check)
+                self.owners.append(rule_name)
+                self.rule_positions[rule_index].append(position)
+                self.rule_indexes.append(rule_index)
+                if len(check.leading) > 0:
+                    for token in check.leading:
+                        self.by_leading.setdefault(token, []).append(position)
+                    continue
+                if len(check.literals) > 0:
+                    literals = tuple(literal for literal in check.literals if literal in present)
+                    if len(literals) > 0:
+                        literal_checks.append((position, literals))
+                    continue
+                self.always.append(position)
+
+        # The lookahead reports the longest literal starting at every offset, so
+        # a hit also triggers checks whose literal is contained in that hit.
+        all_literals = sorted({literal for _, literals in literal_checks for literal in literals}, key=len, reverse=True)
+        self.by_literal: dict[str, list[int]] = {
+            hit: [position for position, literals in literal_checks if any(literal in hit for literal in literals)]
+            for hit in all_literals
+        }
+        self.literal_pattern: re.Pattern[str] | None = None
+        if len(all_literals) > 0:
+            self.literal_pattern = re.compile("(?=(" + "|".join(re.escape(literal) for literal in all_literals) + "))")
+
+
+def _long_lines_violation(file_ctx: FileContext, long_lines: list[int]) -> Violation:
+    return Violation(
+        rule=RULE_LINE_TOO_LONG,
+        severity=SEVERITY_WARNING,
+        file=file_ctx.rel_path,
+        line=long_lines[0],
+        reason=(
+            f"{len(long_lines)} line(s) longer than {MAX_LINE_LENGTH} characters were not checked by line rules. "
+            "Exclude generated or minified sources with --exclude."
+        ),
+        snippet=file_ctx.lines[long_lines[0] - 1].strip()[:SKIPPED_SNIPPET_LENGTH],
+    )
 
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if "/controller/" not in file_ctx.rel_path:
-            return []
-        violations: list[Violation] = []
-        for index, raw in enumerate(file_ctx.lines, start=1):
-            if MAPPING_ANNOTATION_PATTERN.search(raw) is None:
-                continue
-            previous = _previous_non_blank_lines(file_ctx.lines, index, 5)
-            has_operation = any(OPERATION_ANNOTATION_PATTERN.search(text) is not None for _, text in previous)
-            if has_operation:
-                continue
-            violations.append(
-                Violation(
-                    rule=self.name,
-                    severity=SEVERITY_ERROR,
-                    file=file_ctx.rel_path,
-                    line=index,
-                    reason="Endpoint mapping requires @Operation for API documentation.",
-                    snippet=raw.strip(),
-                )
-            )
-        return violations
 
+def _time_budget_violation(file_ctx: FileContext, rule_name: str, line: int, budget: float) -> Violation:
+    return Violation(
+        rule=RULE_TIME_BUDGET,
+        severity=SEVERITY_WARNING,
+        file=file_ctx.rel_path,
+        line=line,
+        reason=f"{rule_name} ran past its {budget:g}s budget for this file here; the rest of the file was not checked by it.",
+        snippet=file_ctx.lines[line - 1].strip()[:SKIPPED_SNIPPET_LENGTH],
+    )
 
-class RepositoryJpaRule(Rule):
-    name = RULE_REPOSITORY_EXTENDS_JPA
 
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if "/repository/" not in file_ctx.rel_path:
-            return []
-        if "/repository/projection/" in file_ctx.rel_path:
-            return []
-        if INTERFACE_PATTERN.search(file_ctx.text) is None:
-            return []
-        if EXTENDS_JPA_PATTERN.search(file_ctx.text) is not None:
-            return []
-        line = _first_line_regex(file_ctx.lines, r"\binterface\s+\w+")
-        return [
-            Violation(
-                rule=self.name,
-                severity=SEVERITY_ERROR,
-                file=file_ctx.rel_path,
-                line=line if line > 0 else 1,
-                reason="Repository interface should extend JpaRepository.",
-                snippet=file_ctx.lines[line - 1].strip() if line > 0 else file_ctx.rel_path,
-            )
-        ]
+def check_auxiliary_rules(
+    read_text: Callable[[str], str | None],
+    only_filters: set[str],
+    check_vietnamese_messages: bool,
+    check_message_keys: bool,
+    profile: RunProfile | None = None,
+) -> list[Violation]:
+    checks: list[tuple[str, Callable[[Callable[[str], str | None]], list[Violation]]]] = []
+    if check_vietnamese_messages and _should_run_auxiliary_rule(RULE_VI_MESSAGES_ACCENTED, only_filters):
+        checks.append((RULE_VI_MESSAGES_ACCENTED, load_rule_module("i18n").check_vietnamese_messages))
+    if check_message_keys and _should_run_auxiliary_rule(RULE_MESSAGE_KEYS_BUNDLE, only_filters):
+        checks.append((RULE_MESSAGE_KEYS_BUNDLE, load_rule_module("i18n").check_error_message_keys_in_bundles))
+    violations: list[Violation] = []
+    for rule_name, check in checks:
+        started = time.perf_counter()
+        violations.extend(check(read_text))
+        if profile is not None:
+            profile.record_auxiliary_rule(rule_name, time.perf_counter() - started)
+    return violations
 
 
-class EntityNoDataRule(Rule):
-    name = RULE_ENTITY_NO_DATA
+def collect_java_files(discovery: SourceDiscovery, prefetch: int, stats: ReadStats) -> list[FileContext]:
+    return list(_read_java_files(discovery.root, discovery.discover(), prefetch, stats))
 
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if ENTITY_CLASS_PATTERN.search(file_ctx.text) is None:
-            return []
-        line = _first_line_regex(file_ctx.lines, r"@\s*Data\b")
-        if line <= 0:
-            return []
-        return [
-            Violation(
-                rule=self.name,
-                severity=SEVERITY_ERROR,
-                file=file_ctx.rel_path,
-                line=line,
-                reason="@Data is forbidden on JPA Entity.",
-                snippet=file_ctx.lines[line - 1].strip(),
-            )
-        ]
 
+def _read_java_files(root: Path, rel_paths: Iterable[str], prefetch: int, stats: ReadStats) -> Iterator[FileContext]:
+    from .read_ahead import read_ahead
 
-class EntityHasIdRule(Rule):
-    name = RULE_ENTITY_HAS_ID
+    def read_bytes(rel_path: str) -> bytes:
+        return (root / rel_path).read_bytes()
 
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if ENTITY_CLASS_PATTERN.search(file_ctx.text) is None:
-            return []
-        if ID_ANNOTATION_PATTERN.search(file_ctx.text) is not None:
-            return []
-        return [
-            Violation(
-                rule=self.name,
-                severity=SEVERITY_ERROR,
-                file=file_ctx.rel_path,
-                line=1,
-                reason="Entity must declare @Id field.",
-                snippet=file_ctx.rel_path,
-            )
-        ]
+    for rel_path, text in read_ahead(rel_paths, read_bytes, _decode_source, prefetch, stats):
+        yield build_file_context(root, rel_path, text)
 
 
-class EntityLayerDependencyRule(Rule):
-    name = RULE_ENTITY_NO_LAYER_DEP
+def build_file_context(root: Path, rel_path: str, text: str) -> FileContext:
+    return FileContext(path=root / rel_path, rel_path=rel_path, text=text, lines=text.splitlines())
 
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if ENTITY_CLASS_PATTERN.search(file_ctx.text) is None:
-            return []
-        match = IMPORT_SERVICE_OR_REPO_PATTERN.search(file_ctx.text)
-        if match is None:
-            return []
-        line = _line_for_offset(file_ctx.lines, match.start())
-        return [
-            Violation(
-                rule=self.name,
-                severity=SEVERITY_ERROR,
-                file=file_ctx.rel_path,
-                line=line,
-                reason="Entity must not depend on service/repository layer.",
-                snippet=file_ctx.lines[line - 1].strip(),
-            )
-        ]
 
+def _classify_file(rel_path: str, text: str) -> frozenset[str]:
+    tags: set[str] = set()
+    for prefix, tag in SOURCE_SET_TAGS:
+        if rel_path.startswith(prefix):
+            tags.add(tag)
+    if len(tags) == 0 and EXTRA_SOURCE_SET_PATTERN.match(rel_path) is not None:
+        tags.add(TAG_TEST_SOURCE)
+    for token, tag in LAYER_PATH_TAGS:
+        if token in rel_path:
+            tags.add(tag)
+    for tag, literal, pattern in STEREOTYPE_TAG_PATTERNS:
+        if literal in text and pattern.search(text) is not None:
+            tags.add(tag)
+    declaration = TYPE_DECLARATION_PATTERN.search(text)
+    if declaration is not None:
+        tags.add(f"{TAG_KIND_PREFIX}{declaration.group(1)}")
+    return frozenset(tags)
 
-class EntityRelationFetchRule(Rule):
-    name = RULE_ENTITY_RELATION_FETCH
 
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if ENTITY_CLASS_PATTERN.search(file_ctx.text) is None:
-            return []
-        violations: list[Violation] = []
-        for index, raw in enumerate(file_ctx.lines, start=1):
-            relation_match = RELATION_PATTERN.search(raw)
-            if relation_match is None:
-                continue
-            annotation_args = relation_match.group(3) or ""
-            if "fetch = FetchType.LAZY" in annotation_args:
-                continue
-            violations.append(
-                Violation(
-                    rule=self.name,
-                    severity=SEVERITY_WARNING,
-                    file=file_ctx.rel_path,
-                    line=index,
-                    reason=f"{relation_match.group(1)} should explicitly use fetch = FetchType.LAZY.",
-                    snippet=raw.strip(),
-                )
-            )
-        return violations
+def _decode_source(data: bytes) -> str:
+    # Match the universal-newline translation that Path.read_text applies.
+    return data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
 
 
-class EntityManyToOneJoinColumnRule(Rule):
-    name = RULE_ENTITY_MANY_TO_ONE_JOIN
+def _working_tree_reader(root: Path) -> Callable[[str], str | None]:
+    def read_text(rel_path: str) -> str | None:
+        try:
+            return (root / rel_path).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
 
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if ENTITY_CLASS_PATTERN.search(file_ctx.text) is None:
-            return []
-        violations: list[Violation] = []
-        for index, raw in enumerate(file_ctx.lines, start=1):
-            if re.search(r"@\s*ManyToOne\b", raw) is None:
-                continue
-            window = _next_non_blank_lines(file_ctx.lines, index, 5)
-            has_join = any("@JoinColumn" in text for _, text in window)
-            if has_join:
-                continue
-            violations.append(
-                Violation(
-                    rule=self.name,
-                    severity=SEVERITY_ERROR,
-                    file=file_ctx.rel_path,
-                    line=index,
-                    reason="@ManyToOne should define @JoinColumn explicitly.",
-                    snippet=raw.strip(),
-                )
-            )
-        return violations
+    return read_text
 
 
-class EntityAuditLifecycleRule(Rule):
-    name = RULE_ENTITY_AUDIT_LIFECYCLE
+def _index_reader(root: Path) -> Callable[[str], str | None]:
+    from .git_changes import read_index_blobs
 
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if ENTITY_CLASS_PATTERN.search(file_ctx.text) is None:
-            return []
-        has_created_or_updated = "createdAt" in file_ctx.text or "updatedAt" in file_ctx.text
-        if not has_created_or_updated:
-            return []
-        has_pre_persist = PRE_PERSIST_PATTERN.search(file_ctx.text) is not None
-        has_pre_update = PRE_UPDATE_PATTERN.search(file_ctx.text) is not None
-        has_created_date = CREATED_DATE_PATTERN.search(file_ctx.text) is not None
-        has_last_modified = LAST_MODIFIED_DATE_PATTERN.search(file_ctx.text) is not None
-        if has_pre_persist and has_pre_update:
-            return []
-        if has_created_date and has_last_modified:
-            return []
-        return [
-            Violation(
-                rule=self.name,
-                severity=SEVERITY_WARNING,
-                file=file_ctx.rel_path,
-                line=1,
-                reason="Entity has createdAt/updatedAt but missing lifecycle/auditing setup.",
-                snippet=file_ctx.rel_path,
-            )
-        ]
+    def read_text(rel_path: str) -> str | None:
+        data = read_index_blobs(root, [rel_path]).get(rel_path)
+        if data is None:
+            return None
+        return _decode_source(data)
 
+    return read_text
 
-class SharedFieldsMappedSuperclassRule(Rule):
-    name = RULE_SHARED_MAPPED_SUPERCLASS
 
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if file_ctx != project_ctx.java_files[0]:
-            return []
-        entity_files = [f for f in project_ctx.java_files if ENTITY_CLASS_PATTERN.search(f.text) is not None]
-        if len(entity_files) < 2:
-            return []
-        has_mapped_superclass = any(MAPPED_SUPERCLASS_PATTERN.search(f.text) is not None for f in project_ctx.java_files)
-        if has_mapped_superclass:
-            return []
-        common_entities: list[FileContext] = []
-        for entity in entity_files:
-            if "createdAt" not in entity.text:
-                continue
-            if "updatedAt" not in entity.text:
-                continue
-            common_entities.append(entity)
-        if len(common_entities) < 2:
-            return []
-        targets = ", ".join(f.rel_path for f in common_entities[:3])
-        return [
-            Violation(
-                rule=self.name,
-                severity=SEVERITY_WARNING,
-                file=common_entities[0].rel_path,
-                line=1,
-                reason="Multiple entities share audit fields; consider @MappedSuperclass base entity.",
-                snippet=targets,
-            )
-        ]
+def _full_scope(discovery: SourceDiscovery, prefetch: int, stats: ReadStats) -> RunScope:
+    java_files = collect_java_files(discovery, prefetch, stats)
+    return RunScope(java_files=java_files, project_files=java_files, read_text=_working_tree_reader(discovery.root))
 
 
-class EntityVersionRule(Rule):
-    name = RULE_ENTITY_OPTIMISTIC_LOCK
+def streaming_scope(discovery: SourceDiscovery, prefetch: int, stats: ReadStats) -> RunScope:
+    root = discovery.root
+    rel_paths = discovery.discover()
+    file_stream = None
+    if len(rel_paths) > 0:
+        file_stream = _read_java_files(root, rel_paths, prefetch, stats)
+    return RunScope(java_files=[], project_files=[], read_text=_working_tree_reader(root), file_stream=file_stream)
 
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if ENTITY_CLASS_PATTERN.search(file_ctx.text) is None:
-            return []
-        if VERSION_PATTERN.search(file_ctx.text) is not None:
-            return []
-        return [
-            Violation(
-                rule=self.name,
-                severity=SEVERITY_WARNING,
-                file=file_ctx.rel_path,
-                line=1,
-                reason="Entity should define @Version for optimistic locking in concurrent updates.",
-                snippet=file_ctx.rel_path,
-            )
-        ]
 
+def changed_scope(
+    discovery: SourceDiscovery,
+    change_set: ChangeSet,
+    staged: bool,
+    prefetch: int,
+    stats: ReadStats,
+) -> RunScope:
+    from .git_changes import read_index_blobs
 
-class EntityEnumeratedStringRule(Rule):
-    name = RULE_ENTITY_ENUM_STRING
+    root = discovery.root
+    changed_java = [rel_path for rel_path in change_set.present() if discovery.includes(rel_path)]
+    if staged:
+        read_text = _index_reader(root)
+        blobs = read_index_blobs(root, changed_java)
+        java_files = [
+            build_file_context(root, rel_path, _decode_source(blobs[rel_path]))
+            for rel_path in changed_java
+            if rel_path in blobs
+        ]
+    else:
+        read_text = _working_tree_reader(root)
+        java_files = [build_file_context(root, rel_path, read_text(rel_path) or "") for rel_path in changed_java]
+
+    project_files: list[FileContext] = []
+    if _affects_project_rules(discovery, change_set, java_files):
+        if staged:
+            project_files = _collect_index_java_files(discovery)
+        else:
+            project_files = collect_java_files(discovery, prefetch, stats)
+        # Reuse the project-wide contexts so changed files are not read twice.
+        by_path = {file_ctx.rel_path: file_ctx for file_ctx in project_files}
+        java_files = [by_path.get(file_ctx.rel_path, file_ctx) for file_ctx in java_files]
+
+    touched = change_set.touched()
+    return RunScope(
+        java_files=java_files,
+        project_files=project_files,
+        read_text=read_text,
+        check_vietnamese_messages=VI_MESSAGES_FILE in touched,
+        check_message_keys=ERROR_MESSAGE_KEYS_FILE in touched or any(path in touched for path in MESSAGE_BUNDLE_FILES),
+        partial=True,
+    )
 
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if ENTITY_CLASS_PATTERN.search(file_ctx.text) is None:
-            return []
-        violations: list[Violation] = []
-        for index, raw in enumerate(file_ctx.lines, start=1):
-            if ENUMERATED_PATTERN.search(raw) is None:
-                continue
-            if ENUMERATED_STRING_PATTERN.search(raw) is not None:
-                continue
-            violations.append(
-                Violation(
-                    rule=self.name,
-                    severity=SEVERITY_ERROR,
-                    file=file_ctx.rel_path,
-                    line=index,
-                    reason="@Enumerated must use EnumType.STRING.",
-                    snippet=raw.strip(),
-                )
-            )
-        return violations
 
+def _build_project_index(java_files: list[FileContext]) -> ProjectIndex:
+    builder = ProjectIndexBuilder()
+    for file_ctx in java_files:
+        builder.add(file_ctx)
+    return builder.build()
 
-class SoftDeleteNoHardDeleteRule(Rule):
-    name = RULE_SOFT_DELETE_NO_HARD_DELETE
 
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if "/service/" not in file_ctx.rel_path:
-            return []
-        violations: list[Violation] = []
-        for index, raw in enumerate(file_ctx.lines, start=1):
-            if HARD_DELETE_CALL_PATTERN.search(raw) is None:
-                continue
-            violations.append(
-                Violation(
-                    rule=self.name,
-                    severity=SEVERITY_ERROR,
-                    file=file_ctx.rel_path,
-                    line=index,
-                    reason="Hard delete call detected. Use soft delete strategy.",
-                    snippet=raw.strip(),
-                )
-            )
-        return violations
+def _collect_index_java_files(discovery: SourceDiscovery) -> list[FileContext]:
+    from .git_changes import index_files, read_index_blobs
 
+    root = discovery.root
+    rel_paths = [
+        rel_path for rel_path in index_files(root, list(discovery.include_roots)) if discovery.includes(rel_path)
+    ]
+    blobs = read_index_blobs(root, rel_paths)
+    files = [build_file_context(root, rel_path, _decode_source(data)) for rel_path, data in blobs.items()]
+    files.sort(key=lambda item: item.rel_path)
+    return files
 
-class SoftDeleteFindFilterRule(Rule):
-    name = RULE_SOFT_DELETE_FIND_FILTER
 
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if "/repository/" not in file_ctx.rel_path:
-            return []
-        lines = file_ctx.lines
-        violations: list[Violation] = []
-        for index, raw in enumerate(lines, start=1):
-            if FIND_METHOD_PATTERN.search(raw) is None:
-                continue
-            stripped = raw.strip()
-            if "Deleted" in stripped:
-                continue
-            prev_window = _previous_non_blank_lines(lines, index, 40)
-            has_query_annotation = any("@Query" in text for _, text in prev_window)
-            query_context = " ".join(text for _, text in prev_window)
-            has_query_with_deleted = has_query_annotation and "deleted" in query_context.lower()
-            if has_query_with_deleted:
-                continue
-            violations.append(
-                Violation(
-                    rule=self.name,
-                    severity=SEVERITY_WARNING,
-                    file=file_ctx.rel_path,
-                    line=index,
-                    reason='Repository find-method should include deleted filter (e.g. "...AndDeletedFalse").',
-                    snippet=stripped,
-                )
-            )
-        return violations
+def _affects_project_rules(discovery: SourceDiscovery, change_set: ChangeSet, changed_files: list[FileContext]) -> bool:
+    # Adding or removing a source file can change which entity, DTO or mapper
+    # files exist, so the project-wide rules must see the full tree again.
+    if any(discovery.includes(rel_path) for rel_path in change_set.added + change_set.deleted):
+        return True
+    for file_ctx in changed_files:
+        if any(token in file_ctx.rel_path for token in PROJECT_RULE_PATH_TOKENS):
+            return True
+        if ENTITY_CLASS_PATTERN.search(file_ctx.text) is not None:
+            return True
+        if MAPPED_SUPERCLASS_PATTERN.search(file_ctx.text) is not None:
+            return True
+        if MAPSTRUCT_MAPPER_PATTERN.search(file_ctx.text) is not None:
+            return True
+    return False
 
 
-class MapStructRequiredRule(Rule):
-    name = RULE_MAPSTRUCT_MAPPER_REQUIRED
+def _load_change_set(root: Path, changed_since: str, staged: bool) -> ChangeSet | None:
+    from .git_changes import changes_since, staged_changes
 
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if file_ctx != project_ctx.java_files[0]:
-            return []
-        has_entity = any("/entity/" in f.rel_path and ENTITY_CLASS_PATTERN.search(f.text) is not None for f in project_ctx.java_files)
-        has_dto = any("/dto/" in f.rel_path for f in project_ctx.java_files)
-        if not has_entity or not has_dto:
-            return []
-
-        mapper_files = [f for f in project_ctx.java_files if "/mapper/" in f.rel_path]
-        has_mapstruct_mapper = any(
-            MAPSTRUCT_MAPPER_PATTERN.search(f.text) is not None and INTERFACE_PATTERN.search(f.text) is not None
-            for f in mapper_files
-        )
-        if has_mapstruct_mapper:
-            return []
-
-        target_file = mapper_files[0].rel_path if len(mapper_files) > 0 else file_ctx.rel_path
-        return [
-            Violation(
-                rule=self.name,
-                severity=SEVERITY_ERROR,
-                file=target_file,
-                line=1,
-                reason="Project has Entity + DTO but missing MapStruct mapper interface (@Mapper).",
-                snippet='Define mapper under "/mapper/" using @Mapper.',
-            )
-        ]
+    if staged:
+        return staged_changes(root)
+    if changed_since != "":
+        return changes_since(root, changed_since)
+    return None
 
 
-class MapStructNoManualMappingRule(Rule):
-    name = RULE_MAPSTRUCT_NO_MANUAL_MAPPING
+def _print_summary(violations: list[Violation]) -> None:
+    for line in _summary_lines(violations):
+        print(line)
 
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if not file_ctx.rel_path.startswith("src/main/java/"):
-            return []
-        if "/service/" not in file_ctx.rel_path and "/controller/" not in file_ctx.rel_path:
-            return []
-        violations: list[Violation] = []
-        for index, raw in enumerate(file_ctx.lines, start=1):
-            if MANUAL_MAPPING_NEW_PATTERN.search(raw) is None:
-                continue
-            violations.append(
-                Violation(
-                    rule=self.name,
-                    severity=SEVERITY_WARNING,
-                    file=file_ctx.rel_path,
-                    line=index,
-                    reason="Manual DTO/Entity construction detected; prefer MapStruct mapper.",
-                    snippet=raw.strip(),
-                )
-            )
-        return violations
 
+def _summary_lines(violations: list[Violation]) -> list[str]:
+    lines = [summary_header(count_violations(violations))]
+    lines.extend(violation.to_console() for violation in violations)
+    return lines
 
-class DtoValidationAnnotationRule(Rule):
-    name = RULE_DTO_VALIDATION_ANNOTATION
 
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if "/dto/request/" not in file_ctx.rel_path:
-            return []
-        if DTO_VALIDATION_ANNOTATION_PATTERN.search(file_ctx.text) is not None:
-            return []
-        return [
-            Violation(
-                rule=self.name,
-                severity=SEVERITY_ERROR,
-                file=file_ctx.rel_path,
-                line=1,
-                reason="Request DTO must define validation annotations (jakarta.validation.*).",
-                snippet=file_ctx.rel_path,
-            )
-        ]
+def _exit_code(violations: list[Violation], strict: bool) -> int:
+    return _exit_status(count_violations(violations), strict)
 
 
-class DtoValidationMessageConstantRule(Rule):
-    name = RULE_DTO_VALIDATION_MESSAGE_CONSTANT
+def _exit_status(counts: ReportCounts, strict: bool) -> int:
+    if counts.errors > 0:
+        return 1
+    if strict and counts.total > 0:
+        return 1
+    return 0
 
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if "/dto/request/" not in file_ctx.rel_path:
-            return []
-        violations: list[Violation] = []
-        lines = file_ctx.lines
-        for index, raw in enumerate(lines, start=1):
-            if VALIDATION_ANNOTATION_START_PATTERN.search(raw) is None:
-                continue
-            block = _collect_annotation_block(lines, index, 6)
-            if block.strip() == "":
-                continue
-            if VALIDATION_LITERAL_MESSAGE_PATTERN.search(block) is None:
-                continue
-            violations.append(
-                Violation(
-                    rule=self.name,
-                    severity=SEVERITY_ERROR,
-                    file=file_ctx.rel_path,
-                    line=index,
-                    reason='Validation annotation message must use static constant, not string literal.',
-                    snippet=raw.strip(),
-                )
-            )
-        return violations
 
+def _print_io_stats(stats: ReadStats, wall_seconds: float, cpu_seconds: float) -> None:
+    readers = f"{stats.workers} reader threads" if stats.workers > 0 else "inline reads"
+    print(
+        f"I/O: files={stats.files}, bytes={stats.bytes_read}, {readers}, "
+        f"read={stats.read_seconds:.3f}s, decode={stats.decode_seconds:.3f}s"
+    )
+    print(
+        f"Time: wall={wall_seconds:.3f}s, cpu={cpu_seconds:.3f}s, io_wait={stats.wait_seconds:.3f}s "
+        f"({_share(stats.wait_seconds, wall_seconds)} of wall)"
+    )
 
-class LombokRequiredArgsConstructorRule(Rule):
-    name = RULE_LOMBOK_REQUIRED_ARGS_CONSTRUCTOR
 
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if SPRING_BEAN_PATTERN.search(file_ctx.text) is None:
-            return []
-        final_fields = [raw for raw in file_ctx.lines if FINAL_FIELD_PATTERN.search(raw) is not None]
-        if len(final_fields) == 0:
-            return []
-        if REQUIRED_ARGS_CONSTRUCTOR_PATTERN.search(file_ctx.text) is not None:
-            return []
-        class_name = _detect_primary_class_name(file_ctx.lines)
-        has_constructor = False
-        if class_name != "":
-            constructor_regex = re.compile(rf"^\s*public\s+{re.escape(class_name)}\s*\(")
-            has_constructor = any(constructor_regex.search(raw) is not None for raw in file_ctx.lines)
-        if has_constructor:
-            return [
-                Violation(
-                    rule=self.name,
-                    severity=SEVERITY_WARNING,
-                    file=file_ctx.rel_path,
-                    line=1,
-                    reason="Spring bean uses constructor injection; prefer @RequiredArgsConstructor to reduce boilerplate.",
-                    snippet=file_ctx.rel_path,
-                )
-            ]
-        return [
-            Violation(
-                rule=self.name,
-                severity=SEVERITY_ERROR,
-                file=file_ctx.rel_path,
-                line=1,
-                reason="Spring bean with final dependencies should use @RequiredArgsConstructor.",
-                snippet=file_ctx.rel_path,
-            )
-        ]
+def _print_profile(profile: RunProfile, top: int, stacks_path: str) -> None:
+    for line in profile.summary_lines(top):
+        print(line)
+    if stacks_path == "":
+        return
+    Path(stacks_path).write_text("\n".join(profile.collapsed_stacks()) + "\n", encoding="utf-8")
+    print(f"Collapsed stacks written to {stacks_path}")
 
 
-class LombokEntityGetterSetterRule(Rule):
-    name = RULE_LOMBOK_ENTITY_GETTER_SETTER
+def _print_baseline_summary(baseline_filter: BaselineFilter, partial: bool) -> None:
+    line = f"Baseline: {baseline_filter.suppressed} known violations suppressed."
+    # Partial runs do not see every baselined file, so unmatched entries mean nothing there.
+    stale = baseline_filter.stale()
+    if not partial and stale > 0:
+        line += f" {stale} baseline entries no longer occur; rewrite the baseline with --write-baseline."
+    print(line)
 
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if ENTITY_CLASS_PATTERN.search(file_ctx.text) is None:
-            return []
-        if LOMBOK_GETTER_OR_SETTER_PATTERN.search(file_ctx.text) is not None:
-            return []
-        manual_methods = [raw for raw in file_ctx.lines if MANUAL_GETTER_OR_SETTER_PATTERN.search(raw) is not None]
-        if len(manual_methods) < 4:
-            return []
-        return [
-            Violation(
-                rule=self.name,
-                severity=SEVERITY_WARNING,
-                file=file_ctx.rel_path,
-                line=1,
-                reason="Entity has many manual getters/setters; consider Lombok @Getter/@Setter.",
-                snippet=file_ctx.rel_path,
-            )
-        ]
 
+def _share(part: float, whole: float) -> str:
+    if whole <= 0:
+        return "0%"
+    return f"{part / whole:.0%}"
 
-class LombokBuilderPreferredRule(Rule):
-    name = RULE_LOMBOK_BUILDER_PREFERRED
 
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if "/dto/" not in file_ctx.rel_path:
-            return []
-        if RECORD_PATTERN.search(file_ctx.text) is not None:
-            return []
-        if " class " not in f" {file_ctx.text} ":
-            return []
-        if LOMBOK_BUILDER_PATTERN.search(file_ctx.text) is not None:
-            return []
-        field_count = sum(1 for raw in file_ctx.lines if PRIVATE_FIELD_PATTERN.search(raw) is not None)
-        if field_count < 3:
-            return []
-        return [
-            Violation(
-                rule=self.name,
-                severity=SEVERITY_WARNING,
-                file=file_ctx.rel_path,
-                line=1,
-                reason="DTO class has multiple fields; prefer Lombok @Builder for object construction.",
-                snippet=file_ctx.rel_path,
-            )
-        ]
+def _write_report(root: Path, violations: list[Violation]) -> None:
+    report = ReportWriter([JsonSink(root / REPORT_FILE, compact=False)])
+    report.add(violations)
+    report.close()
 
 
-class NestedForShouldUseStreamRule(Rule):
-    name = RULE_NESTED_FOR_STREAM
+def _parse_only_filters(raw_value: str) -> set[str]:
+    if raw_value.strip() == "":
+        return set()
+    return {
+        token.strip()
+        for token in raw_value.split(",")
+        if token.strip() != ""
+    }
 
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        violations: list[Violation] = []
-        lines = file_ctx.lines
-        for index, raw in enumerate(lines, start=1):
-            if FOR_PATTERN.search(raw) is None:
-                continue
-            outer_indent = _indent_level(raw)
-            window = _next_non_blank_lines(lines, index, 30)
-            for line_no, candidate in window:
-                if line_no <= index:
-                    continue
-                if FOR_PATTERN.search(candidate) is None:
-                    continue
-                inner_indent = _indent_level(candidate)
-                if inner_indent <= outer_indent:
-                    continue
-                violations.append(
-                    Violation(
-                        rule=self.name,
-                        severity=SEVERITY_WARNING,
-                        file=file_ctx.rel_path,
-                        line=line_no,
-                        reason="Nested for-loop detected; prefer Stream for inner iteration to reduce nesting.",
-                        snippet=candidate.strip(),
-                    )
-                )
-                break
-        return violations
 
+def select_rules(only_filters: set[str], declared: Iterable[Rule] = ()) -> list[Rule]:
+    # Only the modules that define selected rules are imported. Declarative
+    # rules run after the built-in ones.
+    if not only_filters:
+        return [*load_rules(), *declared]
+    selection = resolve_selection(only_filters)
+    return [*load_rules(selection), *(rule for rule in declared if rule.name in selection)]
 
-class NoElseRule(Rule):
-    name = RULE_NO_ELSE
 
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        violations: list[Violation] = []
-        for index, raw in enumerate(file_ctx.lines, start=1):
-            line = _strip_line_comment(raw).strip()
-            if line == "":
-                continue
-            if ELSE_PATTERN.search(line) is None:
-                continue
-            violations.append(
-                Violation(
-                    rule=self.name,
-                    severity=SEVERITY_ERROR,
-                    file=file_ctx.rel_path,
-                    line=index,
-                    reason="else/else-if is forbidden. Use guard clauses and early return.",
-                    snippet=raw.strip(),
-                )
-            )
-        return violations
+def load_declared_rules(root: Path, rules_file: str) -> list[DeclarativeRule]:
+    # The default file is optional; a file named with --rules must exist.
+    path = root / (rules_file or DECLARATIVE_RULES_FILE)
+    if rules_file == "" and not path.exists():
+        return []
+    return load_rule_module("declarative").load_rule_file(path)
 
 
-class AuditEntitySeparateClassRule(Rule):
-    name = RULE_AUDIT_ENTITY_SEPARATE_CLASS
+def _should_run_auxiliary_rule(rule_name: str, only_filters: set[str]) -> bool:
+    if not only_filters:
+        return True
+    return rule_name in resolve_selection(only_filters)
+
+
+def resolve_jobs(requested: int) -> int:
+    if requested > 0:
+        return requested
+    return os.cpu_count() or 1
+
+
+def _check_java_files(
+    java_files: list[FileContext],
+    rules: list[Rule],
+    project_ctx: ProjectContext,
+    jobs: int,
+    cache: ResultCache | None,
+    report: ReportWriter,
+    profile: RunProfile | None = None,
+    rule_time_budget: float = DEFAULT_RULE_TIME_BUDGET_SECONDS,
+    costs: RuleCostHistory | None = None,
+) -> list[Violation]:
+    # Reports each file's violations and returns the ones that go ahead of
+    # them: the files up to the anchor, with the project rule results merged in.
+    file_rules = [rule for rule in rules if not isinstance(rule, ProjectRule)]
+    project_rules = [rule for rule in rules if isinstance(rule, ProjectRule)]
+    engine = RuleEngine(file_rules, profile, rule_time_budget)
+    per_file = _check_file_rules_cached(java_files, engine, project_ctx, jobs, cache)
+    _record_rule_costs(costs, engine, jobs)
+    if len(project_rules) == 0 or len(project_ctx.java_files) == 0:
+        for found in per_file.groups():
+            report.add(found)
+        return []
 
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if ENTITY_CLASS_PATTERN.search(file_ctx.text) is None:
-            return []
-        if MAPPED_SUPERCLASS_PATTERN.search(file_ctx.text) is not None:
-            return []
-        declaration = _find_class_declaration(file_ctx.lines)
-        extends_name = declaration[1] if declaration is not None else ""
-        if "Audit" in extends_name:
-            return []
-        audit_field_lines = _find_audit_field_lines(file_ctx.lines)
-        if len(audit_field_lines) == 0:
-            return []
-        return [
-            Violation(
-                rule=self.name,
-                severity=SEVERITY_ERROR,
-                file=file_ctx.rel_path,
-                line=audit_field_lines[0][0],
-                reason="Entity must place audit fields in a separate base class (MappedSuperclass).",
-                snippet=audit_field_lines[0][1].strip(),
-            )
-        ]
+    project_started = time.perf_counter()
+    found = run_project_rules(project_rules, project_ctx.index, profile)
+    if profile is not None:
+        profile.add_phase("project", time.perf_counter() - project_started)
+    anchor = project_ctx.index.anchor
+    anchor_position = next((i for i, file_ctx in enumerate(java_files) if file_ctx.rel_path == anchor), -1)
+    head = found
+    if anchor_position >= 0:
+        head = [violation for index in range(anchor_position) for violation in per_file.group(index)]
+        head.extend(_merge_project_violations(per_file.group(anchor_position), found, rules))
+    for index in range(anchor_position + 1, per_file.group_count):
+        report.add(per_file.group(index))
+    return head
+
+
+def _check_java_file_stream(
+    java_files: Iterable[FileContext],
+    rules: list[Rule],
+    project_ctx: ProjectContext,
+    jobs: int,
+    cache: ResultCache | None,
+    report: ReportWriter,
+    profile: RunProfile | None = None,
+    rule_time_budget: float = DEFAULT_RULE_TIME_BUDGET_SECONDS,
+    costs: RuleCostHistory | None = None,
+) -> list[Violation]:
+    # Same contract as _check_java_files; the anchor is the first file.
+    file_rules = [rule for rule in rules if not isinstance(rule, ProjectRule)]
+    project_rules = [rule for rule in rules if isinstance(rule, ProjectRule)]
+    builder = ProjectIndexBuilder()
+
+    def indexed(files: Iterable[FileContext]) -> Iterator[FileContext]:
+        for file_ctx in files:
+            builder.add(file_ctx)
+            yield file_ctx
+
+    # Only the compact project index outlives each file; violations go
+    # straight to the report sinks, except the anchor's own.
+    anchor_found: list[Violation] | None = None
+    engine = RuleEngine(file_rules, profile, rule_time_budget)
+    for found in stream_file_rules(indexed(java_files), engine, project_ctx, jobs, cache):
+        if anchor_found is None:
+            anchor_found = found
+            continue
+        report.add(found)
+    _record_rule_costs(costs, engine, jobs)
+    if anchor_found is None or len(project_rules) == 0:
+        return anchor_found or []
+
+    project_started = time.perf_counter()
+    found = run_project_rules(project_rules, builder.build(), profile)
+    if profile is not None:
+        profile.add_phase("project", time.perf_counter() - project_started)
+    return _merge_project_violations(anchor_found, found, rules)
+
+
+def _check_java_files_fail_fast(
+    java_files: list[FileContext],
+    rules: list[Rule],
+    project_ctx: ProjectContext,
+    cache: ResultCache | None,
+    report: ReportWriter,
+    limit: int,
+    costs: RuleCostHistory | None,
+    rule_time_budget: float = DEFAULT_RULE_TIME_BUDGET_SECONDS,
+) -> bool:
+    # Reports violations until `limit` failures are reached and returns whether
+    # it stopped early. Cached files cost nothing, so they go first. The other
+    # files are then checked in passes over rule groups ordered by the cost
+    # history, and the project rules run last. Results are reported as they
+    # are found rather than in file order, and nothing is written to the
+    # cache because a stopped run has checked files only in part.
+    pending: list[FileContext] = []
+    for file_ctx in java_files:
+        _, rows = _cached_file_rows(file_ctx, cache, None)
+        if rows is None:
+            pending.append(file_ctx)
+            continue
+        report.add([_violation_from_row(row) for row in rows])
+        if _limit_reached(report, project_ctx.strict, limit):
+            return True
 
+    file_rules = [rule for rule in rules if not isinstance(rule, ProjectRule)]
+    rule_names = [rule.name for rule in file_rules]
+    for names in costs.schedule(rule_names) if costs is not None else [rule_names]:
+        selected = set(names)
+        # Each pass is an ordinary single walk over the pending files.
+        engine = RuleEngine([rule for rule in file_rules if rule.name in selected], rule_time_budget=rule_time_budget)
+        for file_ctx in pending:
+            report.add(engine.check(file_ctx, project_ctx))
+            if _limit_reached(report, project_ctx.strict, limit):
+                _record_rule_costs(costs, engine, 1)
+                return True
+        _record_rule_costs(costs, engine, 1)
+
+    project_rules = [rule for rule in rules if isinstance(rule, ProjectRule)]
+    if len(project_rules) > 0 and len(project_ctx.java_files) > 0:
+        report.add(run_project_rules(project_rules, project_ctx.index))
+    return _limit_reached(report, project_ctx.strict, limit)
+
+
+def _limit_reached(report: ReportWriter, strict: bool, limit: int) -> bool:
+    # Counts what would fail the run: errors, and warnings too under --strict.
+    failures = report.errors + report.warnings if strict else report.errors
+    return failures >= limit
+
+
+def _record_rule_costs(costs: RuleCostHistory | None, engine: RuleEngine, jobs: int) -> None:
+    # Worker processes keep their own totals, so only in-process runs are recorded.
+    if costs is None or jobs > 1:
+        return
+    costs.record(engine.rule_seconds, engine.rule_errors)
+
+
+def _merge_project_violations(anchor_found: list[Violation], found: list[Violation], rules: list[Rule]) -> list[Violation]:
+    # Project rule violations are reported with the first project file, in
+    # rule order among that file's own results.
+    rule_order = {rule.name: position for position, rule in enumerate(rules)}
+    # Engine reports, which belong to no rule, stay last.
+    return sorted(anchor_found + found, key=lambda violation: rule_order.get(violation.rule, len(rule_order)))
+
+
+def stream_file_rules(
+    java_files: Iterable[FileContext],
+    engine: RuleEngine,
+    project_ctx: ProjectContext,
+    jobs: int,
+    cache: ResultCache | None,
+) -> Iterator[list[Violation]]:
+    if jobs <= 1:
+        for file_ctx in java_files:
+            digest, found = _cached_file_result(file_ctx, cache, engine.profile)
+            if found is None:
+                found = engine.check(file_ctx, project_ctx)
+                _store_file_result(file_ctx.rel_path, digest, found, cache)
+            yield found
+        return
 
-class AuditDtoSeparateClassRule(Rule):
-    name = RULE_AUDIT_DTO_SEPARATE_CLASS
+    # A bounded window of in-flight files keeps the pool busy without
+    # submitting, and holding, the whole tree at once.
+    window = jobs * PARALLEL_CHUNKS_PER_JOB
+    in_flight: deque[tuple[str, str, list[Violation] | Future]] = deque()
+    worker = _worker_check_function(engine)
+    with _worker_pool(jobs, engine, project_ctx) as executor:
+        for file_ctx in java_files:
+            digest, found = _cached_file_result(file_ctx, cache, engine.profile)
+            pending = found if found is not None else executor.submit(worker, file_ctx)
+            in_flight.append((file_ctx.rel_path, digest, pending))
+            while len(in_flight) > window:
+                yield _settle_file_result(in_flight.popleft(), cache, engine.profile)
+        while len(in_flight) > 0:
+            yield _settle_file_result(in_flight.popleft(), cache, engine.profile)
+
+
+def _cached_file_result(
+    file_ctx: FileContext,
+    cache: ResultCache | None,
+    profile: RunProfile | None = None,
+) -> tuple[str, list[Violation] | None]:
+    digest, rows = _cached_file_rows(file_ctx, cache, profile)
+    if rows is None:
+        return digest, None
+    return digest, [_violation_from_row(row) for row in rows]
+
+
+def _cached_file_rows(
+    file_ctx: FileContext,
+    cache: ResultCache | None,
+    profile: RunProfile | None,
+) -> tuple[str, list[list] | None]:
+    if cache is None:
+        return "", None
+    digest = content_digest(file_ctx.text)
+    rows = cache.get(file_ctx.rel_path, digest)
+    if rows is not None and profile is not None:
+        profile.record_cached_file()
+    return digest, rows
+
+
+def _store_file_result(rel_path: str, digest: str, found: list[Violation], cache: ResultCache | None) -> None:
+    if cache is None:
+        return
+    # A rule stopped by its time budget left the file partly unchecked, so it
+    # is checked again next run.
+    if any(violation.rule == RULE_TIME_BUDGET for violation in found):
+        return
+    cache.put(rel_path, digest, [_violation_to_row(v) for v in found])
+
+
+def _settle_file_result(
+    entry: tuple[str, str, list[Violation] | Future],
+    cache: ResultCache | None,
+    profile: RunProfile | None,
+) -> list[Violation]:
+    rel_path, digest, pending = entry
+    if isinstance(pending, list):
+        return pending
+    found = _worker_result(rel_path, pending.result(), profile)
+    _store_file_result(rel_path, digest, found, cache)
+    return found
+
+
+def _check_file_rules_cached(
+    java_files: list[FileContext],
+    engine: RuleEngine,
+    project_ctx: ProjectContext,
+    jobs: int,
+    cache: ResultCache | None,
+) -> ViolationStore:
+    from .violation_store import ViolationStore
+
+    # One store group per file, in `java_files` order. Cached rows and fresh
+    # results are folded in one file at a time, so only the compact store
+    # holds the whole result set.
+    cached = [_cached_file_rows(file_ctx, cache, engine.profile) for file_ctx in java_files]
+    pending_files = [file_ctx for file_ctx, (_, rows) in zip(java_files, cached) if rows is None]
+    checked = _run_file_rules(pending_files, engine, project_ctx, jobs)
+    results = ViolationStore(Violation)
+    for file_ctx, (digest, rows) in zip(java_files, cached):
+        if rows is not None:
+            results.add_group(_violation_from_row(row) for row in rows)
+            continue
+        found = next(checked)
+        _store_file_result(file_ctx.rel_path, digest, found, cache)
+        results.add_group(found)
+    return results
 
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if "/dto/" not in file_ctx.rel_path:
-            return []
-        if "Audit" in file_ctx.rel_path:
-            return []
-        audit_field_lines = _find_audit_field_lines(file_ctx.lines)
-        if len(audit_field_lines) == 0:
-            return []
-        return [
-            Violation(
-                rule=self.name,
-                severity=SEVERITY_ERROR,
-                file=file_ctx.rel_path,
-                line=audit_field_lines[0][0],
-                reason="DTO must use separate audit model instead of direct audit fields.",
-                snippet=audit_field_lines[0][1].strip(),
-            )
-        ]
 
+def run_project_rules(
+    rules: list[ProjectRule],
+    index: ProjectIndex,
+    profile: RunProfile | None = None,
+) -> list[Violation]:
+    if profile is None:
+        return [violation for rule in rules for violation in rule.check_project(index)]
+    violations: list[Violation] = []
+    for rule in rules:
+        started = time.perf_counter()
+        violations.extend(rule.check_project(index))
+        profile.record_project_rule(rule.name, time.perf_counter() - started)
+    return violations
 
-class ExceptionSerialVersionUidRule(Rule):
-    name = RULE_EXCEPTION_SERIAL_VERSION_UID
 
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if "/exception/" not in file_ctx.rel_path:
-            return []
-        if EXCEPTION_CLASS_PATTERN.search(file_ctx.text) is None:
-            return []
-        if SERIAL_VERSION_UID_PATTERN.search(file_ctx.text) is not None:
-            return []
-        line = _first_line_regex(file_ctx.lines, r"\bclass\s+[A-Z]\w*Exception\b")
-        return [
-            Violation(
-                rule=self.name,
-                severity=SEVERITY_ERROR,
-                file=file_ctx.rel_path,
-                line=line if line > 0 else 1,
-                reason="Exception class must declare static final long serialVersionUID.",
-                snippet=file_ctx.lines[line - 1].strip() if line > 0 else file_ctx.rel_path,
-            )
-        ]
+def _run_file_rules(
+    java_files: list[FileContext],
+    engine: RuleEngine,
+    project_ctx: ProjectContext,
+    jobs: int,
+) -> Iterator[list[Violation]]:
+    if jobs <= 1 or len(java_files) <= 1:
+        for file_ctx in java_files:
+            yield engine.check(file_ctx, project_ctx)
+        return
 
+    chunk_size = max(1, len(java_files) // (jobs * PARALLEL_CHUNKS_PER_JOB))
+    with _worker_pool(jobs, engine, project_ctx) as executor:
+        results = executor.map(_worker_check_function(engine), java_files, chunksize=chunk_size)
+        for file_ctx, result in zip(java_files, results):
+            yield _worker_result(file_ctx.rel_path, result, engine.profile)
 
-class NoDirectTrimRule(Rule):
-    name = RULE_NO_DIRECT_TRIM
 
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        violations: list[Violation] = []
-        for index, raw in enumerate(file_ctx.lines, start=1):
-            line = _strip_line_comment(raw).strip()
-            if line == "":
-                continue
-            if "StringUtils.trim(" in line:
-                continue
-            if DIRECT_TRIM_PATTERN.search(line) is None:
-                continue
-            violations.append(
-                Violation(
-                    rule=self.name,
-                    severity=SEVERITY_ERROR,
-                    file=file_ctx.rel_path,
-                    line=index,
-                    reason="Direct .trim() is forbidden. Use StringUtils from Apache Commons Lang3.",
-                    snippet=raw.strip(),
-                )
-            )
-        return violations
+def _violation_to_row(violation: Violation) -> list:
+    return [violation.rule, violation.severity, violation.file, violation.line, violation.reason, violation.snippet]
 
 
-class NoDirectBlankCheckRule(Rule):
-    name = RULE_NO_DIRECT_BLANK_CHECK
+def _violation_from_row(row: list) -> Violation:
+    return Violation(rule=row[0], severity=row[1], file=row[2], line=row[3], reason=row[4], snippet=row[5])
 
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        violations: list[Violation] = []
-        for index, raw in enumerate(file_ctx.lines, start=1):
-            line = _strip_line_comment(raw).strip()
-            if line == "":
-                continue
-            if "StringUtils.isBlank(" in line or "StringUtils.isNotBlank(" in line:
-                continue
-            if NULL_OR_BLANK_PATTERN.search(line) is not None:
-                violations.append(
-                    Violation(
-                        rule=self.name,
-                        severity=SEVERITY_ERROR,
-                        file=file_ctx.rel_path,
-                        line=index,
-                        reason="Direct null/blank check is forbidden. Use StringUtils.isBlank/isNotBlank.",
-                        snippet=raw.strip(),
-                    )
-                )
-                continue
-            if DIRECT_IS_BLANK_PATTERN.search(line) is None:
-                continue
-            violations.append(
-                Violation(
-                    rule=self.name,
-                    severity=SEVERITY_ERROR,
-                    file=file_ctx.rel_path,
-                    line=index,
-                    reason="Direct .isBlank() is forbidden. Use StringUtils.isBlank/isNotBlank.",
-                    snippet=raw.strip(),
-                )
-            )
-        return violations
-
-
-class NoDirectStringPredicateRule(Rule):
-    name = RULE_NO_DIRECT_STRING_PREDICATE
-
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        violations: list[Violation] = []
-        for index, raw in enumerate(file_ctx.lines, start=1):
-            line = _strip_line_comment(raw).strip()
-            if line == "":
-                continue
-
-            has_stringutils_call = (
-                "StringUtils.isEmpty(" in line
-                or "StringUtils.isNotEmpty(" in line
-                or "StringUtils.contains(" in line
-                or "Strings.CS.equals(" in line
-                or "Strings.CI.equals(" in line
-                or "Strings.CS.startsWith(" in line
-                or "Strings.CS.endsWith(" in line
-                or "Strings.CI.startsWith(" in line
-                or "Strings.CI.endsWith(" in line
-            )
-            if has_stringutils_call:
-                continue
-
-            if NULL_OR_EMPTY_SAME_VAR_PATTERN.search(line) is not None:
-                violations.append(
-                    Violation(
-                        rule=self.name,
-                        severity=SEVERITY_ERROR,
-                        file=file_ctx.rel_path,
-                        line=index,
-                        reason="Direct null/empty check is forbidden. Use StringUtils.isEmpty/isNotEmpty.",
-                        snippet=raw.strip(),
-                    )
-                )
-                continue
-
-            if NOT_NULL_AND_EMPTY_SAME_VAR_PATTERN.search(line) is not None:
-                violations.append(
-                    Violation(
-                        rule=self.name,
-                        severity=SEVERITY_ERROR,
-                        file=file_ctx.rel_path,
-                        line=index,
-                        reason="Direct null/empty check is forbidden. Use StringUtils.isEmpty/isNotEmpty.",
-                        snippet=raw.strip(),
-                    )
-                )
-                continue
-
-            if NOT_NULL_AND_NOT_EMPTY_SAME_VAR_PATTERN.search(line) is not None:
-                violations.append(
-                    Violation(
-                        rule=self.name,
-                        severity=SEVERITY_ERROR,
-                        file=file_ctx.rel_path,
-                        line=index,
-                        reason="Direct null/empty check is forbidden. Use StringUtils.isEmpty/isNotEmpty.",
-                        snippet=raw.strip(),
-                    )
-                )
-                continue
-
-            if DIRECT_STARTS_WITH_PATTERN.search(line) is not None:
-                violations.append(
-                    Violation(
-                        rule=self.name,
-                        severity=SEVERITY_ERROR,
-                        file=file_ctx.rel_path,
-                        line=index,
-                        reason="Direct .startsWith() is forbidden. Use Apache Commons Lang3 Strings.CS/CI.startsWith.",
-                        snippet=raw.strip(),
-                    )
-                )
-                continue
-
-            if DIRECT_ENDS_WITH_PATTERN.search(line) is not None:
-                violations.append(
-                    Violation(
-                        rule=self.name,
-                        severity=SEVERITY_ERROR,
-                        file=file_ctx.rel_path,
-                        line=index,
-                        reason="Direct .endsWith() is forbidden. Use Apache Commons Lang3 Strings.CS/CI.endsWith.",
-                        snippet=raw.strip(),
-                    )
-                )
-                continue
-
-            if DIRECT_CONTAINS_PATTERN.search(line) is not None:
-                violations.append(
-                    Violation(
-                        rule=self.name,
-                        severity=SEVERITY_ERROR,
-                        file=file_ctx.rel_path,
-                        line=index,
-                        reason="Direct .contains() is forbidden. Use StringUtils.contains.",
-                        snippet=raw.strip(),
-                    )
-                )
-                continue
-
-            if DEPRECATED_STRINGUTILS_EQUALS_PATTERN.search(line) is not None:
-                violations.append(
-                    Violation(
-                        rule=self.name,
-                        severity=SEVERITY_ERROR,
-                        file=file_ctx.rel_path,
-                        line=index,
-                        reason="Deprecated StringUtils.equals() is forbidden. Use Apache Commons Lang3 Strings.CS.equals().",
-                        snippet=raw.strip(),
-                    )
-                )
-                continue
-
-            if DEPRECATED_STRINGUTILS_EQUALS_IGNORE_CASE_PATTERN.search(line) is not None:
-                violations.append(
-                    Violation(
-                        rule=self.name,
-                        severity=SEVERITY_ERROR,
-                        file=file_ctx.rel_path,
-                        line=index,
-                        reason="Deprecated StringUtils.equalsIgnoreCase() is forbidden. Use Apache Commons Lang3 Strings.CI.equals().",
-                        snippet=raw.strip(),
-                    )
-                )
-                continue
-
-            if DEPRECATED_STRINGUTILS_COMPARE_IGNORE_CASE_PATTERN.search(line) is not None:
-                violations.append(
-                    Violation(
-                        rule=self.name,
-                        severity=SEVERITY_ERROR,
-                        file=file_ctx.rel_path,
-                        line=index,
-                        reason="Deprecated StringUtils.compareIgnoreCase() is forbidden. Use Apache Commons Lang3 Strings.CI.equals()/Strings.CI.compare().",
-                        snippet=raw.strip(),
-                    )
-                )
-                continue
-
-            if DIRECT_EQUALS_PATTERN.search(line) is not None:
-                violations.append(
-                    Violation(
-                        rule=self.name,
-                        severity=SEVERITY_ERROR,
-                        file=file_ctx.rel_path,
-                        line=index,
-                        reason="Direct .equals() is forbidden for String comparison. Use Apache Commons Lang3 Strings.CS.equals().",
-                        snippet=raw.strip(),
-                    )
-                )
-                continue
-
-            if DIRECT_EQUALS_IGNORE_CASE_PATTERN.search(line) is None:
-                continue
-            violations.append(
-                Violation(
-                    rule=self.name,
-                    severity=SEVERITY_ERROR,
-                    file=file_ctx.rel_path,
-                    line=index,
-                    reason="Direct .equalsIgnoreCase() is forbidden. Use Apache Commons Lang3 Strings.CI.equals().",
-                    snippet=raw.strip(),
-                )
-            )
-        return violations
-
-
-class QueryMustUseNativeSqlRule(Rule):
-    name = RULE_QUERY_NATIVE_SQL_ONLY
 
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if "/repository/" not in file_ctx.rel_path:
-            return []
-        violations: list[Violation] = []
-        for index, raw in enumerate(file_ctx.lines, start=1):
-            if QUERY_ANNOTATION_PATTERN.search(raw) is None:
-                continue
-            block = _collect_annotation_block(file_ctx.lines, index, 20)
-            if "nativeQuery = true" not in block:
-                violations.append(
-                    Violation(
-                        rule=self.name,
-                        severity=SEVERITY_ERROR,
-                        file=file_ctx.rel_path,
-                        line=index,
-                        reason="@Query must use native SQL: set nativeQuery = true.",
-                        snippet=raw.strip(),
-                    )
-                )
-                continue
-            if JPQL_ENTITY_FROM_PATTERN.search(block) is None:
-                continue
-            violations.append(
-                Violation(
-                    rule=self.name,
-                    severity=SEVERITY_ERROR,
-                    file=file_ctx.rel_path,
-                    line=index,
-                    reason="@Query must reference real table/column names, not JPA entity names.",
-                    snippet=raw.strip(),
-                )
-            )
-        return violations
-
-
-class QueryKeywordUppercaseRule(Rule):
-    name = RULE_QUERY_KEYWORD_UPPERCASE
-
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if "/repository/" not in file_ctx.rel_path:
-            return []
-        violations: list[Violation] = []
-        for index, raw in enumerate(file_ctx.lines, start=1):
-            if QUERY_ANNOTATION_PATTERN.search(raw) is None:
-                continue
-            block = _collect_annotation_block(file_ctx.lines, index, 40)
-            for keyword_pattern in LOWERCASE_SQL_KEYWORD_PATTERNS:
-                if keyword_pattern.search(block) is None:
-                    continue
-                violations.append(
-                    Violation(
-                        rule=self.name,
-                        severity=SEVERITY_ERROR,
-                        file=file_ctx.rel_path,
-                        line=index,
-                        reason="SQL keywords in @Query must be uppercase.",
-                        snippet=raw.strip(),
-                    )
-                )
-                break
-        return violations
-
-
-class JavaDocControllerRule(Rule):
-    name = RULE_JAVADOC_CONTROLLER_REQUIRED
-
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if "/controller/" not in file_ctx.rel_path:
-            return []
-        lines = file_ctx.lines
-        violations: list[Violation] = []
-
-        for index, raw in enumerate(lines, start=1):
-            if REST_CONTROLLER_ANNOTATION_PATTERN.search(raw) is None:
-                continue
-            if _has_javadoc_above(lines, index, 10):
-                break
-            violations.append(
-                Violation(
-                    rule=self.name,
-                    severity=SEVERITY_ERROR,
-                    file=file_ctx.rel_path,
-                    line=index,
-                    reason="Controller class must define JavaDoc.",
-                    snippet=raw.strip(),
-                )
-            )
-            break
-
-        for index, raw in enumerate(lines, start=1):
-            if MAPPING_ANNOTATION_PATTERN.search(raw) is None:
-                continue
-            if _has_javadoc_above(lines, index, 12):
-                continue
-            violations.append(
-                Violation(
-                    rule=self.name,
-                    severity=SEVERITY_ERROR,
-                    file=file_ctx.rel_path,
-                    line=index,
-                    reason="Endpoint mapping must define JavaDoc.",
-                    snippet=raw.strip(),
-                )
-            )
-
-        return violations
-
-
-class JavaDocServiceRule(Rule):
-    name = RULE_JAVADOC_SERVICE_REQUIRED
-
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if "/service/" not in file_ctx.rel_path:
-            return []
-        lines = file_ctx.lines
-        violations: list[Violation] = []
-        class_name = _detect_primary_class_name(lines)
-
-        for index, raw in enumerate(lines, start=1):
-            stripped = raw.strip()
-            if not PUBLIC_METHOD_START_PATTERN.search(stripped):
-                continue
-            if " class " in stripped:
-                continue
-
-            signature = _collect_method_signature(lines, index, 8)
-            return_type = _extract_return_type(signature)
-            method_name = _extract_method_name(signature)
-            if method_name == "":
-                continue
-            if method_name == class_name:
-                continue
-
-            param_names = _extract_param_names(signature)
-            javadoc = _extract_javadoc_above(lines, index, 20)
-            if javadoc == "":
-                violations.append(
-                    Violation(
-                        rule=self.name,
-                        severity=SEVERITY_ERROR,
-                        file=file_ctx.rel_path,
-                        line=index,
-                        reason="Service method must have JavaDoc with @param/@return.",
-                        snippet=stripped,
-                    )
-                )
-                continue
-
-            for param_name in param_names:
-                if f"@param {param_name}" in javadoc:
-                    continue
-                violations.append(
-                    Violation(
-                        rule=self.name,
-                        severity=SEVERITY_ERROR,
-                        file=file_ctx.rel_path,
-                        line=index,
-                        reason=f"Service JavaDoc missing @param for '{param_name}'.",
-                        snippet=stripped,
-                    )
-                )
-                break
-
-            if return_type == "void":
-                continue
-            if "@return" in javadoc:
-                continue
-            violations.append(
-                Violation(
-                    rule=self.name,
-                    severity=SEVERITY_ERROR,
-                    file=file_ctx.rel_path,
-                    line=index,
-                    reason="Service JavaDoc missing @return.",
-                    snippet=stripped,
-                )
-            )
-
-        return violations
-
-
-class PrecedingCommentRule(Rule):
+class WatchSession:
+    # Keeps file contexts, per-file results and project rule results between
+    # polls, so a refresh only rereads and rechecks files whose stamp changed.
     def __init__(
         self,
-        *,
-        name: str,
-        pattern: re.Pattern[str],
-        reason: str,
-        main_source_only: bool = False,
-        rel_path_contains_any: tuple[str, ...] = (),
+        discovery: SourceDiscovery,
+        rules: list[Rule],
+        strict: bool,
+        only_filters: set[str],
+        jobs: int,
+        cache: ResultCache | None,
+        prefetch: int,
+        rule_time_budget: float = DEFAULT_RULE_TIME_BUDGET_SECONDS,
     ) -> None:
-        self.name = name
-        self._pattern = pattern
-        self._reason = reason
-        self._main_source_only = main_source_only
-        self._rel_path_contains_any = rel_path_contains_any
-
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if self._main_source_only and not file_ctx.rel_path.startswith("src/main/java/"):
-            return []
-        if self._rel_path_contains_any and not any(token in file_ctx.rel_path for token in self._rel_path_contains_any):
-            return []
-        violations: list[Violation] = []
-        lines = file_ctx.lines
-        for index, raw in enumerate(lines, start=1):
-            if self._pattern.search(raw) is None:
-                continue
-            if _has_comment_above(lines, index, 4):
-                continue
-            violations.append(
-                Violation(
-                    rule=self.name,
-                    severity=SEVERITY_ERROR,
-                    file=file_ctx.rel_path,
-                    line=index,
-                    reason=self._reason,
-                    snippet=raw.strip(),
-                )
-            )
-        return violations
-
-
-class ExceptionMessageI18nRule(Rule):
-    name = RULE_EXCEPTION_MESSAGE_I18N
-
-    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
-        if not file_ctx.rel_path.startswith("src/main/java/"):
-            return []
-        if not any(
-            token in file_ctx.rel_path
-            for token in ("/controller/", "/service/", "/mode/", "/security/", "/exception/", "/error/")
-        ):
-            return []
-        violations: list[Violation] = []
-        for index, raw in enumerate(file_ctx.lines, start=1):
-            if I18N_ALLOW_TECHNICAL_LITERAL_MARKER in raw:
-                continue
-            if _has_comment_marker_above(file_ctx.lines, index, I18N_ALLOW_TECHNICAL_LITERAL_MARKER, 2):
-                continue
-            stripped = _strip_line_comment(raw).strip()
-            if stripped == "":
-                continue
-            literal = _find_exception_literal(stripped)
-            if literal is None:
-                continue
-            if _looks_like_message_key(literal):
-                continue
-            violations.append(
-                Violation(
-                    rule=self.name,
-                    severity=SEVERITY_ERROR,
-                    file=file_ctx.rel_path,
-                    line=index,
-                    reason="Exception or message-source path must use i18n message keys instead of hardcoded user-facing text.",
-                    snippet=raw.strip(),
-                )
-            )
-        return violations
-
-
-def _check_vietnamese_messages(root: Path) -> list[Violation]:
-    file_path = root / "src" / "main" / "resources" / "messages_vi.properties"
-    if not file_path.exists():
-        return [
-            Violation(
-                rule=RULE_VI_MESSAGES_ACCENTED,
-                severity=SEVERITY_ERROR,
-                file="src/main/resources/messages_vi.properties",
-                line=1,
-                reason="Missing messages_vi.properties.",
-                snippet="messages_vi.properties",
-            )
-        ]
-
-    lines = file_path.read_text(encoding="utf-8").splitlines()
-    violations: list[Violation] = []
-    relative = file_path.relative_to(root).as_posix()
-    for index, raw in enumerate(lines, start=1):
-        stripped = raw.strip()
-        if stripped == "" or stripped.startswith("#"):
-            continue
-        if "=" not in stripped:
-            continue
-        key, value = stripped.split("=", 1)
-        _ = key
-        normalized = value.strip()
-        if normalized == "":
-            continue
-        has_alpha = any(ch.isalpha() for ch in normalized)
-        if not has_alpha:
-            continue
-        if VIETNAMESE_ACCENTED_CHAR_PATTERN.search(normalized) is not None:
-            continue
-        violations.append(
-            Violation(
-                rule=RULE_VI_MESSAGES_ACCENTED,
-                severity=SEVERITY_ERROR,
-                file=relative,
-                line=index,
-                reason="Vietnamese message must contain accented Vietnamese characters.",
-                snippet=raw.strip(),
-            )
+        import threading
+
+        self.discovery = discovery
+        self.rules = rules
+        self.strict = strict
+        self.only_filters = only_filters
+        self.jobs = jobs
+        self.cache = cache
+        self.prefetch = prefetch
+        self.engine = RuleEngine([rule for rule in rules if not isinstance(rule, ProjectRule)], rule_time_budget=rule_time_budget)
+        self.project_rules = [rule for rule in rules if isinstance(rule, ProjectRule)]
+        self.files: dict[str, FileContext] = {}
+        self.results: dict[str, list[Violation]] = {}
+        self.project_found: list[Violation] = []
+        self.auxiliary_found: list[Violation] = []
+        self.stamps: dict[str, FileStamp] = {}
+        self.refreshed = False
+        self.lock = threading.Lock()
+        self._response: dict | None = None
+
+    def poll(self) -> ChangeSet:
+        with self.lock:
+            first = not self.refreshed
+            change_set = self._refresh()
+            if len(change_set.touched()) == 0:
+                return change_set
+            self._response = None
+            _write_report(self.discovery.root, self.violations())
+            if self.cache is not None:
+                self.cache.save(prune=first)
+            return change_set
+
+    def handle_request(self, request: dict) -> dict:
+        from .watch import COMMAND_CHECK
+
+        if request.get("command", COMMAND_CHECK) != COMMAND_CHECK:
+            return {"output": [f"Unknown command: {request.get('command')}"], "exit_code": 1}
+        # Refresh first so a query right after a save sees the new contents.
+        self.poll()
+        with self.lock:
+            if self._response is None:
+                violations = self.violations()
+                self._response = {"output": _summary_lines(violations), "exit_code": _exit_code(violations, self.strict)}
+            return self._response
+
+    def violations(self) -> list[Violation]:
+        ordered = sorted(self.files)
+        per_file = [self.results[rel_path] for rel_path in ordered]
+        if len(self.project_found) > 0 and len(per_file) > 0:
+            per_file[0] = _merge_project_violations(per_file[0], self.project_found, self.rules)
+        return [violation for found in per_file for violation in found] + self.auxiliary_found
+
+    def _refresh(self) -> ChangeSet:
+        root = self.discovery.root
+        first = not self.refreshed
+        self.refreshed = True
+        self.stamps, change_set, changed_files = _poll_sources(
+            self.discovery, self.stamps, self.files, AUXILIARY_RULE_FILES, self.prefetch
         )
-    return violations
-
-
-def _check_error_message_keys_in_bundles(root: Path) -> list[Violation]:
-    key_file = root / "src" / "main" / "java" / "com" / "lumos" / "common" / "error" / "ErrorMessageKeys.java"
-    if not key_file.exists():
-        return [
-            Violation(
-                rule=RULE_MESSAGE_KEYS_BUNDLE,
-                severity=SEVERITY_ERROR,
-                file="src/main/java/com/lumos/common/error/ErrorMessageKeys.java",
-                line=1,
-                reason="Missing ErrorMessageKeys.java for backend i18n contract.",
-                snippet="ErrorMessageKeys.java",
-            )
-        ]
-    key_lines = key_file.read_text(encoding="utf-8").splitlines()
-    defined_keys: list[tuple[int, str]] = []
-    for index, raw in enumerate(key_lines, start=1):
-        match = MESSAGE_KEY_CONSTANT_PATTERN.search(raw)
-        if match is None:
-            continue
-        defined_keys.append((index, match.group(1)))
-
-    bundle_entries: dict[str, set[str]] = {}
-    for relative_path in MESSAGE_BUNDLE_FILES:
-        bundle_path = root / Path(relative_path)
-        if not bundle_path.exists():
-            bundle_entries[relative_path] = set()
-            continue
-        bundle_entries[relative_path] = _load_message_bundle_keys(bundle_path)
-
-    violations: list[Violation] = []
-    key_relative = key_file.relative_to(root).as_posix()
-    for line_number, key in defined_keys:
-        for relative_path in MESSAGE_BUNDLE_FILES:
-            if key in bundle_entries[relative_path]:
-                continue
-            violations.append(
-                Violation(
-                    rule=RULE_MESSAGE_KEYS_BUNDLE,
-                    severity=SEVERITY_ERROR,
-                    file=key_relative,
-                    line=line_number,
-                    reason=f'Message key "{key}" must exist in {relative_path}.',
-                    snippet=key,
-                )
-            )
-    return violations
-
-
-def _collect_java_files(root: Path) -> list[FileContext]:
-    source_roots = [
-        root / "src" / "main" / "java",
-        root / "src" / "test" / "java",
-    ]
+        if len(change_set.touched()) == 0:
+            return change_set
+        for rel_path in change_set.deleted:
+            self.results.pop(rel_path, None)
+
+        project_ctx = ProjectContext(
+            root=root,
+            java_files=[self.files[rel_path] for rel_path in sorted(self.files)],
+            strict=self.strict,
+            only_filters=self.only_filters,
+        )
+        found = _check_file_rules_cached(changed_files, self.engine, project_ctx, self.jobs, self.cache)
+        for file_ctx, file_found in zip(changed_files, found.groups()):
+            self.results[file_ctx.rel_path] = file_found
+        if first or _affects_project_rules(self.discovery, change_set, changed_files):
+            self.project_found = []
+            if len(self.project_rules) > 0 and len(project_ctx.java_files) > 0:
+                self.project_found = run_project_rules(self.project_rules, project_ctx.index)
+
+        touched = change_set.touched()
+        if first or any(rel_path in touched for rel_path in AUXILIARY_RULE_FILES):
+            self.auxiliary_found = check_auxiliary_rules(_working_tree_reader(root), self.only_filters, True, True)
+        return change_set
+
+
+class EditorSession:
+    # Serves the language server: one buffer at a time through the file rules,
+    # and the project rules over the files on disk with open buffers laid over them.
+    def __init__(
+        self,
+        discovery: SourceDiscovery,
+        rules: list[Rule],
+        strict: bool,
+        only_filters: set[str],
+        prefetch: int,
+        rule_time_budget: float = DEFAULT_RULE_TIME_BUDGET_SECONDS,
+    ) -> None:
+        self.discovery = discovery
+        self.rules = rules
+        self.prefetch = prefetch
+        self.engine = RuleEngine([rule for rule in rules if not isinstance(rule, ProjectRule)], rule_time_budget=rule_time_budget)
+        self.project_rules = [rule for rule in rules if isinstance(rule, ProjectRule)]
+        self.project_ctx = ProjectContext(root=discovery.root, java_files=[], strict=strict, only_filters=only_filters)
+        self.disk_files: dict[str, FileContext] = {}
+        self.stamps: dict[str, FileStamp] = {}
+
+    def check_document(self, path: Path, text: str) -> list[dict] | None:
+        rel_path = self._rel_path(path)
+        if rel_path is None:
+            return None
+        file_ctx = build_file_context(self.discovery.root, rel_path, text)
+        return [_violation_to_diagnostic(v, file_ctx.lines) for v in self.engine.check(file_ctx, self.project_ctx)]
+
+    def affects_project(self, path: Path, previous: str | None, text: str | None) -> bool:
+        from .git_changes import ChangeSet
+
+        rel_path = self._rel_path(path)
+        if rel_path is None or len(self.project_rules) == 0:
+            return False
+        # Either version can decide the outcome, e.g. when @Entity is removed.
+        versions = [build_file_context(self.discovery.root, rel_path, item) for item in (previous, text) if item is not None]
+        return _affects_project_rules(self.discovery, ChangeSet(modified=[rel_path]), versions)
+
+    def check_project(self, documents: dict[Path, str]) -> dict[Path, list[dict]]:
+        if len(self.project_rules) == 0:
+            return {}
+        self.stamps, _, _ = _poll_sources(self.discovery, self.stamps, self.disk_files, (), self.prefetch)
+        files = dict(self.disk_files)
+        for path, text in documents.items():
+            rel_path = self._rel_path(path)
+            if rel_path is not None:
+                files[rel_path] = build_file_context(self.discovery.root, rel_path, text)
+        if len(files) == 0:
+            return {}
+
+        index = _build_project_index([files[rel_path] for rel_path in sorted(files)])
+        grouped: dict[Path, list[dict]] = {}
+        for violation in run_project_rules(self.project_rules, index):
+            lines = files[violation.file].lines if violation.file in files else []
+            grouped.setdefault(self.discovery.root / violation.file, []).append(_violation_to_diagnostic(violation, lines))
+        return grouped
+
+    def _rel_path(self, path: Path) -> str | None:
+        try:
+            rel_path = path.relative_to(self.discovery.root).as_posix()
+        except ValueError:
+            return None
+        return rel_path if self.discovery.includes(rel_path) else None
+
+
+def _poll_sources(
+    discovery: SourceDiscovery,
+    stamps: dict[str, FileStamp],
+    files: dict[str, FileContext],
+    extra_paths: Iterable[str],
+    prefetch: int,
+) -> tuple[dict[str, FileStamp], ChangeSet, list[FileContext]]:
+    from .git_changes import ChangeSet
+    from .watch import diff_stamps, stamp_files
+
+    # Rereads added and modified sources into `files` and drops deleted ones;
+    # extra paths are only stamped, so their changes show up in the change set.
+    rel_paths = discovery.discover()
+    current = stamp_files(discovery.root, [*rel_paths, *extra_paths])
+    added, modified, _ = diff_stamps(stamps, current)
+    java_paths = set(rel_paths)
+    changed = [rel_path for rel_path in sorted({*added, *modified}) if rel_path in java_paths]
+    changed_files, unreadable = _read_changed_sources(discovery.root, changed, prefetch)
+    # A file removed after it was stamped, or caught half written, counts as
+    # deleted for this poll. Dropping its stamp makes the next poll read it again.
+    for rel_path in unreadable:
+        del current[rel_path]
+    added, modified, deleted = diff_stamps(stamps, current)
+    change_set = ChangeSet(added=added, modified=modified, deleted=deleted)
+    for rel_path in deleted:
+        files.pop(rel_path, None)
+    for file_ctx in changed_files:
+        files[file_ctx.rel_path] = file_ctx
+    return current, change_set, changed_files
+
+
+def _read_changed_sources(root: Path, rel_paths: list[str], prefetch: int) -> tuple[list[FileContext], list[str]]:
+    from .read_ahead import ReadStats
+
+    # Returns the files that could be read and the paths that could not.
+    try:
+        return list(_read_java_files(root, rel_paths, prefetch, ReadStats())), []
+    except (OSError, UnicodeDecodeError):
+        pass
+    # Rare enough that the failing files are found by reading one at a time.
     files: list[FileContext] = []
-    for source_root in source_roots:
-        if not source_root.exists():
+    unreadable: list[str] = []
+    for rel_path in rel_paths:
+        try:
+            text = _decode_source((root / rel_path).read_bytes())
+        except (OSError, UnicodeDecodeError):
+            unreadable.append(rel_path)
             continue
-        for path in source_root.rglob(f"*{JAVA_EXTENSION}"):
-            text = path.read_text(encoding="utf-8")
-            lines = text.splitlines()
-            rel_path = path.relative_to(root).as_posix()
-            files.append(FileContext(path=path, rel_path=rel_path, text=text, lines=lines))
-    files.sort(key=lambda item: item.rel_path)
-    return files
-
-
-def _first_line_of(lines: list[str], token: str) -> int:
-    for index, raw in enumerate(lines, start=1):
-        if token in raw:
-            return index
-    return -1
-
+        files.append(build_file_context(root, rel_path, text))
+    return files, unreadable
 
-def _first_line_by_contains_any(lines: list[str], tokens: list[str]) -> int:
-    for index, raw in enumerate(lines, start=1):
-        for token in tokens:
-            if token in raw:
-                return index
-    return -1
 
+def _violation_to_diagnostic(violation: Violation, lines: list[str]) -> dict:
+    from .lsp import make_diagnostic
 
-def _first_line_regex(lines: list[str], regex: str) -> int:
-    pattern = re.compile(regex)
-    for index, raw in enumerate(lines, start=1):
-        if pattern.search(raw) is not None:
-            return index
-    return -1
+    line = max(violation.line, 1) - 1
+    end_character = len(lines[line]) if line < len(lines) else 0
+    return make_diagnostic(line, end_character, violation.severity == SEVERITY_ERROR, violation.rule, violation.reason)
 
 
-def _line_for_offset(lines: list[str], offset: int) -> int:
-    running = 0
-    for index, raw in enumerate(lines, start=1):
-        running += len(raw) + 1
-        if offset < running:
-            return index
-    return 1
+def _run_watch(session: WatchSession, socket_path: Path, interval: float) -> int:
+    import threading
 
+    from .watch import GuardSocketServer, supports_unix_sockets
 
-def _next_non_blank_lines(lines: list[str], start_line: int, limit: int) -> list[tuple[int, str]]:
-    results: list[tuple[int, str]] = []
-    index = start_line
-    while index < len(lines):
-        raw = lines[index]
-        if raw.strip() == "":
-            index += 1
-            continue
-        results.append((index + 1, raw))
-        if len(results) >= limit:
-            return results
-        index += 1
-    return results
-
-
-def _previous_non_blank_lines(lines: list[str], start_line: int, limit: int) -> list[tuple[int, str]]:
-    results: list[tuple[int, str]] = []
-    index = start_line - 2
-    while index >= 0:
-        raw = lines[index]
-        if raw.strip() == "":
-            index -= 1
-            continue
-        results.append((index + 1, raw))
-        if len(results) >= limit:
-            return results
-        index -= 1
-    return results
-
-
-def _collect_annotation_block(lines: list[str], start_line: int, max_lines: int) -> str:
-    parts: list[str] = []
-    open_paren = 0
-    seen_paren = False
-    index = start_line - 1
-    end = min(len(lines), index + max_lines)
-    while index < end:
-        line = lines[index]
-        parts.append(line)
-        open_paren += line.count("(")
-        open_paren -= line.count(")")
-        if line.count("(") > 0:
-            seen_paren = True
-        if seen_paren and open_paren <= 0:
-            break
-        if not seen_paren and index > start_line - 1:
-            break
-        index += 1
-    return " ".join(parts)
-
-
-def _detect_primary_class_name(lines: list[str]) -> str:
-    class_pattern = re.compile(r"\bclass\s+([A-Z]\w*)\b")
-    for raw in lines:
-        match = class_pattern.search(raw)
-        if match is None:
-            continue
-        return match.group(1)
-    return ""
-
-
-def _find_class_declaration(lines: list[str]) -> tuple[str, str] | None:
-    for raw in lines:
-        match = CLASS_DECLARATION_PATTERN.search(raw)
-        if match is None:
-            continue
-        class_name = match.group(1) or ""
-        extends_name = match.group(2) or ""
-        return (class_name, extends_name)
-    return None
-
-
-def _find_audit_field_lines(lines: list[str]) -> list[tuple[int, str]]:
-    matches: list[tuple[int, str]] = []
-    for index, raw in enumerate(lines, start=1):
-        stripped = _strip_line_comment(raw).strip()
-        if stripped == "":
-            continue
-        if AUDIT_FIELD_DECLARATION_PATTERN.search(stripped) is None:
-            continue
-        if "class " in stripped:
-            continue
-        matches.append((index, raw))
-    return matches
-
-
-def _indent_level(line: str) -> int:
-    count = 0
-    for char in line:
-        if char == " ":
-            count += 1
-            continue
-        if char == "\t":
-            count += 4
-            continue
-        break
-    return count
-
-
-def _strip_line_comment(line: str) -> str:
-    index = line.find("//")
-    if index < 0:
-        return line
-    return line[:index]
-
-
-def _find_exception_literal(line: str) -> str | None:
-    for pattern in (
-        THROW_NEW_EXCEPTION_LITERAL_PATTERN,
-        RESPONSE_STATUS_EXCEPTION_LITERAL_PATTERN,
-        MESSAGE_SOURCE_LITERAL_PATTERN,
-    ):
-        match = pattern.search(line)
-        if match is None:
-            continue
-        return match.group(1).strip()
-    return None
-
-
-def _looks_like_message_key(value: str) -> bool:
-    return re.fullmatch(r"[a-z0-9_.-]+", value) is not None
-
-
-def _has_comment_marker_above(lines: list[str], start_line: int, marker: str, max_lookback: int) -> bool:
-    start_index = start_line - 2
-    end_index = max(-1, start_index - max_lookback)
-    for index in range(start_index, end_index, -1):
-        raw = lines[index].strip()
-        if raw == "":
-            continue
-        if raw.startswith("//") and marker in raw:
-            return True
-        if raw.startswith("//"):
-            continue
-        return False
-    return False
-
-
-def _load_message_bundle_keys(path: Path) -> set[str]:
-    keys: set[str] = set()
-    for raw in path.read_text(encoding="utf-8").splitlines():
-        stripped = raw.strip()
-        if stripped == "" or stripped.startswith("#"):
-            continue
-        if "=" not in stripped:
-            continue
-        key, _ = stripped.split("=", 1)
-        keys.add(key.strip())
-    return keys
+    session.poll()
+    violations = session.violations()
+    _print_summary(violations)
 
+    server = None
+    stopped = threading.Event()
+    if supports_unix_sockets():
+        server = GuardSocketServer(socket_path, session.handle_request)
+        try:
+            server.start()
+        except OSError as error:
+            print(f"Unable to listen on {socket_path}: {error}")
+            return 1
+        stopped = server.stopped
+        print(f"Watching {len(session.files)} files. Query with --query, stop with --stop-daemon (socket: {socket_path}).")
+    else:
+        print(f"Watching {len(session.files)} files. Queries need Unix domain sockets and are disabled.")
+
+    try:
+        while not stopped.wait(interval):
+            change_set = session.poll()
+            if len(change_set.touched()) == 0:
+                continue
+            violations = session.violations()
+            errors = sum(1 for v in violations if v.severity == SEVERITY_ERROR)
+            warnings = sum(1 for v in violations if v.severity == SEVERITY_WARNING)
+            print(f"Re-checked {len(change_set.touched())} changed files. errors={errors}, warnings={warnings}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if server is not None:
+            server.close()
+    return 0
 
-def _has_javadoc_above(lines: list[str], start_line: int, max_lookback: int) -> bool:
-    start_index = start_line - 2
-    end_index = max(-1, start_index - max_lookback)
-    for index in range(start_index, end_index, -1):
-        raw = lines[index].strip()
-        if raw == "":
-            continue
-        if raw.startswith("/**"):
-            return True
-        if raw.startswith("*") or raw.startswith("*/") or raw.startswith("@"):
-            continue
-        return False
-    return False
 
+_WORKER_ENGINE = RuleEngine([])
+_WORKER_PROJECT_CTX = ProjectContext(root=Path("."), java_files=[], strict=False, only_filters=set())
 
-def _has_comment_above(lines: list[str], start_line: int, max_lookback: int) -> bool:
-    start_index = start_line - 2
-    end_index = max(-1, start_index - max_lookback)
-    for index in range(start_index, end_index, -1):
-        raw = lines[index].strip()
-        if raw == "":
-            continue
-        if raw.startswith("//"):
-            return True
-        if raw.startswith("@"):
-            continue
-        return False
-    return False
 
+def _worker_pool(jobs: int, engine: RuleEngine, project_ctx: ProjectContext) -> ProcessPoolExecutor:
+    # Imported on first use: multiprocessing is about a fifth of the guard's
+    # start-up, and single-process runs never need it.
+    from concurrent.futures import ProcessPoolExecutor
 
-def _extract_javadoc_above(lines: list[str], start_line: int, max_lookback: int) -> str:
-    start_index = start_line - 2
-    end_index = max(-1, start_index - max_lookback)
-    parts: list[str] = []
-    in_javadoc = False
-    for index in range(start_index, end_index, -1):
-        raw = lines[index].strip()
-        if raw == "":
-            if in_javadoc:
-                continue
-            continue
-        if raw.startswith("/**"):
-            parts.append(raw)
-            in_javadoc = True
-            break
-        if raw.startswith("*") or raw.startswith("*/"):
-            parts.append(raw)
-            in_javadoc = True
-            continue
-        if raw.startswith("@"):
-            continue
-        if in_javadoc:
-            continue
-        return ""
-    if not in_javadoc:
-        return ""
-    parts.reverse()
-    return "\n".join(parts)
-
-
-def _collect_method_signature(lines: list[str], start_line: int, max_lines: int) -> str:
-    index = start_line - 1
-    end = min(len(lines), index + max_lines)
-    parts: list[str] = []
-    while index < end:
-        raw = lines[index].strip()
-        parts.append(raw)
-        if raw.endswith("{") or raw.endswith(";"):
-            break
-        index += 1
-    return " ".join(parts)
-
-
-def _extract_return_type(signature: str) -> str:
-    normalized = " ".join(signature.split())
-    match = re.search(
-        r"\bpublic\s+(?:default\s+)?(?:static\s+)?(?:final\s+)?([A-Za-z0-9_<>\[\], ?]+?)\s+[A-Za-z_][A-Za-z0-9_]*\s*\(",
-        normalized,
+    rule_names = [rule.name for rule in engine.rules if rule.name in REGISTERED_RULES]
+    # Rules from outside the registry, such as declarative ones, are sent whole.
+    extra_rules = [rule for rule in engine.rules if rule.name not in REGISTERED_RULES]
+    return ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(rule_names, extra_rules, project_ctx.root, project_ctx.strict, project_ctx.only_filters, engine.rule_time_budget),
     )
-    if match is None:
-        return ""
-    return match.group(1).strip()
 
 
-def _extract_method_name(signature: str) -> str:
-    normalized = " ".join(signature.split())
-    match = re.search(
-        r"\bpublic\s+(?:default\s+)?(?:static\s+)?(?:final\s+)?[A-Za-z0-9_<>\[\], ?]+\s+([A-Za-z_][A-Za-z0-9_]*)\s*\(",
-        normalized,
+def _init_worker(
+    rule_names: list[str],
+    extra_rules: list[Rule],
+    root: Path,
+    strict: bool,
+    only_filters: set[str],
+    rule_time_budget: float,
+) -> None:
+    global _WORKER_ENGINE, _WORKER_PROJECT_CTX
+    _WORKER_ENGINE = RuleEngine(
+        [rule for rule in [*load_rules(rule_names), *extra_rules] if not isinstance(rule, ProjectRule)],
+        rule_time_budget=rule_time_budget,
     )
-    if match is None:
-        return ""
-    return match.group(1)
+    _WORKER_PROJECT_CTX = ProjectContext(root=root, java_files=[], strict=strict, only_filters=only_filters)
 
 
-def _extract_param_names(signature: str) -> list[str]:
-    normalized = " ".join(signature.split())
-    start = normalized.find("(")
-    end = normalized.rfind(")")
-    if start < 0 or end < 0 or end <= start:
-        return []
-    params_segment = normalized[start + 1:end].strip()
-    if params_segment == "":
-        return []
-    params = [chunk.strip() for chunk in params_segment.split(",")]
-    param_names: list[str] = []
-    for param in params:
-        tokens = [t for t in param.split(" ") if t not in {"final"} and not t.startswith("@")]
-        if len(tokens) == 0:
-            continue
-        candidate = tokens[-1].replace("...", "").strip()
-        if candidate == "":
-            continue
-        param_names.append(candidate)
-    return param_names
+def _check_file_in_worker(file_ctx: FileContext) -> list[Violation]:
+    return _WORKER_ENGINE.check(file_ctx, _WORKER_PROJECT_CTX)
 
 
-def _print_summary(violations: list[Violation]) -> None:
-    if len(violations) == 0:
-        print("Backend checklist guard passed.")
-        return
+def _profile_file_in_worker(file_ctx: FileContext) -> tuple[list[Violation], dict[str, float]]:
+    return _WORKER_ENGINE.check_timed(file_ctx, _WORKER_PROJECT_CTX)
 
-    errors = sum(1 for v in violations if v.severity == SEVERITY_ERROR)
-    warnings = sum(1 for v in violations if v.severity == SEVERITY_WARNING)
-    if errors > 0:
-        print(f"Backend checklist guard failed. errors={errors}, warnings={warnings}")
-    else:
-        print(f"Backend checklist guard completed with warnings. warnings={warnings}")
-    for violation in violations:
-        print(violation.to_console())
 
+def _worker_check_function(engine: RuleEngine) -> Callable[[FileContext], object]:
+    # Workers cannot reach the parent's profile, so they return their timings
+    # next to the violations when the run is profiled.
+    return _check_file_in_worker if engine.profile is None else _profile_file_in_worker
 
-def _write_report(root: Path, violations: list[Violation]) -> None:
-    payload = {
-        "summary": {
-            "total": len(violations),
-            "errors": sum(1 for v in violations if v.severity == SEVERITY_ERROR),
-            "warnings": sum(1 for v in violations if v.severity == SEVERITY_WARNING),
-        },
-        "violations": [
-            {
-                "rule": v.rule,
-                "severity": v.severity,
-                "file": v.file,
-                "line": v.line,
-                "reason": v.reason,
-                "snippet": v.snippet,
-            }
-            for v in violations
-        ],
-    }
-    report_path = root / REPORT_FILE
-    report_path.write_text(json.dumps(payload, ensure_ascii=True, indent=2), encoding="utf-8")
 
-
-def _parse_only_filters(raw_value: str) -> set[str]:
-    if raw_value.strip() == "":
-        return set()
-    return {
-        token.strip()
-        for token in raw_value.split(",")
-        if token.strip() != ""
-    }
-
-
-def _rule_group_aliases() -> dict[str, set[str]]:
-    return {
-        "i18n": {
-            RULE_DTO_VALIDATION_MESSAGE_CONSTANT,
-            RULE_VI_MESSAGES_ACCENTED,
-            RULE_EXCEPTION_MESSAGE_I18N,
-            RULE_MESSAGE_KEYS_BUNDLE,
-        }
-    }
+def _worker_result(rel_path: str, result: object, profile: RunProfile | None) -> list[Violation]:
+    if profile is None:
+        return result
+    found, timings = result
+    profile.record_file(rel_path, timings)
+    return found
 
 
-def _resolve_selected_rule_names(only_filters: set[str]) -> set[str]:
-    group_aliases = _rule_group_aliases()
-    selected_rule_names: set[str] = set()
-    for token in only_filters:
-        if token in group_aliases:
-            selected_rule_names.update(group_aliases[token])
-            continue
-        selected_rule_names.add(token)
-    return selected_rule_names
+def regex_audit_targets() -> list[AuditTarget]:
+    from .regex_audit import AuditTarget
 
+    # Every compiled pattern of this module, the lexer's token pattern and
+    # every rule module, including those kept in rule tables, applied through
+    # `search` as the costliest way to run them. A module can name helpers to
+    # apply a pattern through instead, for patterns that only ever see
+    # prepared text. Patterns imported from another module are audited once.
+    targets: list[AuditTarget] = []
+    seen: set[tuple[str, int]] = set()
+    modules = [*rule_modules(), load_rule_module("support")]
+    for namespace in [globals(), *(vars(module) for module in modules)]:
+        through_helper = namespace.get("REGEX_AUDIT_HELPERS", {})
+        for name, value in namespace.items():
+            if isinstance(value, re.Pattern):
+                if (name, id(value)) in seen:
+                    continue
+                seen.add((name, id(value)))
+                targets.append(AuditTarget(name, value.pattern, through_helper.get(name, value.search)))
+                continue
+            if not isinstance(value, (list, tuple)):
+                continue
+            for position, item in enumerate(value):
+                for pattern in item if isinstance(item, tuple) else (item,):
+                    if isinstance(pattern, re.Pattern):
+                        targets.append(AuditTarget(f"{name}[{position}]", pattern.pattern, pattern.search))
+    return targets
 
-def _filter_rules(rules: list[Rule], only_filters: set[str]) -> list[Rule]:
-    if not only_filters:
-        return rules
-    selected_rule_names = _resolve_selected_rule_names(only_filters)
-    return [rule for rule in rules if rule.name in selected_rule_names]
 
+def _run_regex_audit() -> int:
+    from .regex_audit import CANARY, audit_patterns, check_canary
 
-def _should_run_auxiliary_rule(rule_name: str, only_filters: set[str]) -> bool:
-    if not only_filters:
-        return True
-    selected_rule_names = _resolve_selected_rule_names(only_filters)
-    return rule_name in selected_rule_names
+    # A known catastrophic pattern comes first: an audit that cannot flag it
+    # would pass everything else for the wrong reason.
+    if check_canary() is None:
+        print(f"Regex audit failed: the known catastrophic pattern {CANARY.source} was not reported.")
+        return 1
+    targets = regex_audit_targets()
+    findings, tried = audit_patterns(targets)
+    for finding in findings:
+        print(finding.describe())
+    if len(findings) > 0:
+        print(f"Regex audit failed: {len(findings)} of {len(targets)} patterns grow super-linearly.")
+        return 1
+    print(f"Regex audit passed: {len(targets)} patterns, {tried} adversarial inputs, no super-linear matching.")
+    return 0
 
 
 def main() -> int:
@@ -2027,126 +1621,382 @@ def main() -> int:
         default="",
         help="Run only selected rule ids or rule groups (comma separated). Example: --only=i18n",
     )
+    parser.add_argument(
+        "--rules",
+        default="",
+        metavar="FILE",
+        help=f"TOML file of declarative rules, run with the built-in ones. Default: {DECLARATIVE_RULES_FILE} in the project root, when it exists.",
+    )
     parser.add_argument(
         "--strict",
         action="store_true",
         help="Fail when warning violations exist.",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes used to check files. Use 0 for one per CPU core. Default: 1.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Do not read or write the incremental result cache ({CACHE_FILE}) or the rule cost history ({RULE_COSTS_FILE}).",
+    )
+    change_group = parser.add_mutually_exclusive_group()
+    change_group.add_argument(
+        "--changed-since",
+        default="",
+        metavar="REF",
+        help="Check only files changed since the given git ref, including uncommitted and untracked files.",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Check files while they are read and release each one after its rules run, to bound memory on large trees.",
+    )
+    parser.add_argument(
+        "--source-root",
+        action="append",
+        default=[],
+        metavar="PATH",
+        help="Extra source root to scan besides src/main/java and src/test/java, e.g. src/integrationTest/java. Repeatable.",
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="Skip files and directories matching a .gitignore-style glob, e.g. '**/legacy/**'. Repeatable.",
+    )
+    parser.add_argument(
+        "--no-gitignore",
+        action="store_true",
+        help="Do not skip sources ignored by .gitignore files under the project root.",
+    )
+    parser.add_argument(
+        "--prefetch",
+        type=int,
+        default=DEFAULT_PREFETCH_DEPTH,
+        metavar="N",
+        help=f"Number of files read ahead of the checker on a pool of reader threads. Use 0 to read inline. Default: {DEFAULT_PREFETCH_DEPTH}.",
+    )
+    parser.add_argument(
+        "--io-stats",
+        action="store_true",
+        help="Print time spent waiting on file reads versus CPU time after the run.",
+    )
+    change_group.add_argument(
+        "--staged",
+        action="store_true",
+        help="Check only files staged in the git index, reading their staged contents.",
+    )
+    change_group.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running, re-check files whose modification time changes, and answer --query over a Unix socket.",
+    )
+    change_group.add_argument(
+        "--lsp",
+        action="store_true",
+        help="Run a Language Server Protocol server over stdio that publishes violations as diagnostics.",
+    )
+    change_group.add_argument(
+        "--query",
+        action="store_true",
+        help="Print the current violations from a running --watch daemon instead of checking files.",
+    )
+    change_group.add_argument(
+        "--stop-daemon",
+        action="store_true",
+        help="Stop a running --watch daemon.",
+    )
+    parser.add_argument(
+        "--format",
+        default=DEFAULT_FORMATS,
+        metavar="FORMATS",
+        help=(
+            f"Comma-separated report formats: {', '.join(REPORT_FORMATS)}. "
+            f"The summary line is always printed. Default: {DEFAULT_FORMATS}."
+        ),
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Print only the summary line, not each violation.",
+    )
+    baseline_group = parser.add_mutually_exclusive_group()
+    baseline_group.add_argument(
+        "--baseline",
+        nargs="?",
+        const=BASELINE_FILE,
+        default="",
+        metavar="FILE",
+        help=f"Report only violations that are not in the baseline file. Default file: {BASELINE_FILE} in the project root.",
+    )
+    baseline_group.add_argument(
+        "--write-baseline",
+        nargs="?",
+        const=BASELINE_FILE,
+        default="",
+        metavar="FILE",
+        help=f"Record every current violation in the baseline file and exit with 0. Default file: {BASELINE_FILE}.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time each phase, rule and file, print the slowest ones, and add a profile section to the JSON report.",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=DEFAULT_PROFILE_TOP,
+        metavar="N",
+        help=f"Number of rules and files listed by --profile. Default: {DEFAULT_PROFILE_TOP}.",
+    )
+    parser.add_argument(
+        "--profile-stacks",
+        default="",
+        metavar="FILE",
+        help="Write the profile as collapsed stacks for flamegraph tools (implies --profile).",
+    )
+    parser.add_argument(
+        "--rule-time-budget",
+        type=float,
+        default=DEFAULT_RULE_TIME_BUDGET_SECONDS,
+        metavar="SECONDS",
+        help=(
+            "Line-check time one rule may spend on one file before it is stopped for the rest of that file "
+            f"and a {RULE_TIME_BUDGET} warning is reported. The result depends on machine speed, so output is no longer "
+            "byte-identical between runs, and a check that never returns is not interrupted. Default: 0 (no limit)."
+        ),
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop at the first error (or warning with --strict). Same as --max-errors 1. Not allowed with --jobs or --profile.",
+    )
+    parser.add_argument(
+        "--max-errors",
+        type=int,
+        default=0,
+        metavar="N",
+        help=(
+            "Stop once N errors (or errors and warnings with --strict) are reported. Rules that found the most "
+            f"errors per second in earlier runs ({RULE_COSTS_FILE}) run first, in one process, so --jobs and --profile are not allowed."
+        ),
+    )
+    parser.add_argument(
+        "--audit-regex",
+        action="store_true",
+        help="Time every guard regex on adversarial inputs, report super-linear ones, and exit.",
+    )
+    parser.add_argument(
+        "--socket",
+        default="",
+        metavar="PATH",
+        help="Unix socket used by --watch, --query and --stop-daemon. Default: .backend_guard.sock in the project root.",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL_SECONDS,
+        metavar="SECONDS",
+        help=f"How often --watch polls modification times. Default: {DEFAULT_POLL_INTERVAL_SECONDS}.",
+    )
     args = parser.parse_args()
+    try:
+        formats = parse_formats(args.format)
+    except ValueError as error:
+        parser.error(f"--format: {error}")
+
+    if args.write_baseline != "" and (args.changed_since != "" or args.staged):
+        parser.error("--write-baseline needs a full run; drop --changed-since/--staged.")
+    if args.fail_fast or args.max_errors > 0:
+        if args.write_baseline != "":
+            parser.error("--write-baseline needs a full run; drop --fail-fast/--max-errors.")
+        if args.stream:
+            parser.error("--fail-fast/--max-errors checks files in several passes and cannot be combined with --stream.")
+        if args.jobs != 1:
+            parser.error("--fail-fast/--max-errors checks files in one process; drop --jobs.")
+        if args.profile or args.profile_stacks != "":
+            parser.error("--fail-fast/--max-errors stops part way through a run and cannot be combined with --profile/--profile-stacks.")
+    only_filters = _parse_only_filters(args.only)
+
+    if args.audit_regex:
+        return _run_regex_audit()
 
     root = Path(args.root).resolve()
-    java_files = _collect_java_files(root)
-    if len(java_files) == 0:
-        print("No Java files found under src/main/java or src/test/java.")
+    if args.query or args.stop_daemon:
+        from .watch import COMMAND_CHECK, COMMAND_STOP, resolve_socket_path, run_query
+
+        return run_query(resolve_socket_path(root, args.socket), COMMAND_STOP if args.stop_daemon else COMMAND_CHECK)
+    try:
+        declared = load_declared_rules(root, args.rules)
+    except RuleFileError as error:
+        print(f"Unable to load rules: {error}")
         return 1
+    unknown = unknown_selection(only_filters, (rule.name for rule in declared))
+    if len(unknown) > 0:
+        parser.error(f"--only: unknown rule id or group: {', '.join(unknown)}")
+
+    from .discovery import SourceDiscovery
+
+    def discover_sources(source_root: Path) -> SourceDiscovery:
+        return SourceDiscovery(
+            source_root,
+            JAVA_SOURCE_ROOTS + tuple(args.source_root),
+            JAVA_EXTENSION,
+            excludes=DEFAULT_EXCLUDE_GLOBS + tuple(args.exclude),
+            use_gitignore=not args.no_gitignore,
+        )
+
+    discovery = discover_sources(root)
+    rules = select_rules(only_filters, declared)
+    if args.lsp:
+        # The client's workspace folder replaces --root once it initializes.
+        def create_session(workspace_root: Path) -> EditorSession:
+            return EditorSession(
+                discover_sources(workspace_root), rules, args.strict, only_filters, args.prefetch, args.rule_time_budget
+            )
+
+        from .lsp import LanguageServer
+
+        return LanguageServer(create_session, root, sys.stdin.buffer, sys.stdout.buffer).serve()
+    cache = None
+    if not args.no_cache:
+        cache = ResultCache.load(root / CACHE_FILE, rule_set_fingerprint((rule.name for rule in rules), (rule.definition for rule in declared)))
+    jobs = resolve_jobs(args.jobs)
+    if args.watch:
+        from .watch import resolve_socket_path
+
+        session = WatchSession(discovery, rules, args.strict, only_filters, jobs, cache, args.prefetch, args.rule_time_budget)
+        return _run_watch(session, resolve_socket_path(root, args.socket), args.poll_interval)
+
+    from .read_ahead import ReadStats
+
+    profile = None
+    if args.profile or args.profile_stacks != "":
+        from .profiling import RunProfile
+
+        profile = RunProfile()
+    read_stats = ReadStats()
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    change_set = None
+    if args.changed_since != "" or args.staged:
+        from .git_changes import GitError
+
+        try:
+            change_set = _load_change_set(root, args.changed_since, args.staged)
+        except GitError as error:
+            print(f"Unable to resolve changed files: {error}")
+            return 1
+    change_set_seconds = time.perf_counter() - started
+    if change_set is None:
+        scope = (
+            streaming_scope(discovery, args.prefetch, read_stats)
+            if args.stream
+            else _full_scope(discovery, args.prefetch, read_stats)
+        )
+        if scope.is_empty():
+            print(f"No Java files found under {' or '.join(discovery.include_roots)}.")
+            return 1
+    else:
+        # Only the git modes above set a change set, so GitError is imported.
+        try:
+            scope = changed_scope(discovery, change_set, args.staged, args.prefetch, read_stats)
+        except GitError as error:
+            print(f"Unable to read changed files: {error}")
+            return 1
 
-    only_filters = _parse_only_filters(args.only)
     project_ctx = ProjectContext(
         root=root,
-        java_files=java_files,
+        java_files=scope.project_files,
         strict=args.strict,
         only_filters=only_filters,
     )
-    rules: list[Rule] = [
-        MaxClassLinesRule(),
-        ControllerRestRule(),
-        ControllerTransactionalRule(),
-        ControllerEntityResponseRule(),
-        ControllerApiVersionRule(),
-        ControllerApiDocRule(),
-        RepositoryJpaRule(),
-        EntityNoDataRule(),
-        EntityHasIdRule(),
-        EntityLayerDependencyRule(),
-        EntityRelationFetchRule(),
-        EntityManyToOneJoinColumnRule(),
-        EntityAuditLifecycleRule(),
-        SharedFieldsMappedSuperclassRule(),
-        EntityVersionRule(),
-        EntityEnumeratedStringRule(),
-        SoftDeleteNoHardDeleteRule(),
-        SoftDeleteFindFilterRule(),
-        MapStructRequiredRule(),
-        MapStructNoManualMappingRule(),
-        DtoValidationAnnotationRule(),
-        DtoValidationMessageConstantRule(),
-        LombokRequiredArgsConstructorRule(),
-        LombokEntityGetterSetterRule(),
-        LombokBuilderPreferredRule(),
-        NestedForShouldUseStreamRule(),
-        NoElseRule(),
-        AuditEntitySeparateClassRule(),
-        AuditDtoSeparateClassRule(),
-        ExceptionSerialVersionUidRule(),
-        NoDirectTrimRule(),
-        NoDirectBlankCheckRule(),
-        NoDirectStringPredicateRule(),
-        QueryMustUseNativeSqlRule(),
-        QueryKeywordUppercaseRule(),
-        JavaDocControllerRule(),
-        JavaDocServiceRule(),
-        ExceptionMessageI18nRule(),
-        PrecedingCommentRule(
-            name=RULE_IF_REQUIRES_COMMENT,
-            pattern=IF_STATEMENT_PATTERN,
-            reason="if statement must have a preceding comment explaining the condition.",
-            main_source_only=True,
-            rel_path_contains_any=("/service/", "/mode/", "/security/", "/controller/"),
-        ),
-        PrecedingCommentRule(
-            name=RULE_THROW_REQUIRES_COMMENT,
-            pattern=THROW_STATEMENT_PATTERN,
-            reason="throw statement must have a preceding comment explaining the exception path.",
-            main_source_only=True,
-            rel_path_contains_any=("/service/", "/mode/", "/security/", "/controller/"),
-        ),
-        PrecedingCommentRule(
-            name=RULE_FOR_REQUIRES_COMMENT,
-            pattern=FOR_PATTERN,
-            reason="for statement must have a preceding comment explaining the loop intent.",
-            main_source_only=True,
-            rel_path_contains_any=("/service/", "/mode/", "/security/", "/controller/"),
-        ),
-        PrecedingCommentRule(
-            name=RULE_STREAM_REQUIRES_COMMENT,
-            pattern=STREAM_CALL_PATTERN,
-            reason="stream call must have a preceding comment explaining the stream pipeline intent.",
-            main_source_only=True,
-            rel_path_contains_any=("/service/", "/mode/", "/security/", "/controller/"),
-        ),
-        PrecedingCommentRule(
-            name=RULE_RETURN_REQUIRES_COMMENT,
-            pattern=RETURN_STATEMENT_PATTERN,
-            reason="return statement must have a preceding comment explaining the return path.",
-            main_source_only=True,
-            rel_path_contains_any=("/service/", "/mode/", "/security/", "/controller/"),
-        ),
-    ]
-
-    rules = _filter_rules(rules, only_filters)
-
-    violations: list[Violation] = []
-    for file_ctx in java_files:
-        for rule in rules:
-            found = list(rule.check(file_ctx, project_ctx))
-            if len(found) == 0:
-                continue
-            violations.extend(found)
-
-    if _should_run_auxiliary_rule(RULE_VI_MESSAGES_ACCENTED, only_filters):
-        violations.extend(_check_vietnamese_messages(root))
-    if _should_run_auxiliary_rule(RULE_MESSAGE_KEYS_BUNDLE, only_filters):
-        violations.extend(_check_error_message_keys_in_bundles(root))
-
-    _write_report(root, violations)
-    _print_summary(violations)
+    baseline_filter = None
+    baseline_recorder = None
+    if args.baseline != "":
+        from .baseline import BaselineError, BaselineFilter, Fingerprinter, load_baseline
+
+        try:
+            known = load_baseline(root / args.baseline)
+        except BaselineError as error:
+            print(f"Unable to load baseline: {error}")
+            return 1
+        baseline_filter = BaselineFilter(known, Fingerprinter(scope.read_text))
+    elif args.write_baseline != "":
+        from .baseline import BaselineRecorder, Fingerprinter
+
+        baseline_recorder = BaselineRecorder(Fingerprinter(scope.read_text))
+    report = ReportWriter(build_sinks(formats, root, args.quiet, sys.stdout), baseline_filter or baseline_recorder)
+    costs = RuleCostHistory.load(root / RULE_COSTS_FILE) if not args.no_cache else None
+    error_limit = args.max_errors if args.max_errors > 0 else (1 if args.fail_fast else 0)
+    stopped = False
+    head: list[Violation] = []
+    if error_limit > 0:
+        stopped = _check_java_files_fail_fast(
+            scope.java_files, rules, project_ctx, cache, report, error_limit, costs, args.rule_time_budget
+        )
+    elif scope.file_stream is not None:
+        head = _check_java_file_stream(
+            scope.file_stream, rules, project_ctx, jobs, cache, report, profile, args.rule_time_budget, costs
+        )
+    else:
+        head = _check_java_files(
+            scope.java_files, rules, project_ctx, jobs, cache, report, profile, args.rule_time_budget, costs
+        )
+    # A fail-fast run adds nothing to the cache, and pruning after an early
+    # stop would drop the entries of files it never reached.
+    if cache is not None and error_limit == 0:
+        cache.save(prune=not scope.partial)
+    if costs is not None:
+        costs.save()
+
+    auxiliary_started = time.perf_counter()
+    if not stopped:
+        report.add(
+            check_auxiliary_rules(
+                scope.read_text,
+                only_filters,
+                scope.check_vietnamese_messages,
+                scope.check_message_keys,
+                profile,
+            )
+        )
 
-    has_error = any(v.severity == SEVERITY_ERROR for v in violations)
-    if has_error:
-        return 1
-    if args.strict and len(violations) > 0:
-        return 1
-    return 0
+    report_started = time.perf_counter()
+    if profile is not None:
+        # Reading overlaps checking in --stream mode, so the check phase is
+        # what remains of the span once discovery, read waits and project
+        # rules are taken out.
+        discover_seconds = change_set_seconds + discovery.discover_seconds
+        profile.add_phase("discover", discover_seconds)
+        profile.add_phase("read", read_stats.wait_seconds)
+        profile.add_phase(
+            "check",
+            auxiliary_started - started - discover_seconds - read_stats.wait_seconds - profile.phases.get("project", 0.0),
+        )
+        profile.add_phase("auxiliary", report_started - auxiliary_started)
+    counts = report.close(head, {"profile": profile.to_report(args.profile_top)} if profile is not None else None)
+    if profile is not None:
+        profile.add_phase("report", time.perf_counter() - report_started)
+        _print_profile(profile, args.profile_top, args.profile_stacks)
+    if stopped:
+        print(f"Stopped after {error_limit} failing violation(s); the remaining rules and files were not checked.")
+    if args.io_stats:
+        _print_io_stats(read_stats, time.perf_counter() - started, time.process_time() - cpu_started)
+    if baseline_recorder is not None:
+        from .baseline import write_baseline
+
+        write_baseline(root / args.write_baseline, baseline_recorder.fingerprints)
+        print(f"Wrote {len(baseline_recorder.fingerprints)} fingerprints to {args.write_baseline}.")
+        return 0
+    if baseline_filter is not None:
+        _print_baseline_summary(baseline_filter, scope.partial)
+    return _exit_status(counts, args.strict)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,112 @@
+"""
+Local git queries used to limit a guard run to changed files.
+
+All paths are relative to the guard root, which may be a subdirectory of the
+git work tree.
+"""
+
+from __future__ import annotations
+
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+class GitError(RuntimeError):
+    pass
+
+
+@dataclass
+class ChangeSet:
+    added: list[str] = field(default_factory=list)
+    modified: list[str] = field(default_factory=list)
+    deleted: list[str] = field(default_factory=list)
+
+    def present(self) -> list[str]:
+        return sorted(set(self.added) | set(self.modified))
+
+    def touched(self) -> set[str]:
+        return set(self.added) | set(self.modified) | set(self.deleted)
+
+
+def changes_since(root: Path, ref: str) -> ChangeSet:
+    change_set = _parse_name_status(_run_git(root, ["diff", "--name-status", "--relative", "-M", "-z", ref, "--"]))
+    untracked = _split_z(_run_git(root, ["ls-files", "--others", "--exclude-standard", "-z"]))
+    change_set.added.extend(untracked)
+    return change_set
+
+
+def staged_changes(root: Path) -> ChangeSet:
+    return _parse_name_status(_run_git(root, ["diff", "--cached", "--name-status", "--relative", "-M", "-z", "--"]))
+
+
+def index_files(root: Path, pathspecs: list[str]) -> list[str]:
+    return _split_z(_run_git(root, ["ls-files", "--cached", "-z", "--", *pathspecs]))
+
+
+def read_index_blobs(root: Path, rel_paths: list[str]) -> dict[str, bytes]:
+    if len(rel_paths) == 0:
+        return {}
+    prefix = _run_git(root, ["rev-parse", "--show-prefix"]).decode("utf-8").strip()
+    # One batched cat-file process serves every blob instead of one git call per file.
+    request = "".join(f":{prefix}{rel_path}\n" for rel_path in rel_paths).encode("utf-8")
+    output = _run_git(root, ["cat-file", "--batch"], stdin=request)
+
+    blobs: dict[str, bytes] = {}
+    cursor = 0
+    for rel_path in rel_paths:
+        header_end = output.index(b"\n", cursor)
+        header = output[cursor:header_end].split(b" ")
+        cursor = header_end + 1
+        if header[-1] == b"missing":
+            continue
+        size = int(header[2])
+        blobs[rel_path] = output[cursor:cursor + size]
+        cursor += size + 1
+    return blobs
+
+
+def _run_git(root: Path, args: list[str], stdin: bytes | None = None) -> bytes:
+    try:
+        completed = subprocess.run(
+            ["git", *args],
+            cwd=root,
+            input=stdin,
+            capture_output=True,
+            check=False,
+        )
+    except OSError as error:
+        raise GitError(f"Unable to run git: {error}") from error
+    if completed.returncode != 0:
+        message = completed.stderr.decode("utf-8", errors="replace").strip()
+        raise GitError(f"git {args[0]} failed: {message}")
+    return completed.stdout
+
+
+def _split_z(output: bytes) -> list[str]:
+    return [token.decode("utf-8") for token in output.split(b"\0") if token != b""]
+
+
+def _parse_name_status(output: bytes) -> ChangeSet:
+    tokens = _split_z(output)
+    change_set = ChangeSet()
+    index = 0
+    while index < len(tokens):
+        status = tokens[index]
+        if status[0] in ("R", "C"):
+            source, target = tokens[index + 1], tokens[index + 2]
+            index += 3
+            change_set.added.append(target)
+            if status[0] == "R":
+                change_set.deleted.append(source)
+            continue
+        path = tokens[index + 1]
+        index += 2
+        if status[0] == "A":
+            change_set.added.append(path)
+            continue
+        if status[0] == "D":
+            change_set.deleted.append(path)
+            continue
+        change_set.modified.append(path)
+    return change_set
@@ -0,0 +1,142 @@
+"""
+Lightweight Java lexer shared by the backend guard rules.
+
+The lexer only separates comments, string and char literals and text blocks
+from the surrounding code; it does not tokenize identifiers or operators.
+Derived texts keep every offset and line break of the source, so a column in
+`code_lines` or `masked_lines` is the same column in `FileContext.lines`.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+
+TOKEN_CODE = "code"
+TOKEN_LINE_COMMENT = "line_comment"
+TOKEN_BLOCK_COMMENT = "block_comment"
+TOKEN_JAVADOC = "javadoc"
+TOKEN_STRING = "string"
+TOKEN_CHAR = "char"
+TOKEN_TEXT_BLOCK = "text_block"
+
+COMMENT_TOKENS = frozenset({TOKEN_LINE_COMMENT, TOKEN_BLOCK_COMMENT, TOKEN_JAVADOC})
+LITERAL_TOKENS = frozenset({TOKEN_STRING, TOKEN_CHAR, TOKEN_TEXT_BLOCK})
+
+LINE_HAS_CODE = 1
+LINE_HAS_COMMENT = 2
+LINE_HAS_LITERAL = 4
+
+# Order matters: text blocks before strings, and comments are only recognized
+# where no literal has started, which finditer guarantees by scanning left to right.
+TOKEN_PATTERN = re.compile(
+    r'(?P<text_block>"""(?:\\[\s\S]|[^\\])*?(?:"""|\Z))'
+    r'|(?P<string>"(?:\\.|[^"\\\n])*(?:"|$))'
+    r"|(?P<char>'(?:\\.|[^'\\\n])*(?:'|$))"
+    r"|(?P<line_comment>//[^\n]*)"
+    r"|(?P<block_comment>/\*[\s\S]*?(?:\*/|\Z))",
+    re.MULTILINE,
+)
+NON_LINE_BREAK_PATTERN = re.compile(r"[^\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
+
+@dataclass(frozen=True)
+class JavaToken:
+    kind: str
+    start: int
+    end: int
+
+
+@dataclass(frozen=True)
+class LexedSource:
+    tokens: list[JavaToken]
+    # Comments blanked out; literals kept as written.
+    code_lines: list[str]
+    # Comments blanked out and literal contents blanked between their delimiters.
+    masked_lines: list[str]
+    line_flags: list[int]
+
+
+def lex_java(text: str) -> LexedSource:
+    tokens: list[JavaToken] = []
+    code_parts: list[str] = []
+    masked_parts: list[str] = []
+    cursor = 0
+    for match in TOKEN_PATTERN.finditer(text):
+        start, end = match.span()
+        if start > cursor:
+            tokens.append(JavaToken(TOKEN_CODE, cursor, start))
+            segment = text[cursor:start]
+            code_parts.append(segment)
+            masked_parts.append(segment)
+        kind = match.lastgroup or TOKEN_CODE
+        segment = match.group()
+        if kind == TOKEN_BLOCK_COMMENT and segment.startswith("/**") and not segment.startswith("/**/"):
+            kind = TOKEN_JAVADOC
+        tokens.append(JavaToken(kind, start, end))
+        if kind in COMMENT_TOKENS:
+            blank = _blank(segment)
+            code_parts.append(blank)
+            masked_parts.append(blank)
+        else:
+            code_parts.append(segment)
+            masked_parts.append(_mask_literal(kind, segment))
+        cursor = end
+    if cursor < len(text):
+        tokens.append(JavaToken(TOKEN_CODE, cursor, len(text)))
+        segment = text[cursor:]
+        code_parts.append(segment)
+        masked_parts.append(segment)
+
+    code_lines = "".join(code_parts).splitlines()
+    masked_lines = "".join(masked_parts).splitlines()
+    return LexedSource(
+        tokens=tokens,
+        code_lines=code_lines,
+        masked_lines=masked_lines,
+        line_flags=_line_flags(text, tokens, code_lines),
+    )
+
+
+def _blank(segment: str) -> str:
+    return NON_LINE_BREAK_PATTERN.sub(" ", segment)
+
+
+def _mask_literal(kind: str, segment: str) -> str:
+    delimiter = 3 if kind == TOKEN_TEXT_BLOCK else 1
+    if len(segment) <= delimiter * 2:
+        return segment
+    closing = segment[-delimiter:] if segment.endswith(segment[:delimiter]) else ""
+    body = segment[delimiter:len(segment) - len(closing)]
+    return segment[:delimiter] + _blank(body) + closing
+
+
+def _line_flags(text: str, tokens: list[JavaToken], code_lines: list[str]) -> list[int]:
+    line_count = len(code_lines)
+    flags = [0] * line_count
+    if line_count == 0:
+        return flags
+    line_starts = [0]
+    for line in text.splitlines(keepends=True)[:-1]:
+        line_starts.append(line_starts[-1] + len(line))
+
+    line = 0
+    for token in tokens:
+        if token.kind in COMMENT_TOKENS:
+            flag = LINE_HAS_COMMENT
+        elif token.kind in LITERAL_TOKENS:
+            flag = LINE_HAS_LITERAL
+        else:
+            continue
+        while line + 1 < line_count and line_starts[line + 1] <= token.start:
+            line += 1
+        last = line
+        while last + 1 < line_count and line_starts[last + 1] < token.end:
+            last += 1
+        for index in range(line, last + 1):
+            flags[index] |= flag
+    for index, code_line in enumerate(code_lines):
+        if code_line.strip() != "":
+            flags[index] |= LINE_HAS_CODE
+    return flags
@@ -0,0 +1,114 @@
+"""
+Per-file line index backing the look-behind and look-ahead helpers.
+
+Every table is built in one pass over the lines, so questions such as "is the
+nearest non-blank line above a comment" become array lookups instead of
+walking back through the file for each candidate line. Line kinds follow the
+helpers' historical prefix checks on the stripped line.
+"""
+
+from __future__ import annotations
+
+
+KIND_BLANK = 0
+KIND_LINE_COMMENT = 1
+KIND_JAVADOC_START = 2
+KIND_JAVADOC_BODY = 3
+KIND_ANNOTATION = 4
+KIND_OTHER = 5
+
+
+class LineIndex:
+    def __init__(self, lines: list[str]) -> None:
+        self.lines = lines
+        self.stripped = [raw.strip() for raw in lines]
+        self.kinds = [_line_kind(stripped) for stripped in self.stripped]
+
+        # non_blank lists blank-free line indexes; rank[i] counts those before index i.
+        self.non_blank: list[int] = []
+        self.rank: list[int] = [0] * (len(lines) + 1)
+        # Nearest earlier line that is not blank and not inside an annotation run,
+        # additionally skipping Javadoc body lines, and the nearest Javadoc opener.
+        self.previous_code_or_comment: list[int] = [-1] * len(lines)
+        self.previous_outside_javadoc: list[int] = [-1] * len(lines)
+        self.javadoc_start: list[int] = [-1] * len(lines)
+
+        last_code_or_comment = -1
+        last_outside_javadoc = -1
+        last_javadoc_start = -1
+        for index, kind in enumerate(self.kinds):
+            self.previous_code_or_comment[index] = last_code_or_comment
+            self.previous_outside_javadoc[index] = last_outside_javadoc
+            self.rank[index] = len(self.non_blank)
+            if kind == KIND_BLANK:
+                self.javadoc_start[index] = last_javadoc_start
+                continue
+            self.non_blank.append(index)
+            if kind == KIND_JAVADOC_START:
+                last_javadoc_start = index
+            self.javadoc_start[index] = last_javadoc_start
+            if kind == KIND_ANNOTATION:
+                continue
+            last_code_or_comment = index
+            if kind != KIND_JAVADOC_BODY:
+                last_outside_javadoc = index
+        self.rank[len(lines)] = len(self.non_blank)
+
+    def next_non_blank(self, start_line: int, limit: int) -> list[tuple[int, str]]:
+        position = self.rank[min(start_line, len(self.lines))]
+        return [(index + 1, self.lines[index]) for index in self.non_blank[position:position + limit]]
+
+    def previous_non_blank(self, start_line: int, limit: int) -> list[tuple[int, str]]:
+        position = self.rank[max(0, min(start_line - 1, len(self.lines)))]
+        window = self.non_blank[max(0, position - limit):position]
+        return [(index + 1, self.lines[index]) for index in reversed(window)]
+
+    def has_comment_above(self, start_line: int, max_lookback: int) -> bool:
+        found = self._look_back(self.previous_code_or_comment, start_line, max_lookback)
+        return found >= 0 and self.kinds[found] == KIND_LINE_COMMENT
+
+    def has_javadoc_above(self, start_line: int, max_lookback: int) -> bool:
+        found = self._look_back(self.previous_outside_javadoc, start_line, max_lookback)
+        return found >= 0 and self.kinds[found] == KIND_JAVADOC_START
+
+    def javadoc_above(self, start_line: int, max_lookback: int) -> str:
+        found = self._look_back(self.previous_code_or_comment, start_line, max_lookback)
+        if found < 0:
+            return ""
+        kind = self.kinds[found]
+        if kind == KIND_JAVADOC_START:
+            return self.stripped[found]
+        if kind != KIND_JAVADOC_BODY:
+            return ""
+        first = max(self.javadoc_start[found], _lowest_index(start_line, max_lookback))
+        return "\n".join(
+            self.stripped[index]
+            for index in range(first, found + 1)
+            if self.kinds[index] in (KIND_JAVADOC_START, KIND_JAVADOC_BODY)
+        )
+
+    def _look_back(self, table: list[int], start_line: int, max_lookback: int) -> int:
+        if start_line < 1 or start_line > len(self.lines):
+            return -1
+        found = table[start_line - 1]
+        if found < _lowest_index(start_line, max_lookback):
+            return -1
+        return found
+
+
+def _lowest_index(start_line: int, max_lookback: int) -> int:
+    return max(0, start_line - 1 - max_lookback)
+
+
+def _line_kind(stripped: str) -> int:
+    if stripped == "":
+        return KIND_BLANK
+    if stripped.startswith("//"):
+        return KIND_LINE_COMMENT
+    if stripped.startswith("/**"):
+        return KIND_JAVADOC_START
+    if stripped.startswith("*"):
+        return KIND_JAVADOC_BODY
+    if stripped.startswith("@"):
+        return KIND_ANNOTATION
+    return KIND_OTHER
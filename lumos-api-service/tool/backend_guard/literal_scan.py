@@ -0,0 +1,32 @@
+"""
+Multi-literal presence scan used to skip rules that cannot match a file.
+
+Each distinct literal is searched at most once per text. Literals are tried
+shortest first, and a missing literal rules out every longer literal that
+contains it without searching for them.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+
+class LiteralScanner:
+    def __init__(self, literals: Iterable[str]) -> None:
+        self._literals = sorted(set(literals), key=lambda literal: (len(literal), literal))
+        self._containers: dict[str, list[str]] = {
+            literal: [other for other in self._literals if other != literal and literal in other]
+            for literal in self._literals
+        }
+
+    def scan(self, text: str) -> set[str]:
+        present: set[str] = set()
+        absent: set[str] = set()
+        for literal in self._literals:
+            if literal in absent:
+                continue
+            if literal in text:
+                present.add(literal)
+                continue
+            absent.update(self._containers[literal])
+        return present
@@ -0,0 +1,302 @@
+"""
+Language Server Protocol front end over stdio.
+
+Speaks JSON-RPC with Content-Length framing and full document sync. Each
+didOpen and didChange rechecks only that buffer and publishes its
+diagnostics. Project-wide checks run on a debounce timer once edits pause,
+and only when an edit may change their outcome.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import threading
+from pathlib import Path
+from typing import BinaryIO, Callable, Protocol
+from urllib.parse import unquote, urlparse
+
+
+SERVER_NAME = "backend-guard"
+DIAGNOSTIC_SOURCE = "backend-guard"
+DIAGNOSTIC_ERROR = 1
+DIAGNOSTIC_WARNING = 2
+TEXT_DOCUMENT_SYNC_FULL = 1
+PROJECT_DEBOUNCE_SECONDS = 0.5
+ERROR_PARSE = -32700
+ERROR_INVALID_REQUEST = -32600
+ERROR_METHOD_NOT_FOUND = -32601
+ERROR_INVALID_PARAMS = -32602
+ERROR_INTERNAL = -32603
+
+
+class MessageError(Exception):
+    # The body could not be used, but the framing is intact: the next
+    # message can still be read.
+    def __init__(self, message: str, code: int) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+class InvalidParams(Exception):
+    pass
+
+
+class DiagnosticProvider(Protocol):
+    def check_document(self, path: Path, text: str) -> list[dict] | None: ...
+
+    def affects_project(self, path: Path, previous: str | None, text: str | None) -> bool: ...
+
+    def check_project(self, documents: dict[Path, str]) -> dict[Path, list[dict]]: ...
+
+
+def make_diagnostic(line: int, end_character: int, is_error: bool, code: str, message: str) -> dict:
+    return {
+        "range": {
+            "start": {"line": line, "character": 0},
+            "end": {"line": line, "character": end_character},
+        },
+        "severity": DIAGNOSTIC_ERROR if is_error else DIAGNOSTIC_WARNING,
+        "code": code,
+        "source": DIAGNOSTIC_SOURCE,
+        "message": message,
+    }
+
+
+def read_message(stream: BinaryIO) -> dict | None:
+    length = -1
+    while True:
+        header = stream.readline()
+        if header == b"":
+            return None
+        header = header.strip()
+        if header == b"":
+            break
+        name, _, value = header.partition(b":")
+        if name.strip().lower() == b"content-length":
+            try:
+                length = int(value.strip())
+            except ValueError:
+                # Without a length the stream cannot be resynchronized.
+                return None
+    if length < 0:
+        return None
+    try:
+        message = json.loads(stream.read(length))
+    except ValueError as error:
+        raise MessageError(f"invalid JSON: {error}", ERROR_PARSE) from error
+    if not isinstance(message, dict):
+        raise MessageError("message is not a JSON object", ERROR_INVALID_REQUEST)
+    return message
+
+
+def write_message(stream: BinaryIO, payload: dict) -> None:
+    body = json.dumps(payload, ensure_ascii=True, separators=(",", ":")).encode("utf-8")
+    stream.write(f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body)
+    stream.flush()
+
+
+class LanguageServer:
+    def __init__(
+        self,
+        create_provider: Callable[[Path], DiagnosticProvider],
+        default_root: Path,
+        reader: BinaryIO,
+        writer: BinaryIO,
+        debounce_seconds: float = PROJECT_DEBOUNCE_SECONDS,
+    ) -> None:
+        self._create_provider = create_provider
+        self._default_root = default_root
+        self._reader = reader
+        self._writer = writer
+        self._debounce_seconds = debounce_seconds
+        self._provider: DiagnosticProvider | None = None
+        self._texts: dict[str, str] = {}
+        self._uris: dict[Path, str] = {}
+        self._document_diagnostics: dict[str, list[dict]] = {}
+        self._project_diagnostics: dict[Path, list[dict]] = {}
+        self._project_checked = False
+        self._shutdown_requested = False
+        self._state_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._project_lock = threading.Lock()
+        self._timer: threading.Timer | None = None
+
+    def serve(self) -> int:
+        while True:
+            try:
+                message = read_message(self._reader)
+            except MessageError as error:
+                _log(f"Dropped message: {error}")
+                self._send_error(None, error.code, str(error))
+                continue
+            if message is None:
+                break
+            method = message.get("method")
+            if method == "exit":
+                break
+            if isinstance(method, str):
+                self._dispatch_safely(method, message.get("params"), message.get("id"))
+        self._cancel_timer()
+        return 0 if self._shutdown_requested else 1
+
+    def _dispatch_safely(self, method: str, params: object, request_id: object) -> None:
+        # One bad message or failing check must not end the editor session.
+        # Requests get an error response; notifications are logged and dropped.
+        try:
+            if params is None:
+                params = {}
+            if not isinstance(params, dict):
+                raise InvalidParams("params must be an object")
+            self._dispatch(method, params, request_id)
+        except InvalidParams as error:
+            _log(f"Dropped {method}: {error}")
+            if request_id is not None:
+                self._send_error(request_id, ERROR_INVALID_PARAMS, f"{method}: {error}")
+        except Exception as error:
+            _log(f"Failed {method}: {error!r}")
+            if request_id is not None:
+                self._send_error(request_id, ERROR_INTERNAL, f"{method}: {error}")
+
+    def _dispatch(self, method: str, params: dict, request_id: object) -> None:
+        if method == "initialize":
+            self._initialize(params, request_id)
+        elif method == "shutdown":
+            self._shutdown_requested = True
+            self._cancel_timer()
+            self._respond(request_id, None)
+        elif method == "textDocument/didOpen":
+            document = _field(params, "textDocument", dict)
+            self._update(_field(document, "uri", str), _field(document, "text", str))
+        elif method == "textDocument/didChange":
+            uri = _field(_field(params, "textDocument", dict), "uri", str)
+            changes = params.get("contentChanges") or []
+            if not isinstance(changes, list):
+                raise InvalidParams("contentChanges must be an array")
+            if len(changes) > 0:
+                # Full sync: the last change carries the whole buffer.
+                change = changes[-1]
+                if not isinstance(change, dict):
+                    raise InvalidParams("contentChanges must hold objects")
+                self._update(uri, _field(change, "text", str))
+        elif method == "textDocument/didClose":
+            self._close(_field(_field(params, "textDocument", dict), "uri", str))
+        elif request_id is not None:
+            self._send_error(request_id, ERROR_METHOD_NOT_FOUND, method)
+
+    def _initialize(self, params: dict, request_id: object) -> None:
+        root = self._default_root
+        root_uri = params.get("rootUri")
+        if isinstance(root_uri, str):
+            root = uri_to_path(root_uri) or root
+        elif isinstance(params.get("rootPath"), str):
+            root = Path(params["rootPath"])
+        self._provider = self._create_provider(root.resolve())
+        self._respond(
+            request_id,
+            {
+                "capabilities": {"textDocumentSync": {"openClose": True, "change": TEXT_DOCUMENT_SYNC_FULL}},
+                "serverInfo": {"name": SERVER_NAME},
+            },
+        )
+
+    def _update(self, uri: str, text: str) -> None:
+        path = uri_to_path(uri)
+        if self._provider is None or path is None:
+            return
+        with self._state_lock:
+            previous = self._texts.get(uri)
+            self._texts[uri] = text
+            self._uris[path] = uri
+        diagnostics = self._provider.check_document(path, text)
+        if diagnostics is None:
+            return
+        self._document_diagnostics[uri] = diagnostics
+        self._publish(uri, path)
+        if not self._project_checked or self._provider.affects_project(path, previous, text):
+            self._schedule_project_check()
+
+    def _close(self, uri: str) -> None:
+        path = uri_to_path(uri)
+        with self._state_lock:
+            previous = self._texts.pop(uri, None)
+        if path is None or self._document_diagnostics.pop(uri, None) is None:
+            return
+        self._publish(uri, path)
+        # The unsaved buffer no longer overrides the file on disk.
+        if self._provider is not None and self._provider.affects_project(path, previous, None):
+            self._schedule_project_check()
+
+    def _schedule_project_check(self) -> None:
+        self._cancel_timer()
+        self._timer = threading.Timer(self._debounce_seconds, self._check_project)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _check_project(self) -> None:
+        provider = self._provider
+        if provider is None:
+            return
+        with self._project_lock:
+            with self._state_lock:
+                documents = {path: self._texts[uri] for path, uri in self._uris.items() if uri in self._texts}
+            try:
+                found = provider.check_project(documents)
+            except Exception as error:
+                # Runs on the timer thread; the next edit schedules another try.
+                _log(f"Project check failed: {error!r}")
+                return
+            self._project_checked = True
+            previous = self._project_diagnostics
+            self._project_diagnostics = found
+            for path in set(previous) | set(found):
+                if previous.get(path) != found.get(path):
+                    self._publish(self._uris.get(path) or path.as_uri(), path)
+
+    def _publish(self, uri: str, path: Path) -> None:
+        diagnostics = self._document_diagnostics.get(uri, []) + self._project_diagnostics.get(path, [])
+        self._send(
+            {
+                "jsonrpc": "2.0",
+                "method": "textDocument/publishDiagnostics",
+                "params": {"uri": uri, "diagnostics": diagnostics},
+            }
+        )
+
+    def _respond(self, request_id: object, result: object) -> None:
+        self._send({"jsonrpc": "2.0", "id": request_id, "result": result})
+
+    def _send_error(self, request_id: object, code: int, message: str) -> None:
+        self._send({"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}})
+
+    def _send(self, payload: dict) -> None:
+        with self._write_lock:
+            write_message(self._writer, payload)
+
+
+def _field(params: dict, key: str, kind: type) -> object:
+    value = params.get(key)
+    if not isinstance(value, kind):
+        raise InvalidParams(f"{key} is missing or not a {kind.__name__}")
+    return value
+
+
+def _log(message: str) -> None:
+    # stdout carries the protocol, so diagnostics about the server go to stderr.
+    print(f"{SERVER_NAME}: {message}", file=sys.stderr, flush=True)
+
+
+def uri_to_path(uri: str) -> Path | None:
+    parsed = urlparse(uri)
+    if parsed.scheme != "file":
+        return None
+    path = unquote(parsed.path)
+    # file:///C:/dir on Windows carries a slash before the drive letter.
+    if len(path) > 2 and path[0] == "/" and path[2] == ":":
+        path = path[1:]
+    return Path(path).resolve()
@@ -0,0 +1,186 @@
+"""
+Run profile for --profile.
+
+Collects wall-clock phase times, per-rule times and per-file times while the
+guard runs, then renders them as a top-N console table, a `profile` section
+for the JSON report, and flamegraph-compatible collapsed stacks.
+
+File rule times come from `RuleEngine`, which charges every line check visit
+to the rule that owns it. The shared parts of a file check are charged to
+bracketed frames instead: the literal prefilter, lexing and the line index,
+and the line walk itself.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator
+
+
+STACK_ROOT = "backend_guard"
+PHASES = ("discover", "read", "check", "project", "auxiliary", "report")
+FRAME_PREFILTER = "[prefilter]"
+FRAME_LEX = "[lex]"
+FRAME_DISPATCH = "[dispatch]"
+ENGINE_FRAMES = (FRAME_PREFILTER, FRAME_LEX, FRAME_DISPATCH)
+KIND_FILE = "file"
+KIND_PROJECT = "project"
+KIND_AUXILIARY = "auxiliary"
+
+
+@dataclass(frozen=True)
+class RuleTiming:
+    rule: str
+    kind: str
+    seconds: float
+    files: int
+
+
+@dataclass(frozen=True)
+class FileTiming:
+    file: str
+    seconds: float
+    slowest_rule: str
+    slowest_rule_seconds: float
+
+
+class RunProfile:
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = {}
+        self.file_timings: dict[str, dict[str, float]] = {}
+        self.project_rules: dict[str, float] = {}
+        self.auxiliary_rules: dict[str, float] = {}
+        self.cached_files = 0
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(name, time.perf_counter() - started)
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + max(seconds, 0.0)
+
+    def record_file(self, rel_path: str, timings: dict[str, float]) -> None:
+        self.file_timings[rel_path] = timings
+
+    def record_cached_file(self) -> None:
+        self.cached_files += 1
+
+    def record_project_rule(self, rule: str, seconds: float) -> None:
+        self.project_rules[rule] = self.project_rules.get(rule, 0.0) + seconds
+
+    def record_auxiliary_rule(self, rule: str, seconds: float) -> None:
+        self.auxiliary_rules[rule] = self.auxiliary_rules.get(rule, 0.0) + seconds
+
+    def rule_timings(self) -> list[RuleTiming]:
+        seconds: dict[str, float] = {}
+        files: dict[str, int] = {}
+        for timings in self.file_timings.values():
+            for name, spent in timings.items():
+                if name in ENGINE_FRAMES:
+                    continue
+                seconds[name] = seconds.get(name, 0.0) + spent
+                files[name] = files.get(name, 0) + 1
+        found = [RuleTiming(name, KIND_FILE, spent, files[name]) for name, spent in seconds.items()]
+        found.extend(RuleTiming(name, KIND_PROJECT, spent, 0) for name, spent in self.project_rules.items())
+        found.extend(RuleTiming(name, KIND_AUXILIARY, spent, 0) for name, spent in self.auxiliary_rules.items())
+        found.sort(key=lambda item: (-item.seconds, item.rule))
+        return found
+
+    def engine_timings(self) -> dict[str, float]:
+        totals = {frame: 0.0 for frame in ENGINE_FRAMES}
+        for timings in self.file_timings.values():
+            for frame in ENGINE_FRAMES:
+                totals[frame] += timings.get(frame, 0.0)
+        return totals
+
+    def slowest_files(self, top: int) -> list[FileTiming]:
+        ranked = sorted(self.file_timings.items(), key=lambda item: (-sum(item[1].values()), item[0]))
+        found: list[FileTiming] = []
+        for rel_path, timings in ranked[: max(top, 0)]:
+            rules = [(spent, name) for name, spent in timings.items() if name not in ENGINE_FRAMES]
+            slowest_seconds, slowest_rule = max(rules, default=(0.0, ""))
+            found.append(FileTiming(rel_path, sum(timings.values()), slowest_rule, slowest_seconds))
+        return found
+
+    def to_report(self, top: int) -> dict:
+        return {
+            "phases": {name: round(self.phases[name], 6) for name in PHASES if name in self.phases},
+            "checked_files": len(self.file_timings),
+            "cached_files": self.cached_files,
+            "engine": {frame.strip("[]"): round(spent, 6) for frame, spent in self.engine_timings().items()},
+            "rules": [
+                {"rule": item.rule, "kind": item.kind, "seconds": round(item.seconds, 6), "files": item.files}
+                for item in self.rule_timings()
+            ],
+            "slowest_files": [
+                {
+                    "file": item.file,
+                    "seconds": round(item.seconds, 6),
+                    "slowest_rule": item.slowest_rule,
+                    "slowest_rule_seconds": round(item.slowest_rule_seconds, 6),
+                }
+                for item in self.slowest_files(top)
+            ],
+        }
+
+    def summary_lines(self, top: int) -> list[str]:
+        total = sum(self.phases.values())
+        phases = ", ".join(f"{name}={self.phases[name]:.3f}s" for name in PHASES if name in self.phases)
+        lines = [f"Profile: total={total:.3f}s, {phases}"]
+        engine = ", ".join(f"{frame.strip('[]')}={spent:.3f}s" for frame, spent in self.engine_timings().items())
+        lines.append(
+            f"  Files: checked={len(self.file_timings)}, cached={self.cached_files}; shared file work: {engine}"
+        )
+        rules = self.rule_timings()
+        if len(rules) > 0:
+            lines.append(f"  Slowest rules (top {min(top, len(rules))}):")
+            for item in rules[:top]:
+                scope = f"{item.files} files" if item.kind == KIND_FILE else item.kind
+                lines.append(f"    {item.seconds:8.4f}s  {item.rule} ({scope})")
+        files = self.slowest_files(top)
+        if len(files) > 0:
+            lines.append(f"  Slowest files (top {len(files)}):")
+            for item in files:
+                lines.append(
+                    f"    {item.seconds:8.4f}s  {item.file} (slowest rule: {item.slowest_rule} {item.slowest_rule_seconds:.4f}s)"
+                )
+        return lines
+
+    def collapsed_stacks(self) -> list[str]:
+        # One "frame;frame;... microseconds" line per leaf, as read by
+        # flamegraph.pl, inferno and speedscope. File rules nest the file under
+        # the rule, so a frame's width is the rule total and its children show
+        # where that time went.
+        samples: dict[str, int] = {}
+
+        def add(stack: str, seconds: float) -> None:
+            micros = int(round(seconds * 1_000_000))
+            if micros > 0:
+                samples[stack] = samples.get(stack, 0) + micros
+
+        check_spent = 0.0
+        for rel_path, timings in self.file_timings.items():
+            for name, spent in timings.items():
+                add(f"{STACK_ROOT};check;{name};{rel_path}", spent)
+                check_spent += spent
+        for name, spent in self.project_rules.items():
+            add(f"{STACK_ROOT};project;{name}", spent)
+        for name, spent in self.auxiliary_rules.items():
+            add(f"{STACK_ROOT};auxiliary;{name}", spent)
+
+        # The rest of each phase is time not spent inside a rule.
+        accounted = {
+            "check": check_spent,
+            "project": sum(self.project_rules.values()),
+            "auxiliary": sum(self.auxiliary_rules.values()),
+        }
+        for name in PHASES:
+            if name in self.phases:
+                add(f"{STACK_ROOT};{name}", self.phases[name] - accounted.get(name, 0.0))
+        return [f"{stack} {micros}" for stack, micros in samples.items()]
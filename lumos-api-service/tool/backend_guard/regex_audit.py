@@ -0,0 +1,270 @@
+"""
+Regex safety audit for --audit-regex.
+
+Each pattern is applied to adversarial inputs built from a sample of what it
+matches: its prefixes, words and punctuation repeated many times, alone or
+after a partial match, which is where overlapping quantifiers backtrack.
+Every input is tried at lengths that climb about an eighth at a time from 8
+to 1024 characters, so an exponential pattern is caught by one slow input a
+little past the per-input deadline instead of running for minutes on a long
+one. A linear pattern takes about four times longer at 1024 characters than
+at 256; anything that grows much faster is reported as super-linear.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+
+AUDIT_START_LENGTH = 8
+AUDIT_SMALL_LENGTH = 256
+AUDIT_LARGE_LENGTH = 1024
+# One input that takes longer stops the pattern's audit and is reported.
+AUDIT_INPUT_DEADLINE_SECONDS = 0.05
+# Linear matching grows about 4x between the two lengths, quadratic about 16x.
+MAX_GROWTH = 8.0
+# Below this the timings are too small to tell growth from noise.
+MIN_FLAGGED_SECONDS = 0.0002
+AUDIT_REPEATS = 3
+FILLERS = (" ", "\t", "a", "a ", "0")
+ESCAPE_SAMPLES = {
+    "s": " ",
+    "S": "a",
+    "w": "a",
+    "W": " ",
+    "d": "0",
+    "D": "a",
+    "b": "",
+    "B": "",
+    "A": "",
+    "Z": "",
+    "t": "\t",
+    "n": "\n",
+}
+
+
+def _audit_lengths() -> tuple[int, ...]:
+    lengths = {AUDIT_SMALL_LENGTH, AUDIT_LARGE_LENGTH}
+    length = AUDIT_START_LENGTH
+    while length < AUDIT_LARGE_LENGTH:
+        lengths.add(length)
+        length += max(1, length // 8)
+    return tuple(sorted(lengths))
+
+
+AUDIT_LENGTHS = _audit_lengths()
+
+
+@dataclass(frozen=True)
+class AuditTarget:
+    # `apply` runs the pattern the way the guard does, usually its `search`.
+    name: str
+    source: str
+    apply: Callable[[str], object]
+
+
+_CANARY_PATTERN = re.compile(r"(a+)+b")
+CANARY = AuditTarget("canary", _CANARY_PATTERN.pattern, _CANARY_PATTERN.search)
+
+
+@dataclass(frozen=True)
+class RegexFinding:
+    name: str
+    sample: str
+    small_seconds: float
+    large_seconds: float
+    # The length of the input that passed the deadline, or 0 when the audit
+    # reached the largest length and the pattern grew too fast.
+    deadline_length: int = 0
+
+    @property
+    def growth(self) -> float:
+        return self.large_seconds / max(self.small_seconds, 1e-9)
+
+    def describe(self) -> str:
+        if self.deadline_length > 0:
+            return (
+                f"{self.name}: {self.large_seconds * 1000:.0f} ms on {self.deadline_length} chars, past the "
+                f"{AUDIT_INPUT_DEADLINE_SECONDS * 1000:.0f} ms limit for one input (input like {self.sample!r})"
+            )
+        return (
+            f"{self.name}: {self.large_seconds * 1000:.1f} ms on {AUDIT_LARGE_LENGTH} chars, "
+            f"{self.growth:.0f}x the time on {AUDIT_SMALL_LENGTH} chars (input like {self.sample!r})"
+        )
+
+
+def audit_patterns(targets: list[AuditTarget]) -> tuple[list[RegexFinding], int]:
+    # Returns the worst super-linear input per pattern and the number of
+    # inputs tried. A pattern stops at its first input past the deadline.
+    findings: list[RegexFinding] = []
+    tried = 0
+    for target in targets:
+        worst: RegexFinding | None = None
+        for prefix, unit in adversarial_inputs(target.source):
+            tried += 1
+            finding = _audit_input(target, prefix, unit)
+            if finding is None:
+                continue
+            if finding.deadline_length > 0:
+                worst = finding
+                break
+            if worst is None or finding.large_seconds > worst.large_seconds:
+                worst = finding
+        if worst is not None:
+            findings.append(worst)
+    return findings, tried
+
+
+def check_canary() -> RegexFinding | None:
+    # The audit of a pattern known to backtrack exponentially, which must be
+    # reported; None means the inputs or limits no longer catch it.
+    findings, _ = audit_patterns([CANARY])
+    return findings[0] if len(findings) > 0 else None
+
+
+def _audit_input(target: AuditTarget, prefix: str, unit: str) -> RegexFinding | None:
+    sample = (prefix + unit * 4)[:40]
+    previous = 0.0
+    timings: dict[int, float] = {}
+    for length in AUDIT_LENGTHS:
+        text = _build(prefix, unit, length)
+        # Only the two compared lengths are worth the repeats.
+        repeats = AUDIT_REPEATS if length in (AUDIT_SMALL_LENGTH, AUDIT_LARGE_LENGTH) else 1
+        seconds = _best_time(target.apply, text, repeats)
+        if seconds > AUDIT_INPUT_DEADLINE_SECONDS:
+            return RegexFinding(target.name, sample, previous, seconds, length)
+        previous = seconds
+        timings[length] = seconds
+    finding = RegexFinding(target.name, sample, timings[AUDIT_SMALL_LENGTH], timings[AUDIT_LARGE_LENGTH])
+    if finding.large_seconds < MIN_FLAGGED_SECONDS or finding.growth <= MAX_GROWTH:
+        return None
+    return finding
+
+
+def adversarial_inputs(source: str) -> list[tuple[str, str]]:
+    # (prefix, unit) pairs; the unit is repeated up to the audited length.
+    sample = pattern_sample(source)
+    words = _words(sample)
+    punctuation = sorted({char for char in sample if not char.isalnum() and not char.isspace()})
+    units = list(FILLERS) + punctuation + [f"{char} " for char in punctuation]
+    units.extend(word for word in words)
+    units.extend(f"{word} " for word in words)
+    prefixes = [sample[:cut] for cut in _cut_points(sample)]
+    found: list[tuple[str, str]] = [("", unit) for unit in units]
+    for prefix in prefixes:
+        found.extend((prefix, unit) for unit in list(FILLERS) + punctuation)
+        # A partial match repeated makes every copy a fresh starting point.
+        found.append(("", prefix))
+    return list(dict.fromkeys(pair for pair in found if pair[1] != ""))
+
+
+def pattern_sample(source: str) -> str:
+    # A rough string of the kind the pattern matches: classes become one of
+    # their members, escapes a representative character, and quantifiers,
+    # anchors and group syntax are dropped.
+    parts: list[str] = []
+    index = 0
+    while index < len(source):
+        char = source[index]
+        if char == "\\" and index + 1 < len(source):
+            escaped = source[index + 1]
+            parts.append(ESCAPE_SAMPLES.get(escaped, escaped))
+            index += 2
+            continue
+        if char == "[":
+            end = _class_end(source, index)
+            parts.append(_class_sample(source[index + 1 : end]))
+            index = end + 1
+            continue
+        if char == "(" and source.startswith("?", index + 1):
+            index = _group_body_start(source, index)
+            continue
+        if char == "{":
+            closing = source.find("}", index)
+            index = closing + 1 if closing >= 0 else index + 1
+            continue
+        if char == ".":
+            parts.append("a")
+        elif char not in "()*+?^$|":
+            parts.append(char)
+        index += 1
+    return "".join(parts)
+
+
+def _class_end(source: str, start: int) -> int:
+    index = start + 1
+    if source.startswith("^", index):
+        index += 1
+    # A leading "]" is a member, not the end of the class.
+    if source.startswith("]", index):
+        index += 1
+    while index < len(source):
+        if source[index] == "\\":
+            index += 2
+            continue
+        if source[index] == "]":
+            return index
+        index += 1
+    return len(source) - 1
+
+
+def _class_sample(body: str) -> str:
+    if body.startswith("^"):
+        excluded = body[1:]
+        return "a" if "a" not in excluded and "\\w" not in excluded else "("
+    if body.startswith("\\") and len(body) > 1:
+        return ESCAPE_SAMPLES.get(body[1], body[1])
+    return body[:1]
+
+
+def _group_body_start(source: str, start: int) -> int:
+    # Skips "(?:", "(?=", "(?!", "(?<=", "(?<!" and "(?P<name>".
+    index = start + 2
+    if source.startswith("P<", index):
+        closing = source.find(">", index)
+        return closing + 1 if closing >= 0 else index
+    if source.startswith("<=", index) or source.startswith("<!", index):
+        return index + 2
+    return index + 1
+
+
+def _words(sample: str) -> list[str]:
+    words: list[str] = []
+    current: list[str] = []
+    for char in sample + " ":
+        if char.isalnum() or char == "_":
+            current.append(char)
+            continue
+        if len(current) > 1:
+            words.append("".join(current))
+        current = []
+    return list(dict.fromkeys(words))
+
+
+def _cut_points(sample: str) -> list[int]:
+    # Every point where the sample switches between word and other characters.
+    cuts = [
+        index
+        for index in range(1, len(sample))
+        if (sample[index].isalnum() or sample[index] == "_") != (sample[index - 1].isalnum() or sample[index - 1] == "_")
+    ]
+    return cuts + [len(sample)]
+
+
+def _build(prefix: str, unit: str, length: int) -> str:
+    return prefix + unit * math.ceil(max(length - len(prefix), len(unit)) / len(unit))
+
+
+def _best_time(apply: Callable[[str], object], text: str, repeats: int) -> float:
+    best = math.inf
+    for _ in range(repeats):
+        started = time.perf_counter()
+        apply(text)
+        best = min(best, time.perf_counter() - started)
+        if best > AUDIT_INPUT_DEADLINE_SECONDS:
+            break
+    return best
@@ -0,0 +1,406 @@
+"""
+Report sinks selected with --format.
+
+Violations reach every sink in report order while files are still being
+checked. Each sink spools its body to a temporary file that stays in memory
+until it grows large. That way the summary, and the project rule results
+reported with the first file, can still be written ahead of the body when
+the run ends. Report files are written to a temporary name and renamed into
+place. Nothing in them depends on timing, so an unchanged tree gives a
+byte-identical report.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Protocol, TextIO
+
+
+SEVERITY_ERROR = "ERROR"
+SEVERITY_WARNING = "WARN"
+FORMAT_CONSOLE = "console"
+FORMAT_GROUPED = "grouped"
+FORMAT_JSON = "json"
+FORMAT_COMPACT_JSON = "compact-json"
+FORMAT_NDJSON = "ndjson"
+FORMAT_SARIF = "sarif"
+REPORT_FORMATS = (FORMAT_CONSOLE, FORMAT_GROUPED, FORMAT_JSON, FORMAT_COMPACT_JSON, FORMAT_NDJSON, FORMAT_SARIF)
+DEFAULT_FORMATS = f"{FORMAT_CONSOLE},{FORMAT_JSON}"
+# Formats that write the same destination; at most one of each group.
+EXCLUSIVE_FORMATS = ((FORMAT_CONSOLE, FORMAT_GROUPED), (FORMAT_JSON, FORMAT_COMPACT_JSON))
+REPORT_FILE = "backend_guard_report.json"
+NDJSON_REPORT_FILE = "backend_guard_report.ndjson"
+SARIF_REPORT_FILE = "backend_guard_report.sarif"
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_VERSION = "2.1.0"
+SARIF_TOOL_NAME = "backend-guard"
+SARIF_SOURCE_ROOT = "%SRCROOT%"
+SPOOL_MEMORY_BYTES = 1 << 20
+WRITE_BUFFER_BYTES = 1 << 16
+
+_quote = json.encoder.encode_basestring_ascii
+
+
+class ReportedViolation(Protocol):
+    rule: str
+    severity: str
+    file: str
+    line: int
+    reason: str
+    snippet: str
+
+    def to_console(self) -> str: ...
+
+
+@dataclass(frozen=True)
+class ReportCounts:
+    total: int
+    errors: int
+    warnings: int
+    by_rule: dict[str, int] = field(default_factory=dict)
+
+
+def count_violations(violations: Iterable[ReportedViolation]) -> ReportCounts:
+    total = errors = warnings = 0
+    for violation in violations:
+        total += 1
+        if violation.severity == SEVERITY_ERROR:
+            errors += 1
+        elif violation.severity == SEVERITY_WARNING:
+            warnings += 1
+    return ReportCounts(total, errors, warnings)
+
+
+def summary_header(counts: ReportCounts) -> str:
+    if counts.total == 0:
+        return "Backend checklist guard passed."
+    if counts.errors > 0:
+        return f"Backend checklist guard failed. errors={counts.errors}, warnings={counts.warnings}"
+    return f"Backend checklist guard completed with warnings. warnings={counts.warnings}"
+
+
+def parse_formats(raw_value: str) -> tuple[str, ...]:
+    formats = tuple(dict.fromkeys(token.strip() for token in raw_value.split(",") if token.strip() != ""))
+    unknown = [item for item in formats if item not in REPORT_FORMATS]
+    if len(unknown) > 0:
+        raise ValueError(f"unknown format {', '.join(unknown)}; choose from {', '.join(REPORT_FORMATS)}")
+    for group in EXCLUSIVE_FORMATS:
+        chosen = [item for item in formats if item in group]
+        if len(chosen) > 1:
+            raise ValueError(f"formats {' and '.join(chosen)} cannot be combined")
+    return formats
+
+
+def build_sinks(formats: tuple[str, ...], root: Path, quiet: bool, console: TextIO) -> list[ReportSink]:
+    # The console always gets the summary line; the console formats add the
+    # per-violation lines unless --quiet is set.
+    grouped = FORMAT_GROUPED in formats
+    listed = (FORMAT_CONSOLE in formats or grouped) and not quiet
+    sinks: list[ReportSink] = [ConsoleSink(console, grouped, listed)]
+    if FORMAT_JSON in formats or FORMAT_COMPACT_JSON in formats:
+        sinks.append(JsonSink(root / REPORT_FILE, compact=FORMAT_COMPACT_JSON in formats))
+    if FORMAT_NDJSON in formats:
+        sinks.append(NdjsonSink(root / NDJSON_REPORT_FILE))
+    if FORMAT_SARIF in formats:
+        sinks.append(SarifSink(root / SARIF_REPORT_FILE))
+    return sinks
+
+
+class ReportSink:
+    def __init__(self) -> None:
+        self._body = _Spool()
+        self._body_items = 0
+
+    def add(self, violations: list[ReportedViolation]) -> None:
+        for violation in violations:
+            self._write_item(self._body, violation, self._body_items == 0)
+            self._body_items += 1
+
+    def finish(self, head: list[ReportedViolation], counts: ReportCounts, extra: dict | None) -> None:
+        raise NotImplementedError
+
+    def _write_item(self, stream: TextIO, violation: ReportedViolation, first: bool) -> None:
+        raise NotImplementedError
+
+    def _write_entries(self, stream: TextIO, head: list[ReportedViolation]) -> None:
+        for position, violation in enumerate(head):
+            self._write_item(stream, violation, position == 0)
+        if len(head) > 0 and self._body_items > 0:
+            self._write_separator(stream)
+        self._body.copy_to(stream)
+        self._body.close()
+
+    def _write_separator(self, stream: TextIO) -> None:
+        pass
+
+
+class ConsoleSink(ReportSink):
+    def __init__(self, stream: TextIO, grouped: bool, listed: bool) -> None:
+        super().__init__()
+        self.stream = stream
+        self.grouped = grouped
+        self.listed = listed
+        self._last_file: str | None = None
+
+    def add(self, violations: list[ReportedViolation]) -> None:
+        if self.listed:
+            super().add(violations)
+
+    def finish(self, head: list[ReportedViolation], counts: ReportCounts, extra: dict | None) -> None:
+        self.stream.write(summary_header(counts) + "\n")
+        if not self.listed:
+            # Without the violation lines, say which rules failed and how often.
+            for rule, count in sorted(counts.by_rule.items(), key=lambda item: (-item[1], item[0])):
+                self.stream.write(f"  {rule}: {count}\n")
+            self._body.close()
+            return
+        # The head is written after the body was spooled, so file grouping
+        # restarts with it.
+        self._last_file = None
+        self._write_entries(self.stream, head)
+        self.stream.flush()
+
+    def _write_item(self, stream: TextIO, violation: ReportedViolation, first: bool) -> None:
+        if not self.grouped:
+            stream.write(violation.to_console() + "\n")
+            return
+        if violation.file != self._last_file:
+            self._last_file = violation.file
+            stream.write(violation.file + "\n")
+        stream.write(f"  {violation.line}: [{violation.severity}] {violation.rule} - {violation.reason} :: {violation.snippet}\n")
+
+
+class JsonSink(ReportSink):
+    # The indented layout matches json.dumps(payload, indent=2).
+    def __init__(self, path: Path, compact: bool) -> None:
+        super().__init__()
+        self.path = path
+        self.compact = compact
+
+    def finish(self, head: list[ReportedViolation], counts: ReportCounts, extra: dict | None) -> None:
+        def write(stream: TextIO) -> None:
+            if self.compact:
+                stream.write(f'{{"summary":{_compact_json(_summary_payload(counts))},"violations":[')
+            else:
+                stream.write(
+                    "{\n"
+                    '  "summary": {\n'
+                    f'    "total": {counts.total},\n'
+                    f'    "errors": {counts.errors},\n'
+                    f'    "warnings": {counts.warnings}\n'
+                    "  },\n"
+                    '  "violations": ['
+                )
+            empty = counts.total == 0
+            if not empty and not self.compact:
+                stream.write("\n")
+            self._write_entries(stream, head)
+            if not empty and not self.compact:
+                stream.write("\n  ")
+            stream.write("]")
+            for key, value in (extra or {}).items():
+                if self.compact:
+                    stream.write(f",{_quote(key)}:{_compact_json(value)}")
+                    continue
+                nested = json.dumps(value, ensure_ascii=True, indent=2).replace("\n", "\n  ")
+                stream.write(f",\n  {_quote(key)}: {nested}")
+            stream.write("}" if self.compact else "\n}")
+
+        _write_atomically(self.path, write)
+
+    def _write_item(self, stream: TextIO, violation: ReportedViolation, first: bool) -> None:
+        if not first:
+            self._write_separator(stream)
+        if self.compact:
+            stream.write(_compact_violation(violation))
+            return
+        stream.write(
+            "    {\n"
+            f'      "rule": {_quote(violation.rule)},\n'
+            f'      "severity": {_quote(violation.severity)},\n'
+            f'      "file": {_quote(violation.file)},\n'
+            f'      "line": {violation.line},\n'
+            f'      "reason": {_quote(violation.reason)},\n'
+            f'      "snippet": {_quote(violation.snippet)}\n'
+            "    }"
+        )
+
+    def _write_separator(self, stream: TextIO) -> None:
+        stream.write("," if self.compact else ",\n")
+
+
+class NdjsonSink(ReportSink):
+    # One violation per line, then one summary line.
+    def __init__(self, path: Path) -> None:
+        super().__init__()
+        self.path = path
+
+    def finish(self, head: list[ReportedViolation], counts: ReportCounts, extra: dict | None) -> None:
+        def write(stream: TextIO) -> None:
+            self._write_entries(stream, head)
+            stream.write(f'{{"summary":{_compact_json(_summary_payload(counts))}}}\n')
+
+        _write_atomically(self.path, write)
+
+    def _write_item(self, stream: TextIO, violation: ReportedViolation, first: bool) -> None:
+        stream.write(_compact_violation(violation) + "\n")
+
+
+class SarifSink(ReportSink):
+    def __init__(self, path: Path) -> None:
+        super().__init__()
+        self.path = path
+        self._rules: dict[str, str] = {}
+
+    def add(self, violations: list[ReportedViolation]) -> None:
+        for violation in violations:
+            self._rules.setdefault(violation.rule, violation.severity)
+        super().add(violations)
+
+    def finish(self, head: list[ReportedViolation], counts: ReportCounts, extra: dict | None) -> None:
+        for violation in head:
+            self._rules.setdefault(violation.rule, violation.severity)
+        rules = [
+            {"id": rule, "defaultConfiguration": {"level": _sarif_level(severity)}}
+            for rule, severity in sorted(self._rules.items())
+        ]
+        driver = {"name": SARIF_TOOL_NAME, "rules": rules}
+
+        def write(stream: TextIO) -> None:
+            stream.write(
+                f'{{"$schema":{_quote(SARIF_SCHEMA)},"version":{_quote(SARIF_VERSION)},'
+                f'"runs":[{{"tool":{{"driver":{_compact_json(driver)}}},"results":[\n'
+            )
+            self._write_entries(stream, head)
+            stream.write("\n]}]}\n" if counts.total > 0 else "]}]}\n")
+
+        _write_atomically(self.path, write)
+
+    def _write_item(self, stream: TextIO, violation: ReportedViolation, first: bool) -> None:
+        if not first:
+            self._write_separator(stream)
+        result = {
+            "ruleId": violation.rule,
+            "level": _sarif_level(violation.severity),
+            "message": {"text": violation.reason},
+            "locations": [
+                {
+                    "physicalLocation": {
+                        "artifactLocation": {"uri": violation.file, "uriBaseId": SARIF_SOURCE_ROOT},
+                        "region": {"startLine": max(violation.line, 1), "snippet": {"text": violation.snippet}},
+                    }
+                }
+            ],
+        }
+        stream.write(_compact_json(result))
+
+    def _write_separator(self, stream: TextIO) -> None:
+        stream.write(",\n")
+
+
+class ReportWriter:
+    # `select` sees every violation once, in the order they arrive, and
+    # returns the ones to report, e.g. to drop baselined violations.
+    def __init__(
+        self,
+        sinks: list[ReportSink],
+        select: Callable[[list[ReportedViolation]], list[ReportedViolation]] | None = None,
+    ) -> None:
+        self.sinks = sinks
+        self.select = select
+        self.total = 0
+        self.errors = 0
+        self.warnings = 0
+        self.rule_counts: Counter[str] = Counter()
+
+    def add(self, violations: list[ReportedViolation]) -> None:
+        if self.select is not None:
+            violations = self.select(violations)
+        if len(violations) == 0:
+            return
+        self._count(violations)
+        for sink in self.sinks:
+            sink.add(violations)
+
+    def close(self, head: list[ReportedViolation] | None = None, extra: dict | None = None) -> ReportCounts:
+        # `head` is reported ahead of everything passed to add().
+        head = head or []
+        if self.select is not None:
+            head = self.select(head)
+        self._count(head)
+        counts = ReportCounts(self.total, self.errors, self.warnings, dict(self.rule_counts))
+        for sink in self.sinks:
+            sink.finish(head, counts, extra)
+        return counts
+
+    def _count(self, violations: list[ReportedViolation]) -> None:
+        counts = count_violations(violations)
+        self.total += counts.total
+        self.errors += counts.errors
+        self.warnings += counts.warnings
+        self.rule_counts.update(violation.rule for violation in violations)
+
+
+class _Spool:
+    # A text buffer that stays in memory until it passes SPOOL_MEMORY_BYTES
+    # and then moves to a temporary file. Small runs never import tempfile.
+    def __init__(self) -> None:
+        self._stream: TextIO = io.StringIO()
+        self._in_memory = True
+
+    def write(self, text: str) -> None:
+        self._stream.write(text)
+        if self._in_memory and self._stream.tell() > SPOOL_MEMORY_BYTES:
+            self._roll_over()
+
+    def copy_to(self, stream: TextIO) -> None:
+        self._stream.seek(0)
+        while True:
+            chunk = self._stream.read(WRITE_BUFFER_BYTES)
+            if chunk == "":
+                return
+            stream.write(chunk)
+
+    def close(self) -> None:
+        self._stream.close()
+
+    def _roll_over(self) -> None:
+        from tempfile import TemporaryFile
+
+        spilled = TemporaryFile(mode="w+", encoding="utf-8", newline="")
+        spilled.write(self._stream.getvalue())
+        self._stream.close()
+        self._stream = spilled
+        self._in_memory = False
+
+
+def _write_atomically(path: Path, write: Callable[[TextIO], None]) -> None:
+    partial = path.with_name(f".{path.name}.partial")
+    with open(partial, "w", encoding="utf-8", buffering=WRITE_BUFFER_BYTES) as stream:
+        write(stream)
+    os.replace(partial, path)
+
+
+def _summary_payload(counts: ReportCounts) -> dict:
+    return {"total": counts.total, "errors": counts.errors, "warnings": counts.warnings}
+
+
+def _compact_violation(violation: ReportedViolation) -> str:
+    return (
+        f'{{"rule":{_quote(violation.rule)},"severity":{_quote(violation.severity)},'
+        f'"file":{_quote(violation.file)},"line":{violation.line},'
+        f'"reason":{_quote(violation.reason)},"snippet":{_quote(violation.snippet)}}}'
+    )
+
+
+def _compact_json(value: object) -> str:
+    return json.dumps(value, ensure_ascii=True, separators=(",", ":"))
+
+
+def _sarif_level(severity: str) -> str:
+    return "error" if severity == SEVERITY_ERROR else "warning"
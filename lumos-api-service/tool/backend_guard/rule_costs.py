@@ -0,0 +1,94 @@
+"""
+Per-rule cost history for --fail-fast and --max-errors.
+
+Each single-process run adds, per rule, the seconds spent checking files and
+the errors found. Line rules share each file's line walk equally unless a
+profile or time budget times them check by check. Older runs count half as much after every run, so the
+history follows the code base as it changes. A fail-fast run uses it to order
+its passes: rules with the most errors per second first, then rules without
+history, then rules that have never found an error, cheapest first.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+
+RULE_COSTS_FILE = ".backend_guard_rule_costs.json"
+RULE_COSTS_SCHEMA_VERSION = 1
+HISTORY_WEIGHT = 0.5
+
+
+@dataclass(frozen=True)
+class RuleCost:
+    seconds: float
+    errors: float
+
+    @property
+    def errors_per_second(self) -> float:
+        return self.errors / max(self.seconds, 1e-9)
+
+
+class RuleCostHistory:
+    def __init__(self, path: Path, costs: dict[str, RuleCost]) -> None:
+        self.path = path
+        self.costs = costs
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: Path) -> "RuleCostHistory":
+        if not path.exists():
+            return cls(path, {})
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cls(path, {})
+        if not isinstance(payload, dict) or payload.get("version") != RULE_COSTS_SCHEMA_VERSION:
+            return cls(path, {})
+        rules = payload.get("rules")
+        if not isinstance(rules, dict):
+            return cls(path, {})
+        costs: dict[str, RuleCost] = {}
+        for name, entry in rules.items():
+            try:
+                costs[name] = RuleCost(float(entry["seconds"]), float(entry["errors"]))
+            except (KeyError, TypeError, ValueError):
+                continue
+        return cls(path, costs)
+
+    def record(self, seconds: dict[str, float], errors: dict[str, int]) -> None:
+        # Rules missing from `seconds` checked no file in this run, such as
+        # when every file came from the cache, and keep their history.
+        for name, spent in seconds.items():
+            previous = self.costs.get(name, RuleCost(0.0, 0.0))
+            self.costs[name] = RuleCost(
+                previous.seconds * HISTORY_WEIGHT + spent,
+                previous.errors * HISTORY_WEIGHT + errors.get(name, 0),
+            )
+            self._dirty = True
+
+    def schedule(self, names: list[str]) -> list[list[str]]:
+        # Passes in the order they should run; empty passes are left out.
+        productive = [name for name in names if name in self.costs and self.costs[name].errors > 0]
+        unknown = [name for name in names if name not in self.costs]
+        quiet = [name for name in names if name in self.costs and self.costs[name].errors <= 0]
+        productive.sort(key=lambda name: -self.costs[name].errors_per_second)
+        quiet.sort(key=lambda name: self.costs[name].seconds)
+        return [group for group in (productive, unknown, quiet) if len(group) > 0]
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        payload = {
+            "version": RULE_COSTS_SCHEMA_VERSION,
+            "rules": {
+                name: {"seconds": round(cost.seconds, 6), "errors": round(cost.errors, 3)}
+                for name, cost in sorted(self.costs.items())
+            },
+        }
+        try:
+            self.path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        except OSError:
+            return
@@ -0,0 +1,162 @@
+"""
+Rule registry for the backend guard.
+
+Rules live in the modules of this package, grouped by topic. The registry
+knows every rule id, the module that defines it and the --only groups, so a
+selection is resolved before any rule module is imported. A module is
+imported, and its patterns compiled, the first time one of its rules is
+loaded.
+"""
+
+from __future__ import annotations
+
+import importlib
+from types import ModuleType
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+    from ..core import Rule
+
+
+RULE_CLASS_MAX_LINES = "CLASS_MAX_LINES"
+RULE_CONTROLLER_REST = "CONTROLLER_REST_CONTROLLER"
+RULE_CONTROLLER_TX = "CONTROLLER_NO_TRANSACTIONAL"
+RULE_CONTROLLER_ENTITY_RESPONSE = "CONTROLLER_NO_ENTITY_RESPONSE"
+RULE_CONTROLLER_API_VERSION = "CONTROLLER_API_VERSIONING"
+RULE_CONTROLLER_API_DOC = "CONTROLLER_API_DOC_REQUIRED"
+RULE_REPOSITORY_EXTENDS_JPA = "REPOSITORY_EXTENDS_JPA_REPOSITORY"
+RULE_ENTITY_NO_DATA = "ENTITY_NO_LOMBOK_DATA"
+RULE_ENTITY_HAS_ID = "ENTITY_HAS_ID"
+RULE_ENTITY_NO_LAYER_DEP = "ENTITY_NO_SERVICE_REPOSITORY_DEP"
+RULE_ENTITY_RELATION_FETCH = "ENTITY_RELATION_FETCH_LAZY"
+RULE_ENTITY_MANY_TO_ONE_JOIN = "ENTITY_MANY_TO_ONE_HAS_JOIN_COLUMN"
+RULE_ENTITY_AUDIT_LIFECYCLE = "ENTITY_AUDIT_LIFECYCLE"
+RULE_SHARED_MAPPED_SUPERCLASS = "ENTITY_SHARED_FIELDS_MAPPED_SUPERCLASS"
+RULE_ENTITY_OPTIMISTIC_LOCK = "ENTITY_HAS_VERSION_FOR_OPTIMISTIC_LOCK"
+RULE_ENTITY_ENUM_STRING = "ENTITY_ENUMERATED_STRING"
+RULE_SOFT_DELETE_NO_HARD_DELETE = "SOFT_DELETE_NO_HARD_DELETE_CALL"
+RULE_SOFT_DELETE_FIND_FILTER = "SOFT_DELETE_FIND_QUERY_FILTER"
+RULE_MAPSTRUCT_MAPPER_REQUIRED = "MAPSTRUCT_MAPPER_REQUIRED"
+RULE_MAPSTRUCT_NO_MANUAL_MAPPING = "MAPSTRUCT_NO_MANUAL_MAPPING_IN_SERVICE_CONTROLLER"
+RULE_DTO_VALIDATION_ANNOTATION = "DTO_REQUEST_VALIDATION_ANNOTATION_REQUIRED"
+RULE_DTO_VALIDATION_MESSAGE_CONSTANT = "DTO_VALIDATION_MESSAGE_MUST_USE_STATIC_CONSTANT"
+RULE_LOMBOK_REQUIRED_ARGS_CONSTRUCTOR = "LOMBOK_REQUIRED_ARGS_CONSTRUCTOR_FOR_SPRING_BEAN"
+RULE_LOMBOK_ENTITY_GETTER_SETTER = "LOMBOK_ENTITY_GETTER_SETTER_REQUIRED"
+RULE_LOMBOK_BUILDER_PREFERRED = "LOMBOK_BUILDER_PREFERRED_FOR_DTO_CLASS"
+RULE_NESTED_FOR_STREAM = "NESTED_FOR_SHOULD_USE_STREAM_INNER_LOOP"
+RULE_NO_ELSE = "NO_ELSE_ALLOWED"
+RULE_AUDIT_ENTITY_SEPARATE_CLASS = "AUDIT_FIELDS_ENTITY_MUST_USE_SEPARATE_BASE_CLASS"
+RULE_AUDIT_DTO_SEPARATE_CLASS = "AUDIT_FIELDS_DTO_MUST_USE_SEPARATE_MODEL"
+RULE_EXCEPTION_SERIAL_VERSION_UID = "EXCEPTION_MUST_DECLARE_SERIAL_VERSION_UID"
+RULE_VI_MESSAGES_ACCENTED = "VI_MESSAGES_MUST_BE_VIETNAMESE_ACCENTED"
+RULE_NO_DIRECT_TRIM = "NO_DIRECT_TRIM_USE_STRINGUTILS"
+RULE_NO_DIRECT_BLANK_CHECK = "NO_DIRECT_BLANK_CHECK_USE_STRINGUTILS"
+RULE_NO_DIRECT_STRING_PREDICATE = "NO_DIRECT_STRING_PREDICATE_USE_STRINGUTILS"
+RULE_QUERY_NATIVE_SQL_ONLY = "QUERY_MUST_USE_NATIVE_SQL"
+RULE_QUERY_KEYWORD_UPPERCASE = "QUERY_SQL_KEYWORDS_MUST_BE_UPPERCASE"
+RULE_JAVADOC_CONTROLLER_REQUIRED = "JAVADOC_REQUIRED_FOR_CONTROLLER_AND_ENDPOINTS"
+RULE_JAVADOC_SERVICE_REQUIRED = "JAVADOC_REQUIRED_FOR_SERVICE_METHODS"
+RULE_IF_REQUIRES_COMMENT = "IF_STATEMENT_REQUIRES_PRECEDING_COMMENT"
+RULE_THROW_REQUIRES_COMMENT = "THROW_STATEMENT_REQUIRES_PRECEDING_COMMENT"
+RULE_FOR_REQUIRES_COMMENT = "FOR_STATEMENT_REQUIRES_PRECEDING_COMMENT"
+RULE_STREAM_REQUIRES_COMMENT = "STREAM_CALL_REQUIRES_PRECEDING_COMMENT"
+RULE_RETURN_REQUIRES_COMMENT = "RETURN_STATEMENT_REQUIRES_PRECEDING_COMMENT"
+RULE_EXCEPTION_MESSAGE_I18N = "EXCEPTION_MESSAGE_MUST_USE_I18N_KEY"
+RULE_MESSAGE_KEYS_BUNDLE = "ERROR_MESSAGE_KEYS_MUST_EXIST_IN_MESSAGE_BUNDLES"
+
+# Run order, and the module that defines each rule. Rules report in this order
+# and a fail-fast run without cost history checks them in this order.
+RULE_MODULES = (
+    (RULE_CLASS_MAX_LINES, "style"),
+    (RULE_CONTROLLER_REST, "controller"),
+    (RULE_CONTROLLER_TX, "controller"),
+    (RULE_CONTROLLER_ENTITY_RESPONSE, "controller"),
+    (RULE_CONTROLLER_API_VERSION, "controller"),
+    (RULE_CONTROLLER_API_DOC, "controller"),
+    (RULE_REPOSITORY_EXTENDS_JPA, "persistence"),
+    (RULE_ENTITY_NO_DATA, "persistence"),
+    (RULE_ENTITY_HAS_ID, "persistence"),
+    (RULE_ENTITY_NO_LAYER_DEP, "persistence"),
+    (RULE_ENTITY_RELATION_FETCH, "persistence"),
+    (RULE_ENTITY_MANY_TO_ONE_JOIN, "persistence"),
+    (RULE_ENTITY_AUDIT_LIFECYCLE, "persistence"),
+    (RULE_SHARED_MAPPED_SUPERCLASS, "persistence"),
+    (RULE_ENTITY_OPTIMISTIC_LOCK, "persistence"),
+    (RULE_ENTITY_ENUM_STRING, "persistence"),
+    (RULE_SOFT_DELETE_NO_HARD_DELETE, "persistence"),
+    (RULE_SOFT_DELETE_FIND_FILTER, "persistence"),
+    (RULE_MAPSTRUCT_MAPPER_REQUIRED, "mapping"),
+    (RULE_MAPSTRUCT_NO_MANUAL_MAPPING, "mapping"),
+    (RULE_DTO_VALIDATION_ANNOTATION, "mapping"),
+    (RULE_DTO_VALIDATION_MESSAGE_CONSTANT, "i18n"),
+    (RULE_LOMBOK_REQUIRED_ARGS_CONSTRUCTOR, "lombok"),
+    (RULE_LOMBOK_ENTITY_GETTER_SETTER, "lombok"),
+    (RULE_LOMBOK_BUILDER_PREFERRED, "lombok"),
+    (RULE_NESTED_FOR_STREAM, "style"),
+    (RULE_NO_ELSE, "style"),
+    (RULE_AUDIT_ENTITY_SEPARATE_CLASS, "persistence"),
+    (RULE_AUDIT_DTO_SEPARATE_CLASS, "mapping"),
+    (RULE_EXCEPTION_SERIAL_VERSION_UID, "style"),
+    (RULE_NO_DIRECT_TRIM, "strings"),
+    (RULE_NO_DIRECT_BLANK_CHECK, "strings"),
+    (RULE_NO_DIRECT_STRING_PREDICATE, "strings"),
+    (RULE_QUERY_NATIVE_SQL_ONLY, "query"),
+    (RULE_QUERY_KEYWORD_UPPERCASE, "query"),
+    (RULE_JAVADOC_CONTROLLER_REQUIRED, "docs"),
+    (RULE_JAVADOC_SERVICE_REQUIRED, "docs"),
+    (RULE_EXCEPTION_MESSAGE_I18N, "i18n"),
+    (RULE_IF_REQUIRES_COMMENT, "docs"),
+    (RULE_THROW_REQUIRES_COMMENT, "docs"),
+    (RULE_FOR_REQUIRES_COMMENT, "docs"),
+    (RULE_STREAM_REQUIRES_COMMENT, "docs"),
+    (RULE_RETURN_REQUIRES_COMMENT, "docs"),
+)
+# Declarative rules are read from this file in the project root when it exists.
+DECLARATIVE_RULES_FILE = "backend_guard_rules.toml"
+REGISTERED_RULES = frozenset(name for name, _ in RULE_MODULES)
+# Checked once per run over the message bundles rather than per Java file.
+AUXILIARY_RULES = (RULE_VI_MESSAGES_ACCENTED, RULE_MESSAGE_KEYS_BUNDLE)
+RULE_GROUPS = {
+    "i18n": (
+        RULE_DTO_VALIDATION_MESSAGE_CONSTANT,
+        RULE_VI_MESSAGES_ACCENTED,
+        RULE_EXCEPTION_MESSAGE_I18N,
+        RULE_MESSAGE_KEYS_BUNDLE,
+    ),
+}
+
+
+class RuleFileError(Exception):
+    pass
+
+
+def resolve_selection(only_filters: set[str]) -> set[str]:
+    selected: set[str] = set()
+    for token in only_filters:
+        selected.update(RULE_GROUPS.get(token, (token,)))
+    return selected
+
+
+def unknown_selection(only_filters: set[str], extra_names: Iterable[str] = ()) -> list[str]:
+    # `extra_names` are the ids of rules defined outside the registry, such as declarative ones.
+    known = REGISTERED_RULES | set(AUXILIARY_RULES) | set(RULE_GROUPS) | set(extra_names)
+    return sorted(token for token in only_filters if token not in known)
+
+
+def load_rules(names: Iterable[str] | None = None) -> list[Rule]:
+    # Every rule when names is None; otherwise the named ones, in run order.
+    wanted = None if names is None else set(names)
+    entries = [(name, module) for name, module in RULE_MODULES if wanted is None or name in wanted]
+    built: dict[str, Rule] = {}
+    for module in dict.fromkeys(module for _, module in entries):
+        for rule in load_rule_module(module).build_rules():
+            built[rule.name] = rule
+    return [built[name] for name, _ in entries]
+
+
+def load_rule_module(module: str) -> ModuleType:
+    return importlib.import_module(f"{__name__}.{module}")
+
+
+def rule_modules() -> list[ModuleType]:
+    return [load_rule_module(module) for module in dict.fromkeys(module for _, module in RULE_MODULES)]
@@ -0,0 +1,197 @@
+"""
+Controller layer rules.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+from ..core import (
+    TAG_CONTROLLER_LAYER,
+    FileContext,
+    LineCheck,
+    LineRule,
+    LineScan,
+    ProjectContext,
+    Rule,
+    TagFilter,
+    Violation,
+)
+from ..reporting import SEVERITY_ERROR, SEVERITY_WARNING
+from . import (
+    RULE_CONTROLLER_API_DOC,
+    RULE_CONTROLLER_API_VERSION,
+    RULE_CONTROLLER_ENTITY_RESPONSE,
+    RULE_CONTROLLER_REST,
+    RULE_CONTROLLER_TX,
+)
+from .support import (
+    MAPPING_ANNOTATION_PATTERN,
+    first_line_by_contains_any,
+    first_line_of,
+    first_line_regex,
+    previous_non_blank_lines,
+)
+
+
+REQUEST_MAPPING_PATTERN = re.compile(r'@\s*RequestMapping\s*\(\s*"([^"]+)"')
+ENTITY_RESPONSE_PATTERN = re.compile(r"\bResponseEntity<\s*\w+Entity\s*>")
+DIRECT_ENTITY_RETURN_PATTERN = re.compile(r"\bpublic\s+(\w+Entity)\s+\w+\s*\(")
+OPERATION_ANNOTATION_PATTERN = re.compile(r"^\s*@\s*Operation\b")
+API_VERSION_PATH_PATTERN = re.compile(r"^/api/v\d+/")
+
+
+class ControllerRestRule(Rule):
+    name = RULE_CONTROLLER_REST
+    tag_filter = TagFilter(all_of=(TAG_CONTROLLER_LAYER,))
+    required_literals = ("@Controller", "Mapping")
+
+    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
+        if "@RestController" in file_ctx.text:
+            return []
+        line = first_line_of(file_ctx.lines, "@Controller")
+        if line > 0:
+            return [
+                Violation(
+                    rule=self.name,
+                    severity=SEVERITY_ERROR,
+                    file=file_ctx.rel_path,
+                    line=line,
+                    reason="Controller must use @RestController.",
+                    snippet=file_ctx.lines[line - 1].strip(),
+                )
+            ]
+        line = first_line_by_contains_any(
+            file_ctx.lines,
+            ["@GetMapping", "@PostMapping", "@PutMapping", "@PatchMapping", "@DeleteMapping"],
+        )
+        if line <= 0:
+            return []
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_WARNING,
+                file=file_ctx.rel_path,
+                line=line,
+                reason="Controller-like file should declare @RestController.",
+                snippet=file_ctx.lines[line - 1].strip(),
+            )
+        ]
+
+
+class ControllerTransactionalRule(Rule):
+    name = RULE_CONTROLLER_TX
+    tag_filter = TagFilter(all_of=(TAG_CONTROLLER_LAYER,))
+    required_literals = ("Transactional",)
+
+    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
+        line = first_line_regex(file_ctx.lines, r"@\s*Transactional\b")
+        if line <= 0:
+            return []
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_ERROR,
+                file=file_ctx.rel_path,
+                line=line,
+                reason="Do not put @Transactional in controller layer.",
+                snippet=file_ctx.lines[line - 1].strip(),
+            )
+        ]
+
+
+class ControllerEntityResponseRule(LineRule):
+    name = RULE_CONTROLLER_ENTITY_RESPONSE
+    tag_filter = TagFilter(all_of=(TAG_CONTROLLER_LAYER,))
+
+    def line_checks(self) -> list[LineCheck]:
+        return [LineCheck(self._check_line, literals=("Entity",))]
+
+    def _check_line(self, scan: LineScan) -> list[Violation] | None:
+        stripped = scan.stripped
+        if ENTITY_RESPONSE_PATTERN.search(stripped) is not None:
+            return [
+                Violation(
+                    rule=self.name,
+                    severity=SEVERITY_ERROR,
+                    file=scan.rel_path,
+                    line=scan.index,
+                    reason="Controller must not return Entity directly; use DTO.",
+                    snippet=stripped,
+                )
+            ]
+        if DIRECT_ENTITY_RETURN_PATTERN.search(stripped) is None:
+            return None
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_ERROR,
+                file=scan.rel_path,
+                line=scan.index,
+                reason="Controller method return type must not be Entity.",
+                snippet=stripped,
+            )
+        ]
+
+
+class ControllerApiVersionRule(LineRule):
+    name = RULE_CONTROLLER_API_VERSION
+    tag_filter = TagFilter(all_of=(TAG_CONTROLLER_LAYER,))
+
+    def line_checks(self) -> list[LineCheck]:
+        return [LineCheck(self._check_line, literals=("RequestMapping",), first_match_only=True)]
+
+    def _check_line(self, scan: LineScan) -> list[Violation] | None:
+        match = REQUEST_MAPPING_PATTERN.search(scan.raw)
+        if match is None:
+            return None
+        value = match.group(1)
+        if API_VERSION_PATH_PATTERN.match(value) is not None:
+            return []
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_WARNING,
+                file=scan.rel_path,
+                line=scan.index,
+                reason='Request mapping should be versioned, example: "/api/v1/...".',
+                snippet=scan.stripped,
+            )
+        ]
+
+
+class ControllerApiDocRule(LineRule):
+    name = RULE_CONTROLLER_API_DOC
+    tag_filter = TagFilter(all_of=(TAG_CONTROLLER_LAYER,))
+
+    def line_checks(self) -> list[LineCheck]:
+        return [LineCheck(self._check_line, literals=("Mapping",))]
+
+    def _check_line(self, scan: LineScan) -> list[Violation] | None:
+        if MAPPING_ANNOTATION_PATTERN.search(scan.raw) is None:
+            return None
+        previous = previous_non_blank_lines(scan.file_ctx, scan.index, 5)
+        has_operation = any(OPERATION_ANNOTATION_PATTERN.search(text) is not None for _, text in previous)
+        if has_operation:
+            return []
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_ERROR,
+                file=scan.rel_path,
+                line=scan.index,
+                reason="Endpoint mapping requires @Operation for API documentation.",
+                snippet=scan.stripped,
+            )
+        ]
+
+
+def build_rules() -> list[Rule]:
+    return [
+        ControllerRestRule(),
+        ControllerTransactionalRule(),
+        ControllerEntityResponseRule(),
+        ControllerApiVersionRule(),
+        ControllerApiDocRule(),
+    ]
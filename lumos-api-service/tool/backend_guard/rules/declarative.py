@@ -0,0 +1,316 @@
+"""
+Declarative line rules loaded from a TOML file.
+
+Each `[[rule]]` table becomes a `DeclarativeRule`, an ordinary `LineRule`
+whose trigger literals or leading tokens join the engine's shared dispatch,
+so a file is still walked once however many rules it defines:
+
+    [[rule]]
+    id = "SERVICE_NO_SYSTEM_OUT"
+    severity = "error"
+    message = "Use the logger instead of System.out."
+    literals = ["System.out", "System.err"]
+    pattern = '\\bSystem\\.(out|err)\\.'
+    layers = ["service", "controller"]
+    source = "main"
+    unless_comment_above = 4
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+
+from ..cache import content_digest
+from ..core import (
+    LAYER_PATH_TAGS,
+    STEREOTYPE_TAG_PATTERNS,
+    TAG_KIND_PREFIX,
+    TAG_MAIN_SOURCE,
+    TAG_TEST_SOURCE,
+    LineCheck,
+    LineRule,
+    LineScan,
+    TagFilter,
+    Violation,
+)
+from ..discovery import IgnoreRules, compile_pattern
+from ..reporting import SEVERITY_ERROR, SEVERITY_WARNING
+from . import AUXILIARY_RULES, REGISTERED_RULES, RuleFileError
+from .support import has_comment_above, has_javadoc_above
+
+
+RULE_ID_PATTERN = re.compile(r"[A-Z][A-Z0-9_]*")
+# Reserved for the reports the engine makes itself, such as skipped long lines.
+ENGINE_RULE_PREFIX = "GUARD_"
+SEVERITIES = {"error": SEVERITY_ERROR, "warning": SEVERITY_WARNING}
+SOURCE_TAGS = {"main": TAG_MAIN_SOURCE, "test": TAG_TEST_SOURCE}
+LAYER_TAGS = {tag.partition(":")[2]: tag for _, tag in LAYER_PATH_TAGS}
+# Every tag the engine can put on a file; the kinds are those found by
+# TYPE_DECLARATION_PATTERN.
+KNOWN_TAGS = frozenset(
+    [*SOURCE_TAGS.values(), *LAYER_TAGS.values()]
+    + [tag for tag, _, _ in STEREOTYPE_TAG_PATTERNS]
+    + [f"{TAG_KIND_PREFIX}{kind}" for kind in ("class", "interface", "enum", "record")]
+)
+# The engine dispatches on the first word of a line, or on `@` for any
+# annotation, so a leading token must be one of those to ever be seen.
+LEADING_TOKEN = re.compile(r"@|\w+")
+# The per-line views a pattern can be matched against, as on `LineScan`: the
+# line as written, with comments blanked, or with literal contents blanked too.
+MATCH_VIEWS = ("raw", "code", "masked")
+REQUIRED_KEYS = ("id", "severity", "message")
+OPTIONAL_KEYS = (
+    "literals",
+    "leading",
+    "pattern",
+    "match",
+    "layers",
+    "source",
+    "tags",
+    "not_tags",
+    "paths",
+    "exclude_paths",
+    "unless_comment_above",
+    "unless_javadoc_above",
+    "if_annotation",
+    "unless_annotation",
+    "once_per_file",
+)
+
+
+class DeclarativeRule(LineRule):
+    def __init__(
+        self,
+        *,
+        name: str,
+        severity: str,
+        message: str,
+        literals: tuple[str, ...],
+        leading: tuple[str, ...],
+        pattern: re.Pattern[str] | None,
+        match: str,
+        tag_filter: TagFilter,
+        paths: IgnoreRules | None,
+        exclude_paths: IgnoreRules | None,
+        comment_lookback: int,
+        javadoc_lookback: int,
+        if_annotation: re.Pattern[str] | None,
+        unless_annotation: re.Pattern[str] | None,
+        once_per_file: bool,
+        definition: str,
+    ) -> None:
+        self.name = name
+        self.tag_filter = tag_filter
+        self._severity = severity
+        self._message = message
+        self._literals = literals
+        self._leading = leading
+        self._pattern = pattern
+        self._match = match
+        self._paths = paths
+        self._exclude_paths = exclude_paths
+        self._comment_lookback = comment_lookback
+        self._javadoc_lookback = javadoc_lookback
+        self._if_annotation = if_annotation
+        self._unless_annotation = unless_annotation
+        self._once_per_file = once_per_file
+        # Digest of the table the rule came from, for the result cache key.
+        self.definition = definition
+
+    def line_checks(self) -> list[LineCheck]:
+        return [LineCheck(self._check_line, literals=self._literals, leading=self._leading, first_match_only=self._once_per_file)]
+
+    def _check_line(self, scan: LineScan) -> list[Violation] | None:
+        view = getattr(scan, self._match)
+        if self._pattern is not None:
+            if self._pattern.search(view) is None:
+                return None
+        elif len(self._literals) > 0 and not any(literal in view for literal in self._literals):
+            return None
+        if not scan.memo(f"declarative:{self.name}", lambda: self._applies_to_file(scan)):
+            return None
+        if self._comment_lookback > 0 and has_comment_above(scan.file_ctx, scan.index, self._comment_lookback):
+            return None
+        if self._javadoc_lookback > 0 and has_javadoc_above(scan.file_ctx, scan.index, self._javadoc_lookback):
+            return None
+        return [
+            Violation(
+                rule=self.name,
+                severity=self._severity,
+                file=scan.rel_path,
+                line=scan.index,
+                reason=self._message,
+                snippet=scan.stripped,
+            )
+        ]
+
+    def _applies_to_file(self, scan: LineScan) -> bool:
+        # Path and annotation conditions hold for the whole file, so they are
+        # decided once, on the first line that triggers the rule.
+        if self._paths is not None and not self._paths.is_ignored(scan.rel_path, False):
+            return False
+        if self._exclude_paths is not None and self._exclude_paths.is_ignored(scan.rel_path, False):
+            return False
+        if self._if_annotation is None and self._unless_annotation is None:
+            return True
+        code = "\n".join(scan.file_ctx.lexed.code_lines)
+        if self._if_annotation is not None and self._if_annotation.search(code) is None:
+            return False
+        return self._unless_annotation is None or self._unless_annotation.search(code) is None
+
+
+def load_rule_file(path: Path) -> list[DeclarativeRule]:
+    try:
+        import tomllib
+    except ModuleNotFoundError:
+        raise RuleFileError(f"{path}: reading TOML rule files needs Python 3.11 or newer") from None
+    try:
+        document = tomllib.loads(path.read_text(encoding="utf-8"))
+    except OSError as error:
+        raise RuleFileError(f"cannot read rule file {path}: {error}") from error
+    except tomllib.TOMLDecodeError as error:
+        raise RuleFileError(f"{path}: {error}") from error
+    tables = document.get("rule", [])
+    if not isinstance(tables, list) or set(document) - {"rule"}:
+        raise RuleFileError(f"{path}: expected only [[rule]] tables")
+    rules: list[DeclarativeRule] = []
+    seen: set[str] = set()
+    for position, table in enumerate(tables, start=1):
+        label = f"{path}: rule {position}"
+        if isinstance(table, dict) and isinstance(table.get("id"), str):
+            label = f"{label} ({table['id']})"
+        rule = _compile_rule(table, label)
+        if rule.name in seen:
+            raise RuleFileError(f"{label}: id is defined twice")
+        seen.add(rule.name)
+        rules.append(rule)
+    return rules
+
+
+def _compile_rule(table: object, label: str) -> DeclarativeRule:
+    if not isinstance(table, dict):
+        raise RuleFileError(f"{label}: expected a table")
+    unknown = sorted(set(table) - set(REQUIRED_KEYS) - set(OPTIONAL_KEYS))
+    if len(unknown) > 0:
+        raise RuleFileError(f"{label}: unknown keys: {', '.join(unknown)}")
+    missing = [key for key in REQUIRED_KEYS if key not in table]
+    if len(missing) > 0:
+        raise RuleFileError(f"{label}: missing keys: {', '.join(missing)}")
+
+    name = _string(table, "id", label)
+    if RULE_ID_PATTERN.fullmatch(name) is None:
+        raise RuleFileError(f"{label}: id must be upper case letters, digits and underscores")
+    if name in REGISTERED_RULES or name in AUXILIARY_RULES or name.startswith(ENGINE_RULE_PREFIX):
+        raise RuleFileError(f"{label}: id is already a built-in rule")
+    severity = _string(table, "severity", label)
+    if severity not in SEVERITIES:
+        raise RuleFileError(f"{label}: severity must be one of {', '.join(SEVERITIES)}")
+    literals = _strings(table, "literals", label)
+    leading = _strings(table, "leading", label)
+    # Without a trigger the rule would see every line of every file.
+    if len(literals) == 0 and len(leading) == 0:
+        raise RuleFileError(f"{label}: set literals or leading so the rule joins the shared line dispatch")
+    if len(literals) > 0 and len(leading) > 0:
+        raise RuleFileError(f"{label}: set either literals or leading, not both")
+    bad_leading = [token for token in leading if LEADING_TOKEN.fullmatch(token) is None]
+    if len(bad_leading) > 0:
+        raise RuleFileError(f"{label}: leading tokens must be one word or @: {', '.join(bad_leading)}")
+    pattern = None
+    if "pattern" in table:
+        try:
+            pattern = re.compile(_string(table, "pattern", label))
+        except re.error as error:
+            raise RuleFileError(f"{label}: invalid pattern: {error}") from error
+    match = table.get("match", "masked")
+    if match not in MATCH_VIEWS:
+        raise RuleFileError(f"{label}: match must be one of {', '.join(MATCH_VIEWS)}")
+
+    all_of = list(_tags(table, "tags", label))
+    if "source" in table:
+        source = _string(table, "source", label)
+        if source not in SOURCE_TAGS:
+            raise RuleFileError(f"{label}: source must be one of {', '.join(SOURCE_TAGS)}")
+        all_of.append(SOURCE_TAGS[source])
+    layers = _strings(table, "layers", label)
+    unknown_layers = [layer for layer in layers if layer not in LAYER_TAGS]
+    if len(unknown_layers) > 0:
+        raise RuleFileError(f"{label}: unknown layers: {', '.join(unknown_layers)}")
+    tag_filter = TagFilter(
+        all_of=tuple(all_of),
+        any_of=tuple(LAYER_TAGS[layer] for layer in layers),
+        none_of=_tags(table, "not_tags", label),
+    )
+
+    return DeclarativeRule(
+        name=name,
+        severity=SEVERITIES[severity],
+        message=_string(table, "message", label),
+        literals=literals,
+        leading=leading,
+        pattern=pattern,
+        match=match,
+        tag_filter=tag_filter,
+        paths=_globs(table, "paths", label),
+        exclude_paths=_globs(table, "exclude_paths", label),
+        comment_lookback=_lookback(table, "unless_comment_above", label),
+        javadoc_lookback=_lookback(table, "unless_javadoc_above", label),
+        if_annotation=_annotations(table, "if_annotation", label),
+        unless_annotation=_annotations(table, "unless_annotation", label),
+        once_per_file=_flag(table, "once_per_file", label),
+        definition=content_digest(json.dumps(table, sort_keys=True)),
+    )
+
+
+def _string(table: dict, key: str, label: str) -> str:
+    value = table[key]
+    if not isinstance(value, str) or value == "":
+        raise RuleFileError(f"{label}: {key} must be a non-empty string")
+    return value
+
+
+def _strings(table: dict, key: str, label: str) -> tuple[str, ...]:
+    value = table.get(key, [])
+    if not isinstance(value, list) or not all(isinstance(item, str) and item != "" for item in value):
+        raise RuleFileError(f"{label}: {key} must be a list of non-empty strings")
+    return tuple(value)
+
+
+def _tags(table: dict, key: str, label: str) -> tuple[str, ...]:
+    tags = _strings(table, key, label)
+    unknown = [tag for tag in tags if tag not in KNOWN_TAGS]
+    if len(unknown) > 0:
+        raise RuleFileError(f"{label}: unknown {key}: {', '.join(unknown)}")
+    return tags
+
+
+def _lookback(table: dict, key: str, label: str) -> int:
+    value = table.get(key, 0)
+    if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+        raise RuleFileError(f"{label}: {key} must be a number of lines")
+    return value
+
+
+def _flag(table: dict, key: str, label: str) -> bool:
+    value = table.get(key, False)
+    if not isinstance(value, bool):
+        raise RuleFileError(f"{label}: {key} must be true or false")
+    return value
+
+
+def _globs(table: dict, key: str, label: str) -> IgnoreRules | None:
+    globs = _strings(table, key, label)
+    if len(globs) == 0:
+        return None
+    patterns = tuple(pattern for pattern in (compile_pattern(glob) for glob in globs) if pattern is not None)
+    return IgnoreRules(patterns)
+
+
+def _annotations(table: dict, key: str, label: str) -> re.Pattern[str] | None:
+    names = _strings(table, key, label)
+    if len(names) == 0:
+        return None
+    if not all(name.isidentifier() for name in names):
+        raise RuleFileError(f"{label}: {key} must list annotation names without @")
+    return re.compile(r"@\s*(?:" + "|".join(names) + r")\b")
@@ -0,0 +1,333 @@
+"""
+JavaDoc and preceding-comment rules.
+"""
+
+from __future__ import annotations
+
+import re
+
+from ..core import (
+    TAG_CONTROLLER_LAYER,
+    TAG_MAIN_SOURCE,
+    TAG_MODE_LAYER,
+    TAG_SECURITY_LAYER,
+    TAG_SERVICE_LAYER,
+    LineCheck,
+    LineRule,
+    LineScan,
+    Rule,
+    TagFilter,
+    Violation,
+)
+from ..reporting import SEVERITY_ERROR
+from . import (
+    RULE_FOR_REQUIRES_COMMENT,
+    RULE_IF_REQUIRES_COMMENT,
+    RULE_JAVADOC_CONTROLLER_REQUIRED,
+    RULE_JAVADOC_SERVICE_REQUIRED,
+    RULE_RETURN_REQUIRES_COMMENT,
+    RULE_STREAM_REQUIRES_COMMENT,
+    RULE_THROW_REQUIRES_COMMENT,
+)
+from .support import (
+    FOR_PATTERN,
+    MAPPING_ANNOTATION_PATTERN,
+    detect_primary_class_name,
+    extract_javadoc_above,
+    has_comment_above,
+    has_javadoc_above,
+)
+
+
+REST_CONTROLLER_ANNOTATION_PATTERN = re.compile(r"^\s*@\s*RestController\b")
+# Only the first "(" after the return type needs trying: any later one leaves less room for ")".
+PUBLIC_METHOD_START_PATTERN = re.compile(r"^\s*public\s.[^(]*\(.+\)")
+IF_STATEMENT_PATTERN = re.compile(r"^\s*if\s*\(")
+THROW_STATEMENT_PATTERN = re.compile(r"^\s*throw\b")
+STREAM_CALL_PATTERN = re.compile(r"\.\s*stream\s*\(")
+RETURN_STATEMENT_PATTERN = re.compile(r"^\s*return\b")
+# Applied to whitespace-normalized method signatures by `_search_public_signature`.
+RETURN_TYPE_PATTERN = re.compile(
+    r"\bpublic\s+(?:default\s+)?(?:static\s+)?(?:final\s+)?([A-Za-z0-9_<>\[\], ?]+?)\s+[A-Za-z_][A-Za-z0-9_]*\s*\("
+)
+METHOD_NAME_PATTERN = re.compile(
+    r"\bpublic\s+(?:default\s+)?(?:static\s+)?(?:final\s+)?[A-Za-z0-9_<>\[\], ?]+\s+([A-Za-z_][A-Za-z0-9_]*)\s*\("
+)
+PUBLIC_KEYWORD_PATTERN = re.compile(r"\bpublic\s")
+SIGNATURE_BREAK_PATTERN = re.compile(r"[^A-Za-z0-9_<>\[\], ?]")
+COMMENTED_BEHAVIOR_FILTER = TagFilter(
+    all_of=(TAG_MAIN_SOURCE,),
+    any_of=(TAG_SERVICE_LAYER, TAG_MODE_LAYER, TAG_SECURITY_LAYER, TAG_CONTROLLER_LAYER),
+)
+
+
+class JavaDocControllerRule(LineRule):
+    name = RULE_JAVADOC_CONTROLLER_REQUIRED
+    tag_filter = TagFilter(all_of=(TAG_CONTROLLER_LAYER,))
+
+    def line_checks(self) -> list[LineCheck]:
+        return [
+            LineCheck(self._check_controller_line, literals=("RestController",), first_match_only=True),
+            LineCheck(self._check_mapping_line, literals=("Mapping",)),
+        ]
+
+    def _check_controller_line(self, scan: LineScan) -> list[Violation] | None:
+        if REST_CONTROLLER_ANNOTATION_PATTERN.search(scan.raw) is None:
+            return None
+        if has_javadoc_above(scan.file_ctx, scan.index, 10):
+            return []
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_ERROR,
+                file=scan.rel_path,
+                line=scan.index,
+                reason="Controller class must define JavaDoc.",
+                snippet=scan.stripped,
+            )
+        ]
+
+    def _check_mapping_line(self, scan: LineScan) -> list[Violation] | None:
+        if MAPPING_ANNOTATION_PATTERN.search(scan.raw) is None:
+            return None
+        if has_javadoc_above(scan.file_ctx, scan.index, 12):
+            return []
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_ERROR,
+                file=scan.rel_path,
+                line=scan.index,
+                reason="Endpoint mapping must define JavaDoc.",
+                snippet=scan.stripped,
+            )
+        ]
+
+
+class JavaDocServiceRule(LineRule):
+    name = RULE_JAVADOC_SERVICE_REQUIRED
+    tag_filter = TagFilter(all_of=(TAG_SERVICE_LAYER,))
+
+    def line_checks(self) -> list[LineCheck]:
+        return [LineCheck(self._check_line, leading=("public",))]
+
+    def _check_line(self, scan: LineScan) -> list[Violation] | None:
+        stripped = scan.stripped
+        if not PUBLIC_METHOD_START_PATTERN.search(stripped):
+            return None
+        if " class " in stripped:
+            return None
+
+        lines = scan.lines
+        index = scan.index
+        signature = _collect_method_signature(lines, index, 8)
+        return_type = _extract_return_type(signature)
+        method_name = _extract_method_name(signature)
+        if method_name == "":
+            return None
+        class_name = scan.memo("primary_class_name", lambda: detect_primary_class_name(lines))
+        if method_name == class_name:
+            return None
+
+        param_names = _extract_param_names(signature)
+        javadoc = extract_javadoc_above(scan.file_ctx, index, 20)
+        if javadoc == "":
+            return [
+                Violation(
+                    rule=self.name,
+                    severity=SEVERITY_ERROR,
+                    file=scan.rel_path,
+                    line=index,
+                    reason="Service method must have JavaDoc with @param/@return.",
+                    snippet=stripped,
+                )
+            ]
+
+        violations: list[Violation] = []
+        for param_name in param_names:
+            if f"@param {param_name}" in javadoc:
+                continue
+            violations.append(
+                Violation(
+                    rule=self.name,
+                    severity=SEVERITY_ERROR,
+                    file=scan.rel_path,
+                    line=index,
+                    reason=f"Service JavaDoc missing @param for '{param_name}'.",
+                    snippet=stripped,
+                )
+            )
+            break
+
+        if return_type == "void":
+            return violations
+        if "@return" in javadoc:
+            return violations
+        violations.append(
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_ERROR,
+                file=scan.rel_path,
+                line=index,
+                reason="Service JavaDoc missing @return.",
+                snippet=stripped,
+            )
+        )
+        return violations
+
+
+class PrecedingCommentRule(LineRule):
+    def __init__(
+        self,
+        *,
+        name: str,
+        pattern: re.Pattern[str],
+        reason: str,
+        literals: tuple[str, ...] = (),
+        leading: tuple[str, ...] = (),
+        tag_filter: TagFilter = TagFilter(),
+    ) -> None:
+        self.name = name
+        self._pattern = pattern
+        self._reason = reason
+        self._literals = literals
+        self._leading = leading
+        self.tag_filter = tag_filter
+
+    def line_checks(self) -> list[LineCheck]:
+        return [LineCheck(self._check_line, literals=self._literals, leading=self._leading)]
+
+    def _check_line(self, scan: LineScan) -> list[Violation] | None:
+        if self._pattern.search(scan.raw) is None:
+            return None
+        if has_comment_above(scan.file_ctx, scan.index, 4):
+            return []
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_ERROR,
+                file=scan.rel_path,
+                line=scan.index,
+                reason=self._reason,
+                snippet=scan.stripped,
+            )
+        ]
+
+
+def _collect_method_signature(lines: list[str], start_line: int, max_lines: int) -> str:
+    index = start_line - 1
+    end = min(len(lines), index + max_lines)
+    parts: list[str] = []
+    while index < end:
+        raw = lines[index].strip()
+        parts.append(raw)
+        if raw.endswith("{") or raw.endswith(";"):
+            break
+        index += 1
+    return " ".join(parts)
+
+
+def _extract_return_type(signature: str) -> str:
+    match = _search_public_signature(RETURN_TYPE_PATTERN, signature)
+    if match is None:
+        return ""
+    return match.group(1).strip()
+
+
+def _extract_method_name(signature: str) -> str:
+    match = _search_public_signature(METHOD_NAME_PATTERN, signature)
+    if match is None:
+        return ""
+    return match.group(1)
+
+
+def _search_public_signature(pattern: re.Pattern[str], signature: str) -> re.Match[str] | None:
+    # Same as pattern.search on the whitespace-normalized signature. A match
+    # runs from "public" over type characters to "(". When the first "public"
+    # of such a run fails, every later one in the run fails too, so the search
+    # resumes after the run instead of retrying each of them.
+    normalized = " ".join(signature.split())
+    position = 0
+    while True:
+        start = PUBLIC_KEYWORD_PATTERN.search(normalized, position)
+        if start is None:
+            return None
+        match = pattern.match(normalized, start.start())
+        if match is not None:
+            return match
+        boundary = SIGNATURE_BREAK_PATTERN.search(normalized, start.end())
+        if boundary is None:
+            return None
+        position = boundary.end()
+
+
+def _extract_param_names(signature: str) -> list[str]:
+    normalized = " ".join(signature.split())
+    start = normalized.find("(")
+    end = normalized.rfind(")")
+    if start < 0 or end < 0 or end <= start:
+        return []
+    params_segment = normalized[start + 1:end].strip()
+    if params_segment == "":
+        return []
+    params = [chunk.strip() for chunk in params_segment.split(",")]
+    param_names: list[str] = []
+    for param in params:
+        tokens = [t for t in param.split(" ") if t not in {"final"} and not t.startswith("@")]
+        if len(tokens) == 0:
+            continue
+        candidate = tokens[-1].replace("...", "").strip()
+        if candidate == "":
+            continue
+        param_names.append(candidate)
+    return param_names
+
+
+# --audit-regex applies the signature patterns through these, since they only
+# ever see whitespace-normalized signatures.
+REGEX_AUDIT_HELPERS = {
+    "RETURN_TYPE_PATTERN": _extract_return_type,
+    "METHOD_NAME_PATTERN": _extract_method_name,
+}
+
+
+def build_rules() -> list[Rule]:
+    return [
+        JavaDocControllerRule(),
+        JavaDocServiceRule(),
+        PrecedingCommentRule(
+            name=RULE_IF_REQUIRES_COMMENT,
+            pattern=IF_STATEMENT_PATTERN,
+            leading=("if",),
+            reason="if statement must have a preceding comment explaining the condition.",
+            tag_filter=COMMENTED_BEHAVIOR_FILTER,
+        ),
+        PrecedingCommentRule(
+            name=RULE_THROW_REQUIRES_COMMENT,
+            pattern=THROW_STATEMENT_PATTERN,
+            leading=("throw",),
+            reason="throw statement must have a preceding comment explaining the exception path.",
+            tag_filter=COMMENTED_BEHAVIOR_FILTER,
+        ),
+        PrecedingCommentRule(
+            name=RULE_FOR_REQUIRES_COMMENT,
+            pattern=FOR_PATTERN,
+            leading=("for",),
+            reason="for statement must have a preceding comment explaining the loop intent.",
+            tag_filter=COMMENTED_BEHAVIOR_FILTER,
+        ),
+        PrecedingCommentRule(
+            name=RULE_STREAM_REQUIRES_COMMENT,
+            pattern=STREAM_CALL_PATTERN,
+            literals=("stream",),
+            reason="stream call must have a preceding comment explaining the stream pipeline intent.",
+            tag_filter=COMMENTED_BEHAVIOR_FILTER,
+        ),
+        PrecedingCommentRule(
+            name=RULE_RETURN_REQUIRES_COMMENT,
+            pattern=RETURN_STATEMENT_PATTERN,
+            leading=("return",),
+            reason="return statement must have a preceding comment explaining the return path.",
+            tag_filter=COMMENTED_BEHAVIOR_FILTER,
+        ),
+    ]
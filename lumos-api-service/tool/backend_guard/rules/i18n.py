@@ -0,0 +1,273 @@
+"""
+i18n rules: validation and exception messages, and the message bundle checks.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Callable
+
+from ..core import (
+    ERROR_MESSAGE_KEYS_FILE,
+    MESSAGE_BUNDLE_FILES,
+    VI_MESSAGES_FILE,
+    TAG_CONTROLLER_LAYER,
+    TAG_DTO_REQUEST_LAYER,
+    TAG_ERROR_LAYER,
+    TAG_EXCEPTION_LAYER,
+    TAG_MAIN_SOURCE,
+    TAG_MODE_LAYER,
+    TAG_SECURITY_LAYER,
+    TAG_SERVICE_LAYER,
+    LineCheck,
+    LineRule,
+    LineScan,
+    Rule,
+    TagFilter,
+    Violation,
+)
+from ..reporting import SEVERITY_ERROR
+from . import (
+    RULE_DTO_VALIDATION_MESSAGE_CONSTANT,
+    RULE_EXCEPTION_MESSAGE_I18N,
+    RULE_MESSAGE_KEYS_BUNDLE,
+    RULE_VI_MESSAGES_ACCENTED,
+)
+from .support import collect_annotation_block
+
+
+I18N_ALLOW_TECHNICAL_LITERAL_MARKER = "backend-guard: allow-technical-literal"
+VALIDATION_ANNOTATION_START_PATTERN = re.compile(
+    r"@\s*(NotNull|NotBlank|NotEmpty|Size|Pattern|Min|Max|Positive|PositiveOrZero|Negative|NegativeOrZero|Email|Past|PastOrPresent|Future|FutureOrPresent|AssertTrue|AssertFalse)\b"
+)
+VALIDATION_LITERAL_MESSAGE_PATTERN = re.compile(r'message\s*=\s*"[^"]*"')
+THROW_NEW_EXCEPTION_LITERAL_PATTERN = re.compile(
+    r'throw\s+new\s+[A-Za-z_][A-Za-z0-9_]*Exception\s*\([^)]*"([^"]+)"'
+)
+RESPONSE_STATUS_EXCEPTION_LITERAL_PATTERN = re.compile(
+    r'new\s+ResponseStatusException\s*\([^)]*"([^"]+)"'
+)
+MESSAGE_SOURCE_LITERAL_PATTERN = re.compile(
+    r'messageSource\s*\.\s*getMessage\s*\(\s*"([^"]+)"'
+)
+MESSAGE_KEY_VALUE_PATTERN = re.compile(r"[a-z0-9_.-]+")
+MESSAGE_KEY_CONSTANT_PATTERN = re.compile(
+    r'public\s+static\s+final\s+String\s+[A-Z0-9_]+\s*=\s*"([^"]+)";'
+)
+VIETNAMESE_ACCENTED_CHAR_PATTERN = re.compile(r"[àáạảãâầấậẩẫăằắặẳẵèéẹẻẽêềếệểễìíịỉĩòóọỏõôồốộổỗơờớợởỡùúụủũưừứựửữỳýỵỷỹđÀÁẠẢÃÂẦẤẬẨẪĂẰẮẶẲẴÈÉẸẺẼÊỀẾỆỂỄÌÍỊỈĨÒÓỌỎÕÔỒỐỘỔỖƠỜỚỢỞỠÙÚỤỦŨƯỪỨỰỬỮỲÝỴỶỸĐ]")
+
+
+class DtoValidationMessageConstantRule(LineRule):
+    name = RULE_DTO_VALIDATION_MESSAGE_CONSTANT
+    tag_filter = TagFilter(all_of=(TAG_DTO_REQUEST_LAYER,))
+    required_literals = ("message",)
+
+    def line_checks(self) -> list[LineCheck]:
+        return [LineCheck(self._check_line, literals=("@",))]
+
+    def _check_line(self, scan: LineScan) -> list[Violation] | None:
+        if VALIDATION_ANNOTATION_START_PATTERN.search(scan.raw) is None:
+            return None
+        block = collect_annotation_block(scan.file_ctx, scan.index, 6)
+        if block.strip() == "":
+            return []
+        if VALIDATION_LITERAL_MESSAGE_PATTERN.search(block) is None:
+            return []
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_ERROR,
+                file=scan.rel_path,
+                line=scan.index,
+                reason='Validation annotation message must use static constant, not string literal.',
+                snippet=scan.stripped,
+            )
+        ]
+
+
+class ExceptionMessageI18nRule(LineRule):
+    name = RULE_EXCEPTION_MESSAGE_I18N
+    tag_filter = TagFilter(
+        all_of=(TAG_MAIN_SOURCE,),
+        any_of=(
+            TAG_CONTROLLER_LAYER,
+            TAG_SERVICE_LAYER,
+            TAG_MODE_LAYER,
+            TAG_SECURITY_LAYER,
+            TAG_EXCEPTION_LAYER,
+            TAG_ERROR_LAYER,
+        ),
+    )
+
+    def line_checks(self) -> list[LineCheck]:
+        return [LineCheck(self._check_line, literals=("throw", "ResponseStatusException", "messageSource"))]
+
+    def _check_line(self, scan: LineScan) -> list[Violation] | None:
+        if I18N_ALLOW_TECHNICAL_LITERAL_MARKER in scan.raw:
+            return None
+        if _has_comment_marker_above(scan.lines, scan.index, I18N_ALLOW_TECHNICAL_LITERAL_MARKER, 2):
+            return None
+        stripped = scan.code
+        if stripped == "":
+            return None
+        literal = _find_exception_literal(stripped)
+        if literal is None:
+            return None
+        if _looks_like_message_key(literal):
+            return []
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_ERROR,
+                file=scan.rel_path,
+                line=scan.index,
+                reason="Exception or message-source path must use i18n message keys instead of hardcoded user-facing text.",
+                snippet=scan.stripped,
+            )
+        ]
+
+
+def check_vietnamese_messages(read_text: Callable[[str], str | None]) -> list[Violation]:
+    text = read_text(VI_MESSAGES_FILE)
+    if text is None:
+        return [
+            Violation(
+                rule=RULE_VI_MESSAGES_ACCENTED,
+                severity=SEVERITY_ERROR,
+                file=VI_MESSAGES_FILE,
+                line=1,
+                reason="Missing messages_vi.properties.",
+                snippet="messages_vi.properties",
+            )
+        ]
+
+    lines = text.splitlines()
+    violations: list[Violation] = []
+    relative = VI_MESSAGES_FILE
+    for index, raw in enumerate(lines, start=1):
+        stripped = raw.strip()
+        if stripped == "" or stripped.startswith("#"):
+            continue
+        if "=" not in stripped:
+            continue
+        key, value = stripped.split("=", 1)
+        _ = key
+        normalized = value.strip()
+        if normalized == "":
+            continue
+        has_alpha = any(ch.isalpha() for ch in normalized)
+        if not has_alpha:
+            continue
+        if VIETNAMESE_ACCENTED_CHAR_PATTERN.search(normalized) is not None:
+            continue
+        violations.append(
+            Violation(
+                rule=RULE_VI_MESSAGES_ACCENTED,
+                severity=SEVERITY_ERROR,
+                file=relative,
+                line=index,
+                reason="Vietnamese message must contain accented Vietnamese characters.",
+                snippet=raw.strip(),
+            )
+        )
+    return violations
+
+
+def check_error_message_keys_in_bundles(read_text: Callable[[str], str | None]) -> list[Violation]:
+    key_text = read_text(ERROR_MESSAGE_KEYS_FILE)
+    if key_text is None:
+        return [
+            Violation(
+                rule=RULE_MESSAGE_KEYS_BUNDLE,
+                severity=SEVERITY_ERROR,
+                file=ERROR_MESSAGE_KEYS_FILE,
+                line=1,
+                reason="Missing ErrorMessageKeys.java for backend i18n contract.",
+                snippet="ErrorMessageKeys.java",
+            )
+        ]
+    key_lines = key_text.splitlines()
+    defined_keys: list[tuple[int, str]] = []
+    for index, raw in enumerate(key_lines, start=1):
+        match = MESSAGE_KEY_CONSTANT_PATTERN.search(raw)
+        if match is None:
+            continue
+        defined_keys.append((index, match.group(1)))
+
+    bundle_entries: dict[str, set[str]] = {}
+    for relative_path in MESSAGE_BUNDLE_FILES:
+        bundle_text = read_text(relative_path)
+        if bundle_text is None:
+            bundle_entries[relative_path] = set()
+            continue
+        bundle_entries[relative_path] = _load_message_bundle_keys(bundle_text)
+
+    violations: list[Violation] = []
+    key_relative = ERROR_MESSAGE_KEYS_FILE
+    for line_number, key in defined_keys:
+        for relative_path in MESSAGE_BUNDLE_FILES:
+            if key in bundle_entries[relative_path]:
+                continue
+            violations.append(
+                Violation(
+                    rule=RULE_MESSAGE_KEYS_BUNDLE,
+                    severity=SEVERITY_ERROR,
+                    file=key_relative,
+                    line=line_number,
+                    reason=f'Message key "{key}" must exist in {relative_path}.',
+                    snippet=key,
+                )
+            )
+    return violations
+
+
+def _find_exception_literal(line: str) -> str | None:
+    for pattern in (
+        THROW_NEW_EXCEPTION_LITERAL_PATTERN,
+        RESPONSE_STATUS_EXCEPTION_LITERAL_PATTERN,
+        MESSAGE_SOURCE_LITERAL_PATTERN,
+    ):
+        match = pattern.search(line)
+        if match is None:
+            continue
+        return match.group(1).strip()
+    return None
+
+
+def _looks_like_message_key(value: str) -> bool:
+    return MESSAGE_KEY_VALUE_PATTERN.fullmatch(value) is not None
+
+
+def _has_comment_marker_above(lines: list[str], start_line: int, marker: str, max_lookback: int) -> bool:
+    start_index = start_line - 2
+    end_index = max(-1, start_index - max_lookback)
+    for index in range(start_index, end_index, -1):
+        raw = lines[index].strip()
+        if raw == "":
+            continue
+        if raw.startswith("//") and marker in raw:
+            return True
+        if raw.startswith("//"):
+            continue
+        return False
+    return False
+
+
+def _load_message_bundle_keys(text: str) -> set[str]:
+    keys: set[str] = set()
+    for raw in text.splitlines():
+        stripped = raw.strip()
+        if stripped == "" or stripped.startswith("#"):
+            continue
+        if "=" not in stripped:
+            continue
+        key, _ = stripped.split("=", 1)
+        keys.add(key.strip())
+    return keys
+
+
+def build_rules() -> list[Rule]:
+    return [
+        DtoValidationMessageConstantRule(),
+        ExceptionMessageI18nRule(),
+    ]
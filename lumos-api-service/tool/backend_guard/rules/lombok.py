@@ -0,0 +1,134 @@
+"""
+Lombok rules for Spring beans, entities and DTOs.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+from ..core import (
+    TAG_DTO_LAYER,
+    TAG_ENTITY,
+    TAG_SPRING_BEAN,
+    FileContext,
+    ProjectContext,
+    Rule,
+    TagFilter,
+    Violation,
+)
+from ..reporting import SEVERITY_ERROR, SEVERITY_WARNING
+from . import RULE_LOMBOK_BUILDER_PREFERRED, RULE_LOMBOK_ENTITY_GETTER_SETTER, RULE_LOMBOK_REQUIRED_ARGS_CONSTRUCTOR
+from .support import detect_primary_class_name
+
+
+REQUIRED_ARGS_CONSTRUCTOR_PATTERN = re.compile(r"@\s*RequiredArgsConstructor\b")
+# In the declaration patterns the type either ends on a non-blank or, when the
+# gap before the name is all blanks, is a single space inside it. Either way the
+# blanks around the type have only one quantifier that can take them.
+FINAL_FIELD_PATTERN = re.compile(r"^\s*private\s+final(?:\s+[\w<>,?](?:[\w<>, ?]*[\w<>,?])?\s+|\s[^\S ]* \s+)\w+\s*;")
+CONSTRUCTOR_PATTERN = re.compile(r"^\s*public\s+([A-Z]\w*)\s*\(")
+LOMBOK_GETTER_OR_SETTER_PATTERN = re.compile(r"@\s*(Getter|Setter)\b")
+MANUAL_GETTER_OR_SETTER_PATTERN = re.compile(
+    r"^\s*public(?:\s+[\w<>,?\[\]](?:[\w<>, ?\[\]]*[\w<>,?\[\]])?\s+|\s[^\S ]* \s+)(get|set|is)[A-Z]\w*\s*\("
+)
+LOMBOK_BUILDER_PATTERN = re.compile(r"@\s*Builder\b")
+RECORD_PATTERN = re.compile(r"\brecord\s+[A-Z]\w*\s*\(")
+PRIVATE_FIELD_PATTERN = re.compile(r"^\s*private(?:\s+[\w<>,?\[\]](?:[\w<>, ?\[\]]*[\w<>,?\[\]])?\s+|\s[^\S ]* \s+)\w+\s*;")
+
+
+class LombokRequiredArgsConstructorRule(Rule):
+    name = RULE_LOMBOK_REQUIRED_ARGS_CONSTRUCTOR
+    tag_filter = TagFilter(all_of=(TAG_SPRING_BEAN,))
+    required_literals = ("Service", "Component", "Controller", "Configuration")
+
+    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
+        final_fields = [raw for raw in file_ctx.lines if FINAL_FIELD_PATTERN.search(raw) is not None]
+        if len(final_fields) == 0:
+            return []
+        if REQUIRED_ARGS_CONSTRUCTOR_PATTERN.search(file_ctx.text) is not None:
+            return []
+        class_name = detect_primary_class_name(file_ctx.lines)
+        has_constructor = False
+        if class_name != "":
+            constructor_regex = re.compile(rf"^\s*public\s+{re.escape(class_name)}\s*\(")
+            has_constructor = any(constructor_regex.search(raw) is not None for raw in file_ctx.lines)
+        if has_constructor:
+            return [
+                Violation(
+                    rule=self.name,
+                    severity=SEVERITY_WARNING,
+                    file=file_ctx.rel_path,
+                    line=1,
+                    reason="Spring bean uses constructor injection; prefer @RequiredArgsConstructor to reduce boilerplate.",
+                    snippet=file_ctx.rel_path,
+                )
+            ]
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_ERROR,
+                file=file_ctx.rel_path,
+                line=1,
+                reason="Spring bean with final dependencies should use @RequiredArgsConstructor.",
+                snippet=file_ctx.rel_path,
+            )
+        ]
+
+
+class LombokEntityGetterSetterRule(Rule):
+    name = RULE_LOMBOK_ENTITY_GETTER_SETTER
+    tag_filter = TagFilter(all_of=(TAG_ENTITY,))
+    required_literals = ("Entity",)
+
+    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
+        if LOMBOK_GETTER_OR_SETTER_PATTERN.search(file_ctx.text) is not None:
+            return []
+        manual_methods = [raw for raw in file_ctx.lines if MANUAL_GETTER_OR_SETTER_PATTERN.search(raw) is not None]
+        if len(manual_methods) < 4:
+            return []
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_WARNING,
+                file=file_ctx.rel_path,
+                line=1,
+                reason="Entity has many manual getters/setters; consider Lombok @Getter/@Setter.",
+                snippet=file_ctx.rel_path,
+            )
+        ]
+
+
+class LombokBuilderPreferredRule(Rule):
+    name = RULE_LOMBOK_BUILDER_PREFERRED
+    tag_filter = TagFilter(all_of=(TAG_DTO_LAYER,))
+    required_literals = ("class",)
+
+    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
+        if RECORD_PATTERN.search(file_ctx.text) is not None:
+            return []
+        if " class " not in f" {file_ctx.text} ":
+            return []
+        if LOMBOK_BUILDER_PATTERN.search(file_ctx.text) is not None:
+            return []
+        field_count = sum(1 for raw in file_ctx.lines if PRIVATE_FIELD_PATTERN.search(raw) is not None)
+        if field_count < 3:
+            return []
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_WARNING,
+                file=file_ctx.rel_path,
+                line=1,
+                reason="DTO class has multiple fields; prefer Lombok @Builder for object construction.",
+                snippet=file_ctx.rel_path,
+            )
+        ]
+
+
+def build_rules() -> list[Rule]:
+    return [
+        LombokRequiredArgsConstructorRule(),
+        LombokEntityGetterSetterRule(),
+        LombokBuilderPreferredRule(),
+    ]
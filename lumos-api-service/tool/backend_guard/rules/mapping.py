@@ -0,0 +1,135 @@
+"""
+MapStruct, DTO validation and DTO audit field rules.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+from ..core import (
+    TAG_CONTROLLER_LAYER,
+    TAG_DTO_LAYER,
+    TAG_DTO_REQUEST_LAYER,
+    TAG_MAIN_SOURCE,
+    TAG_SERVICE_LAYER,
+    FileContext,
+    LineCheck,
+    LineRule,
+    LineScan,
+    ProjectContext,
+    ProjectIndex,
+    ProjectRule,
+    Rule,
+    TagFilter,
+    Violation,
+)
+from ..reporting import SEVERITY_ERROR, SEVERITY_WARNING
+from . import (
+    RULE_AUDIT_DTO_SEPARATE_CLASS,
+    RULE_DTO_VALIDATION_ANNOTATION,
+    RULE_MAPSTRUCT_MAPPER_REQUIRED,
+    RULE_MAPSTRUCT_NO_MANUAL_MAPPING,
+)
+from .support import find_audit_field_lines
+
+
+MANUAL_MAPPING_NEW_PATTERN = re.compile(r"\bnew\s+\w+(Entity|Dto|DTO|Response|Request)\s*\(")
+DTO_VALIDATION_ANNOTATION_PATTERN = re.compile(
+    r"@\s*(Valid|NotNull|NotBlank|NotEmpty|Size|Pattern|Min|Max|Positive|PositiveOrZero|Negative|NegativeOrZero|Email|Past|PastOrPresent|Future|FutureOrPresent|AssertTrue|AssertFalse)\b"
+)
+
+
+class MapStructRequiredRule(ProjectRule):
+    name = RULE_MAPSTRUCT_MAPPER_REQUIRED
+
+    def check_project(self, index: ProjectIndex) -> Iterable[Violation]:
+        if not index.has_entity_in_entity_package or not index.has_dto:
+            return []
+        if index.has_mapstruct_mapper:
+            return []
+
+        target_file = index.mapper_files[0] if len(index.mapper_files) > 0 else index.anchor
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_ERROR,
+                file=target_file,
+                line=1,
+                reason="Project has Entity + DTO but missing MapStruct mapper interface (@Mapper).",
+                snippet='Define mapper under "/mapper/" using @Mapper.',
+            )
+        ]
+
+
+class MapStructNoManualMappingRule(LineRule):
+    name = RULE_MAPSTRUCT_NO_MANUAL_MAPPING
+    tag_filter = TagFilter(all_of=(TAG_MAIN_SOURCE,), any_of=(TAG_SERVICE_LAYER, TAG_CONTROLLER_LAYER))
+
+    def line_checks(self) -> list[LineCheck]:
+        return [LineCheck(self._check_line, literals=("new",))]
+
+    def _check_line(self, scan: LineScan) -> list[Violation] | None:
+        if MANUAL_MAPPING_NEW_PATTERN.search(scan.raw) is None:
+            return None
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_WARNING,
+                file=scan.rel_path,
+                line=scan.index,
+                reason="Manual DTO/Entity construction detected; prefer MapStruct mapper.",
+                snippet=scan.stripped,
+            )
+        ]
+
+
+class DtoValidationAnnotationRule(Rule):
+    name = RULE_DTO_VALIDATION_ANNOTATION
+    tag_filter = TagFilter(all_of=(TAG_DTO_REQUEST_LAYER,))
+
+    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
+        if DTO_VALIDATION_ANNOTATION_PATTERN.search(file_ctx.text) is not None:
+            return []
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_ERROR,
+                file=file_ctx.rel_path,
+                line=1,
+                reason="Request DTO must define validation annotations (jakarta.validation.*).",
+                snippet=file_ctx.rel_path,
+            )
+        ]
+
+
+class AuditDtoSeparateClassRule(Rule):
+    name = RULE_AUDIT_DTO_SEPARATE_CLASS
+    tag_filter = TagFilter(all_of=(TAG_DTO_LAYER,))
+    required_literals = ("createdAt", "updatedAt", "deleted", "isDeleted")
+
+    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
+        if "Audit" in file_ctx.rel_path:
+            return []
+        audit_field_lines = find_audit_field_lines(file_ctx)
+        if len(audit_field_lines) == 0:
+            return []
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_ERROR,
+                file=file_ctx.rel_path,
+                line=audit_field_lines[0][0],
+                reason="DTO must use separate audit model instead of direct audit fields.",
+                snippet=audit_field_lines[0][1].strip(),
+            )
+        ]
+
+
+def build_rules() -> list[Rule]:
+    return [
+        MapStructRequiredRule(),
+        MapStructNoManualMappingRule(),
+        DtoValidationAnnotationRule(),
+        AuditDtoSeparateClassRule(),
+    ]
@@ -0,0 +1,417 @@
+"""
+Entity, repository and soft-delete rules.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+from ..core import (
+    INTERFACE_PATTERN,
+    MAPPED_SUPERCLASS_PATTERN,
+    TAG_ENTITY,
+    TAG_REPOSITORY_LAYER,
+    TAG_REPOSITORY_PROJECTION_LAYER,
+    TAG_SERVICE_LAYER,
+    FileContext,
+    LineCheck,
+    LineRule,
+    LineScan,
+    ProjectContext,
+    ProjectIndex,
+    ProjectRule,
+    Rule,
+    TagFilter,
+    Violation,
+)
+from ..reporting import SEVERITY_ERROR, SEVERITY_WARNING
+from . import (
+    RULE_AUDIT_ENTITY_SEPARATE_CLASS,
+    RULE_ENTITY_AUDIT_LIFECYCLE,
+    RULE_ENTITY_ENUM_STRING,
+    RULE_ENTITY_HAS_ID,
+    RULE_ENTITY_MANY_TO_ONE_JOIN,
+    RULE_ENTITY_NO_DATA,
+    RULE_ENTITY_NO_LAYER_DEP,
+    RULE_ENTITY_OPTIMISTIC_LOCK,
+    RULE_ENTITY_RELATION_FETCH,
+    RULE_REPOSITORY_EXTENDS_JPA,
+    RULE_SHARED_MAPPED_SUPERCLASS,
+    RULE_SOFT_DELETE_FIND_FILTER,
+    RULE_SOFT_DELETE_NO_HARD_DELETE,
+)
+from .support import (
+    find_audit_field_lines,
+    first_line_regex,
+    line_for_offset,
+    next_non_blank_lines,
+    previous_non_blank_lines,
+)
+
+
+RELATION_PATTERN = re.compile(r"@\s*(OneToMany|ManyToOne|ManyToMany|OneToOne)\s*(\((.*?)\))?")
+EXTENDS_JPA_PATTERN = re.compile(r"\bextends\s+JpaRepository<")
+# The optional group lets the blank run span lines, as `\s+.*` did, without
+# letting `\s` and `.` compete for the same blanks.
+IMPORT_SERVICE_OR_REPO_PATTERN = re.compile(r"^import\s(?:\s*\n)?.*\.(service|repository)\.", re.MULTILINE)
+ID_ANNOTATION_PATTERN = re.compile(r"@\s*Id\b")
+LOMBOK_DATA_PATTERN = re.compile(r"@\s*Data\b")
+PRE_PERSIST_PATTERN = re.compile(r"@\s*PrePersist\b")
+PRE_UPDATE_PATTERN = re.compile(r"@\s*PreUpdate\b")
+CREATED_DATE_PATTERN = re.compile(r"@\s*CreatedDate\b")
+LAST_MODIFIED_DATE_PATTERN = re.compile(r"@\s*LastModifiedDate\b")
+VERSION_PATTERN = re.compile(r"@\s*Version\b")
+MANY_TO_ONE_PATTERN = re.compile(r"@\s*ManyToOne\b")
+ENUMERATED_PATTERN = re.compile(r"@\s*Enumerated\b")
+ENUMERATED_STRING_PATTERN = re.compile(r"@\s*Enumerated\s*\(\s*EnumType\.STRING\s*\)")
+HARD_DELETE_CALL_PATTERN = re.compile(r"\.\s*delete(ById|All|AllById)?\s*\(")
+# Line patterns are written so that no two quantifiers can trade the same
+# characters; a failed match then backtracks in linear time. `[\w<>?,\s]+\s+find`
+# for example is cubic on a long run of blanks. --audit-regex checks this.
+FIND_METHOD_PATTERN = re.compile(r"^(?:\s*(?:Page|List|Optional)<.*>\s+|[\w<>?,\s]+\s)find\w*\s*\(")
+CLASS_DECLARATION_PATTERN = re.compile(r"\bclass\s+([A-Z]\w*)\s*(?:extends\s+([A-Z]\w*))?")
+
+
+class RepositoryJpaRule(Rule):
+    name = RULE_REPOSITORY_EXTENDS_JPA
+    tag_filter = TagFilter(all_of=(TAG_REPOSITORY_LAYER,), none_of=(TAG_REPOSITORY_PROJECTION_LAYER,))
+    required_literals = ("interface",)
+
+    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
+        if INTERFACE_PATTERN.search(file_ctx.text) is None:
+            return []
+        if EXTENDS_JPA_PATTERN.search(file_ctx.text) is not None:
+            return []
+        line = first_line_regex(file_ctx.lines, r"\binterface\s+\w+")
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_ERROR,
+                file=file_ctx.rel_path,
+                line=line if line > 0 else 1,
+                reason="Repository interface should extend JpaRepository.",
+                snippet=file_ctx.lines[line - 1].strip() if line > 0 else file_ctx.rel_path,
+            )
+        ]
+
+
+class EntityNoDataRule(Rule):
+    name = RULE_ENTITY_NO_DATA
+    tag_filter = TagFilter(all_of=(TAG_ENTITY,))
+    required_literals = ("Entity",)
+
+    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
+        line = first_line_regex(file_ctx.lines, r"@\s*Data\b")
+        if line <= 0:
+            return []
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_ERROR,
+                file=file_ctx.rel_path,
+                line=line,
+                reason="@Data is forbidden on JPA Entity.",
+                snippet=file_ctx.lines[line - 1].strip(),
+            )
+        ]
+
+
+class EntityHasIdRule(Rule):
+    name = RULE_ENTITY_HAS_ID
+    tag_filter = TagFilter(all_of=(TAG_ENTITY,))
+    required_literals = ("Entity",)
+
+    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
+        if ID_ANNOTATION_PATTERN.search(file_ctx.text) is not None:
+            return []
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_ERROR,
+                file=file_ctx.rel_path,
+                line=1,
+                reason="Entity must declare @Id field.",
+                snippet=file_ctx.rel_path,
+            )
+        ]
+
+
+class EntityLayerDependencyRule(Rule):
+    name = RULE_ENTITY_NO_LAYER_DEP
+    tag_filter = TagFilter(all_of=(TAG_ENTITY,))
+    required_literals = ("Entity",)
+
+    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
+        match = IMPORT_SERVICE_OR_REPO_PATTERN.search(file_ctx.text)
+        if match is None:
+            return []
+        line = line_for_offset(file_ctx, match.start())
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_ERROR,
+                file=file_ctx.rel_path,
+                line=line,
+                reason="Entity must not depend on service/repository layer.",
+                snippet=file_ctx.lines[line - 1].strip(),
+            )
+        ]
+
+
+class EntityRelationFetchRule(LineRule):
+    name = RULE_ENTITY_RELATION_FETCH
+    tag_filter = TagFilter(all_of=(TAG_ENTITY,))
+
+    def line_checks(self) -> list[LineCheck]:
+        return [LineCheck(self._check_line, literals=("OneToMany", "ManyToOne", "ManyToMany", "OneToOne"))]
+
+    def _check_line(self, scan: LineScan) -> list[Violation] | None:
+        relation_match = RELATION_PATTERN.search(scan.raw)
+        if relation_match is None:
+            return None
+        annotation_args = relation_match.group(3) or ""
+        if "fetch = FetchType.LAZY" in annotation_args:
+            return []
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_WARNING,
+                file=scan.rel_path,
+                line=scan.index,
+                reason=f"{relation_match.group(1)} should explicitly use fetch = FetchType.LAZY.",
+                snippet=scan.stripped,
+            )
+        ]
+
+
+class EntityManyToOneJoinColumnRule(LineRule):
+    name = RULE_ENTITY_MANY_TO_ONE_JOIN
+    tag_filter = TagFilter(all_of=(TAG_ENTITY,))
+
+    def line_checks(self) -> list[LineCheck]:
+        return [LineCheck(self._check_line, literals=("ManyToOne",))]
+
+    def _check_line(self, scan: LineScan) -> list[Violation] | None:
+        if MANY_TO_ONE_PATTERN.search(scan.raw) is None:
+            return None
+        window = next_non_blank_lines(scan.file_ctx, scan.index, 5)
+        has_join = any("@JoinColumn" in text for _, text in window)
+        if has_join:
+            return []
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_ERROR,
+                file=scan.rel_path,
+                line=scan.index,
+                reason="@ManyToOne should define @JoinColumn explicitly.",
+                snippet=scan.stripped,
+            )
+        ]
+
+
+class EntityAuditLifecycleRule(Rule):
+    name = RULE_ENTITY_AUDIT_LIFECYCLE
+    tag_filter = TagFilter(all_of=(TAG_ENTITY,))
+    required_literals = ("createdAt", "updatedAt")
+
+    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
+        has_created_or_updated = "createdAt" in file_ctx.text or "updatedAt" in file_ctx.text
+        if not has_created_or_updated:
+            return []
+        has_pre_persist = PRE_PERSIST_PATTERN.search(file_ctx.text) is not None
+        has_pre_update = PRE_UPDATE_PATTERN.search(file_ctx.text) is not None
+        has_created_date = CREATED_DATE_PATTERN.search(file_ctx.text) is not None
+        has_last_modified = LAST_MODIFIED_DATE_PATTERN.search(file_ctx.text) is not None
+        if has_pre_persist and has_pre_update:
+            return []
+        if has_created_date and has_last_modified:
+            return []
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_WARNING,
+                file=file_ctx.rel_path,
+                line=1,
+                reason="Entity has createdAt/updatedAt but missing lifecycle/auditing setup.",
+                snippet=file_ctx.rel_path,
+            )
+        ]
+
+
+class SharedFieldsMappedSuperclassRule(ProjectRule):
+    name = RULE_SHARED_MAPPED_SUPERCLASS
+
+    def check_project(self, index: ProjectIndex) -> Iterable[Violation]:
+        if len(index.entity_files) < 2:
+            return []
+        if index.has_mapped_superclass:
+            return []
+        common_entities = index.audited_entity_files
+        if len(common_entities) < 2:
+            return []
+        targets = ", ".join(common_entities[:3])
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_WARNING,
+                file=common_entities[0],
+                line=1,
+                reason="Multiple entities share audit fields; consider @MappedSuperclass base entity.",
+                snippet=targets,
+            )
+        ]
+
+
+class EntityVersionRule(Rule):
+    name = RULE_ENTITY_OPTIMISTIC_LOCK
+    tag_filter = TagFilter(all_of=(TAG_ENTITY,))
+    required_literals = ("Entity",)
+
+    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
+        if VERSION_PATTERN.search(file_ctx.text) is not None:
+            return []
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_WARNING,
+                file=file_ctx.rel_path,
+                line=1,
+                reason="Entity should define @Version for optimistic locking in concurrent updates.",
+                snippet=file_ctx.rel_path,
+            )
+        ]
+
+
+class EntityEnumeratedStringRule(LineRule):
+    name = RULE_ENTITY_ENUM_STRING
+    tag_filter = TagFilter(all_of=(TAG_ENTITY,))
+
+    def line_checks(self) -> list[LineCheck]:
+        return [LineCheck(self._check_line, literals=("Enumerated",))]
+
+    def _check_line(self, scan: LineScan) -> list[Violation] | None:
+        if ENUMERATED_PATTERN.search(scan.raw) is None:
+            return None
+        if ENUMERATED_STRING_PATTERN.search(scan.raw) is not None:
+            return []
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_ERROR,
+                file=scan.rel_path,
+                line=scan.index,
+                reason="@Enumerated must use EnumType.STRING.",
+                snippet=scan.stripped,
+            )
+        ]
+
+
+class SoftDeleteNoHardDeleteRule(LineRule):
+    name = RULE_SOFT_DELETE_NO_HARD_DELETE
+    tag_filter = TagFilter(all_of=(TAG_SERVICE_LAYER,))
+
+    def line_checks(self) -> list[LineCheck]:
+        return [LineCheck(self._check_line, literals=("delete",))]
+
+    def _check_line(self, scan: LineScan) -> list[Violation] | None:
+        if HARD_DELETE_CALL_PATTERN.search(scan.raw) is None:
+            return None
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_ERROR,
+                file=scan.rel_path,
+                line=scan.index,
+                reason="Hard delete call detected. Use soft delete strategy.",
+                snippet=scan.stripped,
+            )
+        ]
+
+
+class SoftDeleteFindFilterRule(LineRule):
+    name = RULE_SOFT_DELETE_FIND_FILTER
+    tag_filter = TagFilter(all_of=(TAG_REPOSITORY_LAYER,))
+
+    def line_checks(self) -> list[LineCheck]:
+        return [LineCheck(self._check_line, literals=("find",))]
+
+    def _check_line(self, scan: LineScan) -> list[Violation] | None:
+        if FIND_METHOD_PATTERN.search(scan.raw) is None:
+            return None
+        stripped = scan.stripped
+        if "Deleted" in stripped:
+            return []
+        prev_window = previous_non_blank_lines(scan.file_ctx, scan.index, 40)
+        has_query_annotation = any("@Query" in text for _, text in prev_window)
+        query_context = " ".join(text for _, text in prev_window)
+        has_query_with_deleted = has_query_annotation and "deleted" in query_context.lower()
+        if has_query_with_deleted:
+            return []
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_WARNING,
+                file=scan.rel_path,
+                line=scan.index,
+                reason='Repository find-method should include deleted filter (e.g. "...AndDeletedFalse").',
+                snippet=stripped,
+            )
+        ]
+
+
+class AuditEntitySeparateClassRule(Rule):
+    name = RULE_AUDIT_ENTITY_SEPARATE_CLASS
+    tag_filter = TagFilter(all_of=(TAG_ENTITY,))
+    required_literals = ("Entity",)
+
+    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
+        if MAPPED_SUPERCLASS_PATTERN.search(file_ctx.text) is not None:
+            return []
+        declaration = _find_class_declaration(file_ctx.lines)
+        extends_name = declaration[1] if declaration is not None else ""
+        if "Audit" in extends_name:
+            return []
+        audit_field_lines = find_audit_field_lines(file_ctx)
+        if len(audit_field_lines) == 0:
+            return []
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_ERROR,
+                file=file_ctx.rel_path,
+                line=audit_field_lines[0][0],
+                reason="Entity must place audit fields in a separate base class (MappedSuperclass).",
+                snippet=audit_field_lines[0][1].strip(),
+            )
+        ]
+
+
+def _find_class_declaration(lines: list[str]) -> tuple[str, str] | None:
+    for raw in lines:
+        match = CLASS_DECLARATION_PATTERN.search(raw)
+        if match is None:
+            continue
+        class_name = match.group(1) or ""
+        extends_name = match.group(2) or ""
+        return (class_name, extends_name)
+    return None
+
+
+def build_rules() -> list[Rule]:
+    return [
+        RepositoryJpaRule(),
+        EntityNoDataRule(),
+        EntityHasIdRule(),
+        EntityLayerDependencyRule(),
+        EntityRelationFetchRule(),
+        EntityManyToOneJoinColumnRule(),
+        EntityAuditLifecycleRule(),
+        SharedFieldsMappedSuperclassRule(),
+        EntityVersionRule(),
+        EntityEnumeratedStringRule(),
+        SoftDeleteNoHardDeleteRule(),
+        SoftDeleteFindFilterRule(),
+        AuditEntitySeparateClassRule(),
+    ]
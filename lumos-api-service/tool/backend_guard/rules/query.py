@@ -0,0 +1,121 @@
+"""
+Rules for @Query annotations on repositories.
+"""
+
+from __future__ import annotations
+
+import re
+
+from ..core import (
+    TAG_REPOSITORY_LAYER,
+    LineCheck,
+    LineRule,
+    LineScan,
+    Rule,
+    TagFilter,
+    Violation,
+)
+from ..reporting import SEVERITY_ERROR
+from . import RULE_QUERY_KEYWORD_UPPERCASE, RULE_QUERY_NATIVE_SQL_ONLY
+from .support import collect_annotation_block
+
+
+QUERY_ANNOTATION_PATTERN = re.compile(r"^\s*@\s*Query\b")
+JPQL_ENTITY_FROM_PATTERN = re.compile(r"\bfrom\s+[A-Z]\w+\b")
+LOWERCASE_SQL_KEYWORD_PATTERNS = [
+    re.compile(r"\bselect\b"),
+    re.compile(r"\bfrom\b"),
+    re.compile(r"\bwhere\b"),
+    re.compile(r"\bjoin\b"),
+    re.compile(r"\bleft\b"),
+    re.compile(r"\bright\b"),
+    re.compile(r"\binner\b"),
+    re.compile(r"\bouter\b"),
+    re.compile(r"\bon\b"),
+    re.compile(r"\band\b"),
+    re.compile(r"\bor\b"),
+    re.compile(r"\bunion\b"),
+    re.compile(r"\ball\b"),
+    re.compile(r"\bwith\b"),
+    re.compile(r"\brecursive\b"),
+    re.compile(r"\border\s+by\b"),
+    re.compile(r"\bgroup\s+by\b"),
+    re.compile(r"\bupdate\b"),
+    re.compile(r"\bset\b"),
+    re.compile(r"\bin\b"),
+    re.compile(r"\bis\b"),
+    re.compile(r"\bnull\b"),
+    re.compile(r"\blower\s*\("),
+    re.compile(r"\bupper\s*\("),
+    re.compile(r"\bcount\s*\("),
+]
+
+
+class QueryMustUseNativeSqlRule(LineRule):
+    name = RULE_QUERY_NATIVE_SQL_ONLY
+    tag_filter = TagFilter(all_of=(TAG_REPOSITORY_LAYER,))
+
+    def line_checks(self) -> list[LineCheck]:
+        return [LineCheck(self._check_line, literals=("Query",))]
+
+    def _check_line(self, scan: LineScan) -> list[Violation] | None:
+        if QUERY_ANNOTATION_PATTERN.search(scan.raw) is None:
+            return None
+        block = collect_annotation_block(scan.file_ctx, scan.index, 20)
+        if "nativeQuery = true" not in block:
+            return [
+                Violation(
+                    rule=self.name,
+                    severity=SEVERITY_ERROR,
+                    file=scan.rel_path,
+                    line=scan.index,
+                    reason="@Query must use native SQL: set nativeQuery = true.",
+                    snippet=scan.stripped,
+                )
+            ]
+        if JPQL_ENTITY_FROM_PATTERN.search(block) is None:
+            return []
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_ERROR,
+                file=scan.rel_path,
+                line=scan.index,
+                reason="@Query must reference real table/column names, not JPA entity names.",
+                snippet=scan.stripped,
+            )
+        ]
+
+
+class QueryKeywordUppercaseRule(LineRule):
+    name = RULE_QUERY_KEYWORD_UPPERCASE
+    tag_filter = TagFilter(all_of=(TAG_REPOSITORY_LAYER,))
+
+    def line_checks(self) -> list[LineCheck]:
+        return [LineCheck(self._check_line, literals=("Query",))]
+
+    def _check_line(self, scan: LineScan) -> list[Violation] | None:
+        if QUERY_ANNOTATION_PATTERN.search(scan.raw) is None:
+            return None
+        block = collect_annotation_block(scan.file_ctx, scan.index, 40)
+        for keyword_pattern in LOWERCASE_SQL_KEYWORD_PATTERNS:
+            if keyword_pattern.search(block) is None:
+                continue
+            return [
+                Violation(
+                    rule=self.name,
+                    severity=SEVERITY_ERROR,
+                    file=scan.rel_path,
+                    line=scan.index,
+                    reason="SQL keywords in @Query must be uppercase.",
+                    snippet=scan.stripped,
+                )
+            ]
+        return []
+
+
+def build_rules() -> list[Rule]:
+    return [
+        QueryMustUseNativeSqlRule(),
+        QueryKeywordUppercaseRule(),
+    ]
@@ -0,0 +1,179 @@
+"""
+Rules that route string checks through Apache Commons Lang3.
+"""
+
+from __future__ import annotations
+
+import re
+
+from ..core import (
+    LineCheck,
+    LineRule,
+    LineScan,
+    Rule,
+    Violation,
+)
+from ..reporting import SEVERITY_ERROR
+from . import RULE_NO_DIRECT_BLANK_CHECK, RULE_NO_DIRECT_STRING_PREDICATE, RULE_NO_DIRECT_TRIM
+
+
+DIRECT_TRIM_PATTERN = re.compile(r"\.\s*trim\s*\(")
+DIRECT_IS_BLANK_PATTERN = re.compile(r"\.\s*isBlank\s*\(")
+# Anchored at the first "== null" and the first "||" after it; later ones can only match less.
+NULL_OR_BLANK_PATTERN = re.compile(r"^(?:(?!==\s*null).)*==\s*null(?:[^|\n]|\|(?!\|))*\|\|.*\.isBlank\s*\(")
+DIRECT_STARTS_WITH_PATTERN = re.compile(r"\.\s*startsWith\s*\(")
+DIRECT_ENDS_WITH_PATTERN = re.compile(r"\.\s*endsWith\s*\(")
+DIRECT_CONTAINS_PATTERN = re.compile(r"\.\s*contains\s*\(")
+DIRECT_EQUALS_PATTERN = re.compile(r"\.\s*equals\s*\(")
+DIRECT_EQUALS_IGNORE_CASE_PATTERN = re.compile(r"\.\s*equalsIgnoreCase\s*\(")
+DEPRECATED_STRINGUTILS_EQUALS_PATTERN = re.compile(r"StringUtils\.equals\s*\(")
+DEPRECATED_STRINGUTILS_EQUALS_IGNORE_CASE_PATTERN = re.compile(r"StringUtils\.equalsIgnoreCase\s*\(")
+DEPRECATED_STRINGUTILS_COMPARE_IGNORE_CASE_PATTERN = re.compile(r"StringUtils\.compareIgnoreCase\s*\(")
+NULL_OR_EMPTY_SAME_VAR_PATTERN = re.compile(r"\b([A-Za-z_][A-Za-z0-9_]*)\s*==\s*null\s*\|\|\s*\1\s*\.\s*isEmpty\s*\(")
+NOT_NULL_AND_EMPTY_SAME_VAR_PATTERN = re.compile(r"\b([A-Za-z_][A-Za-z0-9_]*)\s*!=\s*null\s*&&\s*\1\s*\.\s*isEmpty\s*\(")
+NOT_NULL_AND_NOT_EMPTY_SAME_VAR_PATTERN = re.compile(
+    r"\b([A-Za-z_][A-Za-z0-9_]*)\s*!=\s*null\s*&&\s*!\s*\1\s*\.\s*isEmpty\s*\("
+)
+STRING_PREDICATE_CHECKS = (
+    (NULL_OR_EMPTY_SAME_VAR_PATTERN, "Direct null/empty check is forbidden. Use StringUtils.isEmpty/isNotEmpty."),
+    (NOT_NULL_AND_EMPTY_SAME_VAR_PATTERN, "Direct null/empty check is forbidden. Use StringUtils.isEmpty/isNotEmpty."),
+    (NOT_NULL_AND_NOT_EMPTY_SAME_VAR_PATTERN, "Direct null/empty check is forbidden. Use StringUtils.isEmpty/isNotEmpty."),
+    (DIRECT_STARTS_WITH_PATTERN, "Direct .startsWith() is forbidden. Use Apache Commons Lang3 Strings.CS/CI.startsWith."),
+    (DIRECT_ENDS_WITH_PATTERN, "Direct .endsWith() is forbidden. Use Apache Commons Lang3 Strings.CS/CI.endsWith."),
+    (DIRECT_CONTAINS_PATTERN, "Direct .contains() is forbidden. Use StringUtils.contains."),
+    (
+        DEPRECATED_STRINGUTILS_EQUALS_PATTERN,
+        "Deprecated StringUtils.equals() is forbidden. Use Apache Commons Lang3 Strings.CS.equals().",
+    ),
+    (
+        DEPRECATED_STRINGUTILS_EQUALS_IGNORE_CASE_PATTERN,
+        "Deprecated StringUtils.equalsIgnoreCase() is forbidden. Use Apache Commons Lang3 Strings.CI.equals().",
+    ),
+    (
+        DEPRECATED_STRINGUTILS_COMPARE_IGNORE_CASE_PATTERN,
+        "Deprecated StringUtils.compareIgnoreCase() is forbidden. "
+        "Use Apache Commons Lang3 Strings.CI.equals()/Strings.CI.compare().",
+    ),
+    (
+        DIRECT_EQUALS_PATTERN,
+        "Direct .equals() is forbidden for String comparison. Use Apache Commons Lang3 Strings.CS.equals().",
+    ),
+    (DIRECT_EQUALS_IGNORE_CASE_PATTERN, "Direct .equalsIgnoreCase() is forbidden. Use Apache Commons Lang3 Strings.CI.equals()."),
+)
+
+
+class NoDirectTrimRule(LineRule):
+    name = RULE_NO_DIRECT_TRIM
+
+    def line_checks(self) -> list[LineCheck]:
+        return [LineCheck(self._check_line, literals=("trim",))]
+
+    def _check_line(self, scan: LineScan) -> list[Violation] | None:
+        line = scan.masked
+        if line == "":
+            return None
+        if "StringUtils.trim(" in line:
+            return None
+        if DIRECT_TRIM_PATTERN.search(line) is None:
+            return None
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_ERROR,
+                file=scan.rel_path,
+                line=scan.index,
+                reason="Direct .trim() is forbidden. Use StringUtils from Apache Commons Lang3.",
+                snippet=scan.stripped,
+            )
+        ]
+
+
+class NoDirectBlankCheckRule(LineRule):
+    name = RULE_NO_DIRECT_BLANK_CHECK
+
+    def line_checks(self) -> list[LineCheck]:
+        return [LineCheck(self._check_line, literals=("isBlank",))]
+
+    def _check_line(self, scan: LineScan) -> list[Violation] | None:
+        line = scan.masked
+        if line == "":
+            return None
+        if "StringUtils.isBlank(" in line or "StringUtils.isNotBlank(" in line:
+            return None
+        if NULL_OR_BLANK_PATTERN.search(line) is not None:
+            return [
+                Violation(
+                    rule=self.name,
+                    severity=SEVERITY_ERROR,
+                    file=scan.rel_path,
+                    line=scan.index,
+                    reason="Direct null/blank check is forbidden. Use StringUtils.isBlank/isNotBlank.",
+                    snippet=scan.stripped,
+                )
+            ]
+        if DIRECT_IS_BLANK_PATTERN.search(line) is None:
+            return None
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_ERROR,
+                file=scan.rel_path,
+                line=scan.index,
+                reason="Direct .isBlank() is forbidden. Use StringUtils.isBlank/isNotBlank.",
+                snippet=scan.stripped,
+            )
+        ]
+
+
+class NoDirectStringPredicateRule(LineRule):
+    name = RULE_NO_DIRECT_STRING_PREDICATE
+
+    def line_checks(self) -> list[LineCheck]:
+        return [
+            LineCheck(
+                self._check_line,
+                literals=("isEmpty", "startsWith", "endsWith", "contains", "equals", "compareIgnoreCase"),
+            )
+        ]
+
+    def _check_line(self, scan: LineScan) -> list[Violation] | None:
+        line = scan.masked
+        if line == "":
+            return None
+
+        has_stringutils_call = (
+            "StringUtils.isEmpty(" in line
+            or "StringUtils.isNotEmpty(" in line
+            or "StringUtils.contains(" in line
+            or "Strings.CS.equals(" in line
+            or "Strings.CI.equals(" in line
+            or "Strings.CS.startsWith(" in line
+            or "Strings.CS.endsWith(" in line
+            or "Strings.CI.startsWith(" in line
+            or "Strings.CI.endsWith(" in line
+        )
+        if has_stringutils_call:
+            return None
+
+        for pattern, reason in STRING_PREDICATE_CHECKS:
+            if pattern.search(line) is None:
+                continue
+            return [
+                Violation(
+                    rule=self.name,
+                    severity=SEVERITY_ERROR,
+                    file=scan.rel_path,
+                    line=scan.index,
+                    reason=reason,
+                    snippet=scan.stripped,
+                )
+            ]
+        return None
+
+
+def build_rules() -> list[Rule]:
+    return [
+        NoDirectTrimRule(),
+        NoDirectBlankCheckRule(),
+        NoDirectStringPredicateRule(),
+    ]
@@ -0,0 +1,151 @@
+"""
+Size, nesting and control-flow rules.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable
+
+from ..core import (
+    TAG_EXCEPTION_LAYER,
+    FileContext,
+    LineCheck,
+    LineRule,
+    LineScan,
+    ProjectContext,
+    Rule,
+    TagFilter,
+    Violation,
+)
+from ..reporting import SEVERITY_ERROR, SEVERITY_WARNING
+from . import RULE_CLASS_MAX_LINES, RULE_EXCEPTION_SERIAL_VERSION_UID, RULE_NESTED_FOR_STREAM, RULE_NO_ELSE
+from .support import FOR_PATTERN, first_line_regex, next_non_blank_lines
+
+
+CLASS_MAX_LINES = 300
+ELSE_PATTERN = re.compile(r"\belse\b")
+EXCEPTION_CLASS_PATTERN = re.compile(r"\bclass\s+([A-Z]\w*Exception)\s+extends\s+[\w.]*Exception\b")
+SERIAL_VERSION_UID_PATTERN = re.compile(
+    r"private\s+static\s+final\s+long\s+serialVersionUID\s*=\s*[-]?\d+L\s*;"
+)
+
+
+class MaxClassLinesRule(Rule):
+    name = RULE_CLASS_MAX_LINES
+
+    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
+        line_count = len(file_ctx.lines)
+        if line_count <= CLASS_MAX_LINES:
+            return []
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_WARNING,
+                file=file_ctx.rel_path,
+                line=1,
+                reason=f"Class file exceeds {CLASS_MAX_LINES} lines (found {line_count}).",
+                snippet=file_ctx.rel_path,
+            )
+        ]
+
+
+class NestedForShouldUseStreamRule(LineRule):
+    name = RULE_NESTED_FOR_STREAM
+
+    def line_checks(self) -> list[LineCheck]:
+        return [LineCheck(self._check_line, leading=("for",))]
+
+    def _check_line(self, scan: LineScan) -> list[Violation] | None:
+        if FOR_PATTERN.search(scan.raw) is None:
+            return None
+        outer_indent = _indent_level(scan.raw)
+        window = next_non_blank_lines(scan.file_ctx, scan.index, 30)
+        for line_no, candidate in window:
+            if line_no <= scan.index:
+                continue
+            if FOR_PATTERN.search(candidate) is None:
+                continue
+            inner_indent = _indent_level(candidate)
+            if inner_indent <= outer_indent:
+                continue
+            return [
+                Violation(
+                    rule=self.name,
+                    severity=SEVERITY_WARNING,
+                    file=scan.rel_path,
+                    line=line_no,
+                    reason="Nested for-loop detected; prefer Stream for inner iteration to reduce nesting.",
+                    snippet=candidate.strip(),
+                )
+            ]
+        return []
+
+
+class NoElseRule(LineRule):
+    name = RULE_NO_ELSE
+
+    def line_checks(self) -> list[LineCheck]:
+        return [LineCheck(self._check_line, literals=("else",))]
+
+    def _check_line(self, scan: LineScan) -> list[Violation] | None:
+        line = scan.masked
+        if line == "":
+            return None
+        if ELSE_PATTERN.search(line) is None:
+            return None
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_ERROR,
+                file=scan.rel_path,
+                line=scan.index,
+                reason="else/else-if is forbidden. Use guard clauses and early return.",
+                snippet=scan.stripped,
+            )
+        ]
+
+
+class ExceptionSerialVersionUidRule(Rule):
+    name = RULE_EXCEPTION_SERIAL_VERSION_UID
+    tag_filter = TagFilter(all_of=(TAG_EXCEPTION_LAYER,))
+    required_literals = ("Exception",)
+
+    def check(self, file_ctx: FileContext, project_ctx: ProjectContext) -> Iterable[Violation]:
+        if EXCEPTION_CLASS_PATTERN.search(file_ctx.text) is None:
+            return []
+        if SERIAL_VERSION_UID_PATTERN.search(file_ctx.text) is not None:
+            return []
+        line = first_line_regex(file_ctx.lines, r"\bclass\s+[A-Z]\w*Exception\b")
+        return [
+            Violation(
+                rule=self.name,
+                severity=SEVERITY_ERROR,
+                file=file_ctx.rel_path,
+                line=line if line > 0 else 1,
+                reason="Exception class must declare static final long serialVersionUID.",
+                snippet=file_ctx.lines[line - 1].strip() if line > 0 else file_ctx.rel_path,
+            )
+        ]
+
+
+def _indent_level(line: str) -> int:
+    count = 0
+    for char in line:
+        if char == " ":
+            count += 1
+            continue
+        if char == "\t":
+            count += 4
+            continue
+        break
+    return count
+
+
+def build_rules() -> list[Rule]:
+    return [
+        MaxClassLinesRule(),
+        NestedForShouldUseStreamRule(),
+        NoElseRule(),
+        ExceptionSerialVersionUidRule(),
+    ]
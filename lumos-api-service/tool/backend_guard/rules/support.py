@@ -0,0 +1,112 @@
+"""
+Helpers and patterns shared by the rule modules.
+"""
+
+from __future__ import annotations
+
+import bisect
+import re
+
+from ..core import FileContext
+
+
+MAPPING_ANNOTATION_PATTERN = re.compile(r"^\s*@\s*(GetMapping|PostMapping|PutMapping|PatchMapping|DeleteMapping)\b")
+FOR_PATTERN = re.compile(r"^\s*for\s*\(")
+AUDIT_FIELD_DECLARATION_PATTERN = re.compile(
+    r"\b(createdAt|updatedAt|deletedAt|deleted|isDeleted)\b"
+)
+
+
+def first_line_of(lines: list[str], token: str) -> int:
+    for index, raw in enumerate(lines, start=1):
+        if token in raw:
+            return index
+    return -1
+
+
+def first_line_by_contains_any(lines: list[str], tokens: list[str]) -> int:
+    for index, raw in enumerate(lines, start=1):
+        for token in tokens:
+            if token in raw:
+                return index
+    return -1
+
+
+def first_line_regex(lines: list[str], regex: str) -> int:
+    pattern = re.compile(regex)
+    for index, raw in enumerate(lines, start=1):
+        if pattern.search(raw) is not None:
+            return index
+    return -1
+
+
+def line_for_offset(file_ctx: FileContext, offset: int) -> int:
+    return max(1, bisect.bisect_right(file_ctx.line_starts, offset))
+
+
+def next_non_blank_lines(file_ctx: FileContext, start_line: int, limit: int) -> list[tuple[int, str]]:
+    return file_ctx.line_index.next_non_blank(start_line, limit)
+
+
+def previous_non_blank_lines(file_ctx: FileContext, start_line: int, limit: int) -> list[tuple[int, str]]:
+    return file_ctx.line_index.previous_non_blank(start_line, limit)
+
+
+def collect_annotation_block(file_ctx: FileContext, start_line: int, max_lines: int) -> str:
+    lines = file_ctx.lines
+    # Parentheses inside comments, strings and text blocks do not delimit the annotation.
+    masked_lines = file_ctx.lexed.masked_lines
+    parts: list[str] = []
+    open_paren = 0
+    seen_paren = False
+    index = start_line - 1
+    end = min(len(lines), index + max_lines)
+    while index < end:
+        parts.append(lines[index])
+        masked = masked_lines[index]
+        open_paren += masked.count("(")
+        open_paren -= masked.count(")")
+        if masked.count("(") > 0:
+            seen_paren = True
+        if seen_paren and open_paren <= 0:
+            break
+        if not seen_paren and index > start_line - 1:
+            break
+        index += 1
+    return " ".join(parts)
+
+
+def detect_primary_class_name(lines: list[str]) -> str:
+    class_pattern = re.compile(r"\bclass\s+([A-Z]\w*)\b")
+    for raw in lines:
+        match = class_pattern.search(raw)
+        if match is None:
+            continue
+        return match.group(1)
+    return ""
+
+
+def find_audit_field_lines(file_ctx: FileContext) -> list[tuple[int, str]]:
+    matches: list[tuple[int, str]] = []
+    for index, (raw, masked) in enumerate(zip(file_ctx.lines, file_ctx.lexed.masked_lines), start=1):
+        stripped = masked.strip()
+        if stripped == "":
+            continue
+        if AUDIT_FIELD_DECLARATION_PATTERN.search(stripped) is None:
+            continue
+        if "class " in stripped:
+            continue
+        matches.append((index, raw))
+    return matches
+
+
+def has_javadoc_above(file_ctx: FileContext, start_line: int, max_lookback: int) -> bool:
+    return file_ctx.line_index.has_javadoc_above(start_line, max_lookback)
+
+
+def has_comment_above(file_ctx: FileContext, start_line: int, max_lookback: int) -> bool:
+    return file_ctx.line_index.has_comment_above(start_line, max_lookback)
+
+
+def extract_javadoc_above(file_ctx: FileContext, start_line: int, max_lookback: int) -> str:
+    return file_ctx.line_index.javadoc_above(start_line, max_lookback)
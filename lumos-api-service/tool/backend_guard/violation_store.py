@@ -0,0 +1,93 @@
+"""
+Columnar, interned storage for large violation sets.
+
+Rule, severity, file and reason strings repeat across thousands of
+violations, so each is stored once in a string table and referenced by index
+from compact arrays. Only the line number and snippet are kept per violation.
+Violations are added in groups, one per checked file, and are turned back
+into objects only when a group is read.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Callable, Iterable, Iterator, Protocol
+
+
+class StoredViolation(Protocol):
+    rule: str
+    severity: str
+    file: str
+    line: int
+    reason: str
+    snippet: str
+
+
+class StringTable:
+    def __init__(self) -> None:
+        self.values: list[str] = []
+        self._ids: dict[str, int] = {}
+
+    def intern(self, value: str) -> int:
+        found = self._ids.get(value)
+        if found is not None:
+            return found
+        found = len(self.values)
+        self.values.append(value)
+        self._ids[value] = found
+        return found
+
+
+class ViolationStore:
+    def __init__(self, factory: Callable[..., StoredViolation]) -> None:
+        self._factory = factory
+        self.rules = StringTable()
+        self.severities = StringTable()
+        self.files = StringTable()
+        self.reasons = StringTable()
+        self._rule_ids = array("I")
+        self._severity_ids = array("B")
+        self._file_ids = array("I")
+        self._reason_ids = array("I")
+        self._lines = array("i")
+        self._snippets: list[str] = []
+        # Group i spans [_group_starts[i], _group_starts[i + 1]).
+        self._group_starts = array("I", [0])
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def __iter__(self) -> Iterator[StoredViolation]:
+        for position in range(len(self)):
+            yield self._materialize(position)
+
+    @property
+    def group_count(self) -> int:
+        return len(self._group_starts) - 1
+
+    def add_group(self, violations: Iterable[StoredViolation]) -> None:
+        for violation in violations:
+            self._rule_ids.append(self.rules.intern(violation.rule))
+            self._severity_ids.append(self.severities.intern(violation.severity))
+            self._file_ids.append(self.files.intern(violation.file))
+            self._reason_ids.append(self.reasons.intern(violation.reason))
+            self._lines.append(violation.line)
+            self._snippets.append(violation.snippet)
+        self._group_starts.append(len(self._lines))
+
+    def group(self, index: int) -> list[StoredViolation]:
+        return [self._materialize(position) for position in range(self._group_starts[index], self._group_starts[index + 1])]
+
+    def groups(self) -> Iterator[list[StoredViolation]]:
+        for index in range(self.group_count):
+            yield self.group(index)
+
+    def _materialize(self, position: int) -> StoredViolation:
+        return self._factory(
+            rule=self.rules.values[self._rule_ids[position]],
+            severity=self.severities.values[self._severity_ids[position]],
+            file=self.files.values[self._file_ids[position]],
+            line=self._lines[position],
+            reason=self.reasons.values[self._reason_ids[position]],
+            snippet=self._snippets[position],
+        )
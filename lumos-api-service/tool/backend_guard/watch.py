@@ -0,0 +1,156 @@
+"""
+Watch-mode plumbing: mtime polling and a local Unix socket protocol.
+
+The daemon answers one JSON request per connection with one JSON document.
+The client side does not import the rule modules, so a query costs little
+more than interpreter startup.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable
+
+
+DEFAULT_SOCKET_FILE = ".backend_guard.sock"
+QUERY_TIMEOUT_SECONDS = 120.0
+COMMAND_CHECK = "check"
+COMMAND_STOP = "stop"
+
+
+@dataclass(frozen=True)
+class FileStamp:
+    mtime_ns: int
+    size: int
+
+
+def stamp_files(root: Path, rel_paths: Iterable[str]) -> dict[str, FileStamp]:
+    stamps: dict[str, FileStamp] = {}
+    base = str(root)
+    for rel_path in rel_paths:
+        try:
+            stat = os.stat(os.path.join(base, rel_path))
+        except OSError:
+            continue
+        stamps[rel_path] = FileStamp(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+    return stamps
+
+
+def diff_stamps(
+    before: dict[str, FileStamp],
+    after: dict[str, FileStamp],
+) -> tuple[list[str], list[str], list[str]]:
+    added = sorted(rel_path for rel_path in after if rel_path not in before)
+    modified = sorted(rel_path for rel_path, stamp in after.items() if rel_path in before and before[rel_path] != stamp)
+    deleted = sorted(rel_path for rel_path in before if rel_path not in after)
+    return added, modified, deleted
+
+
+def supports_unix_sockets() -> bool:
+    return hasattr(socket, "AF_UNIX")
+
+
+def resolve_socket_path(root: Path, raw_value: str) -> Path:
+    if raw_value.strip() == "":
+        return root / DEFAULT_SOCKET_FILE
+    return Path(raw_value).resolve()
+
+
+class GuardSocketServer:
+    def __init__(self, path: Path, handle: Callable[[dict], dict]) -> None:
+        self.path = path
+        self.stopped = threading.Event()
+        self._handle = handle
+        self._server: socketserver.UnixStreamServer | None = None
+
+    def start(self) -> None:
+        if self.path.exists():
+            if _is_listening(self.path):
+                raise OSError(f"a backend guard daemon is already listening on {self.path}")
+            self.path.unlink()
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                line = self.rfile.readline()
+                if line.strip() == b"":
+                    # Liveness probes connect and close without a request.
+                    return
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    request = {}
+                response = server._dispatch(request if isinstance(request, dict) else {})
+                self.wfile.write(json.dumps(response, ensure_ascii=True).encode("utf-8") + b"\n")
+
+        self._server = socketserver.UnixStreamServer(str(self.path), Handler)
+        threading.Thread(target=self._server.serve_forever, name="backend-guard-socket", daemon=True).start()
+
+    def close(self) -> None:
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        try:
+            self.path.unlink()
+        except OSError:
+            return
+
+    def _dispatch(self, request: dict) -> dict:
+        if request.get("command") == COMMAND_STOP:
+            self.stopped.set()
+            return {"output": ["Backend guard daemon stopping."], "exit_code": 0}
+        return self._handle(request)
+
+
+def send_request(path: Path, request: dict) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(QUERY_TIMEOUT_SECONDS)
+        client.connect(str(path))
+        client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with client.makefile("rb") as stream:
+            return json.loads(stream.readline())
+
+
+def run_query(socket_path: Path, command: str = COMMAND_CHECK) -> int:
+    if not supports_unix_sockets():
+        print("Querying a backend guard daemon requires Unix domain sockets.")
+        return 1
+    try:
+        response = send_request(socket_path, {"command": command})
+    except (OSError, ValueError) as error:
+        print(f"Unable to reach the backend guard daemon at {socket_path}: {error}")
+        return 1
+    for line in response.get("output", []):
+        print(line)
+    return int(response.get("exit_code", 1))
+
+
+def query_main() -> int:
+    # Mirrors the --root, --socket and --query/--stop-daemon options of the full
+    # parser without importing it.
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--root", default=".")
+    parser.add_argument("--socket", default="")
+    parser.add_argument("--query", action="store_true")
+    parser.add_argument("--stop-daemon", action="store_true")
+    args, _ = parser.parse_known_args()
+    socket_path = resolve_socket_path(Path(args.root).resolve(), args.socket)
+    return run_query(socket_path, COMMAND_STOP if args.stop_daemon else COMMAND_CHECK)
+
+
+def _is_listening(path: Path) -> bool:
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            probe.connect(str(path))
+    except OSError:
+        return False
+    return True
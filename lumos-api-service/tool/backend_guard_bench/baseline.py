@@ -0,0 +1,81 @@
+"""
+Comparison of a benchmark result against a stored baseline.
+
+A metric regresses when it is worse than the baseline by more than the
+tolerance. Rules that take less than MIN_RULE_SECONDS in both results are
+skipped, because their timings are mostly noise.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+DEFAULT_TOLERANCE = 0.15
+MIN_RULE_SECONDS = 0.005
+# (metric, label, higher is better)
+END_TO_END_METRICS = (
+    ("wall_seconds", "wall time", False),
+    ("cpu_seconds", "CPU time", False),
+    ("peak_rss_kb", "peak RSS", False),
+    ("violations_per_second", "violations/sec", True),
+)
+
+
+@dataclass(frozen=True)
+class MetricChange:
+    metric: str
+    baseline: float
+    current: float
+    higher_is_better: bool
+
+    @property
+    def ratio(self) -> float:
+        if self.baseline == 0:
+            return 1.0 if self.current == 0 else float("inf")
+        return self.current / self.baseline
+
+    def regressed(self, tolerance: float) -> bool:
+        if self.higher_is_better:
+            return self.ratio < 1.0 - tolerance
+        return self.ratio > 1.0 + tolerance
+
+
+def compare_results(baseline: dict, current: dict) -> list[MetricChange]:
+    changes: list[MetricChange] = []
+    for key, label, higher_is_better in END_TO_END_METRICS:
+        before = baseline.get("end_to_end", {}).get(key)
+        after = current.get("end_to_end", {}).get(key)
+        if before is None or after is None:
+            continue
+        changes.append(MetricChange(label, float(before), float(after), higher_is_better))
+
+    before_rules = baseline.get("rules", {})
+    after_rules = current.get("rules", {})
+    for name in sorted(set(before_rules) & set(after_rules)):
+        before, after = float(before_rules[name]), float(after_rules[name])
+        if max(before, after) < MIN_RULE_SECONDS:
+            continue
+        changes.append(MetricChange(f"rule {name}", before, after, False))
+    return changes
+
+
+def format_changes(changes: list[MetricChange], tolerance: float) -> list[str]:
+    lines = []
+    for change in changes:
+        status = "REGRESSED" if change.regressed(tolerance) else "ok"
+        lines.append(
+            f"{status:>9}  {change.metric}: {change.baseline:.4g} -> {change.current:.4g} ({change.ratio - 1.0:+.1%})"
+        )
+    return lines
+
+
+def corpus_mismatch(baseline: dict, current: dict) -> str | None:
+    before = baseline.get("corpus", {})
+    after = current.get("corpus", {})
+    if before.get("java_files") == after.get("java_files") and before.get("bytes") == after.get("bytes"):
+        return None
+    return (
+        f"corpus differs from the baseline: {before.get('java_files')} files/{before.get('bytes')} bytes "
+        f"vs {after.get('java_files')} files/{after.get('bytes')} bytes"
+    )
@@ -0,0 +1,569 @@
+"""
+Synthetic Spring Boot corpus generator for guard benchmarks.
+
+Each feature contributes a controller, a service interface and implementation,
+an entity, a repository with `@Query` text blocks, request and response DTOs,
+a MapStruct mapper, an exception and a service test. A seeded share of the
+features carries typical checklist defects so every rule family has work to
+do. The same seed and size always produce the same tree.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from string import Template
+
+
+BASE_PACKAGE = "com.lumos"
+MAIN_JAVA = "src/main/java"
+TEST_JAVA = "src/test/java"
+RESOURCES = "src/main/resources"
+FEATURES_PER_MODULE = 25
+DEFAULT_DEFECT_RATE = 0.3
+# Written first into every generated tree, so `generate` only ever replaces
+# a directory it made itself.
+CORPUS_MARKER = ".backend_guard_bench_corpus"
+FEATURE_NOUNS = (
+    "account", "booking", "card", "deck", "invoice", "lesson", "note", "order",
+    "payment", "profile", "quiz", "review", "schedule", "session", "tag", "topic",
+)
+DEFECTS = (
+    "else_branch",
+    "direct_trim",
+    "string_equals",
+    "entity_data",
+    "lowercase_query",
+    "missing_serial",
+    "missing_operation",
+    "hardcoded_message",
+    "uncommented_if",
+    "eager_relation",
+)
+
+
+@dataclass(frozen=True)
+class CorpusSummary:
+    root: Path
+    java_files: int
+    features: int
+    defective_features: int
+    bytes_written: int
+
+
+@dataclass(frozen=True)
+class _Feature:
+    package: str
+    path: str
+    name: str
+    table: str
+    key: str
+    defects: frozenset[str]
+
+
+def parse_file_count(raw_value: str) -> int:
+    value = raw_value.strip().lower()
+    multiplier = 1
+    if value.endswith("k"):
+        multiplier = 1000
+        value = value[:-1]
+    try:
+        count = int(float(value) * multiplier)
+    except (ValueError, OverflowError):
+        raise ValueError(f"not a file count: {raw_value}") from None
+    if count <= 0:
+        raise ValueError(f"file count must be positive: {raw_value}")
+    return count
+
+
+def generate_corpus(target: Path, java_files: int, seed: int = 0, defect_rate: float = DEFAULT_DEFECT_RATE) -> CorpusSummary:
+    rng = random.Random(seed)
+    # ErrorMessageKeys.java and the shared files come first, then whole features.
+    feature_count = max(1, -(-(java_files - 1 - len(_SHARED_FILES)) // len(_FEATURE_FILES)))
+    features = [_make_feature(index, rng, defect_rate) for index in range(feature_count)]
+
+    _write(target / CORPUS_MARKER, f"seed={seed} files={java_files} defect_rate={defect_rate}\n")
+    written = _write_bundles(target, features)
+    files = 1
+    for rel_path, template in _SHARED_FILES:
+        written += _write(target / MAIN_JAVA / rel_path, template.substitute(base=BASE_PACKAGE))
+        files += 1
+    for feature in features:
+        for source_root, rel_dir, suffix, render in _FEATURE_FILES:
+            if files >= java_files:
+                break
+            rel_path = f"{source_root}/{feature.path}/{rel_dir}/{_class_name(feature.name)}{suffix}.java"
+            written += _write(target / rel_path, render(feature))
+            files += 1
+    return CorpusSummary(
+        root=target,
+        java_files=files,
+        features=len(features),
+        defective_features=sum(1 for feature in features if len(feature.defects) > 0),
+        bytes_written=written,
+    )
+
+
+def _make_feature(index: int, rng: random.Random, defect_rate: float) -> _Feature:
+    noun = FEATURE_NOUNS[index % len(FEATURE_NOUNS)]
+    name = f"{noun}{index // len(FEATURE_NOUNS)}"
+    module = f"m{index // FEATURES_PER_MODULE}"
+    defects: frozenset[str] = frozenset()
+    if rng.random() < defect_rate:
+        defects = frozenset(rng.sample(DEFECTS, rng.randint(1, 3)))
+    package = f"{BASE_PACKAGE}.{module}.{name}"
+    return _Feature(
+        package=package,
+        path=package.replace(".", "/"),
+        name=name,
+        table=f"{noun}_{index}",
+        key=f"error.{name}.not-found",
+        defects=defects,
+    )
+
+
+def _class_name(name: str) -> str:
+    return name[:1].upper() + name[1:]
+
+
+def _write(path: Path, text: str) -> int:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = text.encode("utf-8")
+    path.write_bytes(data)
+    return len(data)
+
+
+def _write_bundles(target: Path, features: list[_Feature]) -> int:
+    keys = [(f"{feature.name.upper()}_NOT_FOUND", feature.key) for feature in features]
+    constants = "\n".join(f'    public static final String {constant} = "{key}";' for constant, key in keys)
+    written = _write(
+        target / MAIN_JAVA / "com/lumos/common/error/ErrorMessageKeys.java",
+        _ERROR_KEYS.substitute(base=BASE_PACKAGE, constants=constants),
+    )
+    bundles = {
+        "messages.properties": "{name} was not found.",
+        "messages_en.properties": "{name} was not found.",
+        "messages_vi.properties": "Không tìm thấy {name}.",
+    }
+    for file_name, message in bundles.items():
+        lines = [f"{key}={message.format(name=key.split('.')[1])}" for _, key in keys]
+        written += _write(target / RESOURCES / file_name, "\n".join(lines) + "\n")
+    return written
+
+
+def _render_controller(feature: _Feature) -> str:
+    operation = "" if "missing_operation" in feature.defects else '    @Operation(summary = "Get by id")\n'
+    return _CONTROLLER.substitute(_fields(feature), operation=operation)
+
+
+def _render_service(feature: _Feature) -> str:
+    return _SERVICE.substitute(_fields(feature))
+
+
+def _render_service_impl(feature: _Feature) -> str:
+    fields = _fields(feature)
+    guard_comment = "" if "uncommented_if" in feature.defects else "        // Reject blank codes before touching the repository.\n"
+    if "direct_trim" in feature.defects:
+        normalize = "        String normalized = code.trim();\n"
+    else:
+        normalize = "        String normalized = StringUtils.trim(code);\n"
+    if "string_equals" in feature.defects:
+        compare = "StringUtils.equals(normalized, ARCHIVED_CODE)"
+    else:
+        compare = "Strings.CS.equals(normalized, ARCHIVED_CODE)"
+    message = f'"{feature.name} not found"' if "hardcoded_message" in feature.defects else f"ErrorMessageKeys.{feature.name.upper()}_NOT_FOUND"
+    if "else_branch" in feature.defects:
+        branch = (
+            "        // Archived records resolve to the default response.\n"
+            f"        if ({compare}) {{\n"
+            "            // Nothing to map for archived codes.\n"
+            "            return Optional.empty();\n"
+            "        } else {\n"
+            "            // Active records fall through to the lookup.\n"
+            "            return repository.findActiveByCode(normalized).map(mapper::toResponse);\n"
+            "        }\n"
+        )
+    else:
+        branch = (
+            "        // Archived records resolve to the default response.\n"
+            f"        if ({compare}) {{\n"
+            "            // Nothing to map for archived codes.\n"
+            "            return Optional.empty();\n"
+            "        }\n"
+            "        // Active records are mapped through MapStruct.\n"
+            "        return repository.findActiveByCode(normalized).map(mapper::toResponse);\n"
+        )
+    return _SERVICE_IMPL.substitute(fields, guard_comment=guard_comment, normalize=normalize, branch=branch, message=message)
+
+
+def _render_entity(feature: _Feature) -> str:
+    lombok = "@Data\n" if "entity_data" in feature.defects else "@Getter\n@Setter\n"
+    fetch = "" if "eager_relation" in feature.defects else "fetch = FetchType.LAZY"
+    return _ENTITY.substitute(_fields(feature), lombok=lombok, fetch=fetch)
+
+
+def _render_repository(feature: _Feature) -> str:
+    if "lowercase_query" in feature.defects:
+        query = f"select * from {feature.table} where code = :code and deleted = false"
+    else:
+        query = f"SELECT * FROM {feature.table} WHERE code = :code AND deleted = FALSE"
+    return _REPOSITORY.substitute(_fields(feature), query=query)
+
+
+def _render_request(feature: _Feature) -> str:
+    return _REQUEST.substitute(_fields(feature))
+
+
+def _render_response(feature: _Feature) -> str:
+    return _RESPONSE.substitute(_fields(feature))
+
+
+def _render_mapper(feature: _Feature) -> str:
+    return _MAPPER.substitute(_fields(feature))
+
+
+def _render_exception(feature: _Feature) -> str:
+    serial = "" if "missing_serial" in feature.defects else "    private static final long serialVersionUID = 1L;\n\n"
+    return _EXCEPTION.substitute(_fields(feature), serial=serial)
+
+
+def _render_test(feature: _Feature) -> str:
+    return _TEST.substitute(_fields(feature))
+
+
+def _fields(feature: _Feature) -> dict[str, str]:
+    return {
+        "base": BASE_PACKAGE,
+        "package": feature.package,
+        "name": feature.name,
+        "Name": _class_name(feature.name),
+        "table": feature.table,
+        "KEY": f"{feature.name.upper()}_NOT_FOUND",
+    }
+
+
+_BASE_ENTITY = Template('''package $base.common.entity;
+
+import jakarta.persistence.Column;
+import jakarta.persistence.MappedSuperclass;
+import jakarta.persistence.PrePersist;
+import jakarta.persistence.PreUpdate;
+import java.time.Instant;
+import lombok.Getter;
+import lombok.Setter;
+
+@Getter
+@Setter
+@MappedSuperclass
+public abstract class BaseAuditEntity {
+
+    @Column(name = "created_at", nullable = false)
+    private Instant createdAt;
+
+    @Column(name = "updated_at", nullable = false)
+    private Instant updatedAt;
+
+    @Column(name = "deleted", nullable = false)
+    private boolean deleted;
+
+    @PrePersist
+    protected void onCreate() {
+        createdAt = Instant.now();
+        updatedAt = createdAt;
+    }
+
+    @PreUpdate
+    protected void onUpdate() {
+        updatedAt = Instant.now();
+    }
+}
+''')
+
+_ERROR_KEYS = Template('''package $base.common.error;
+
+public final class ErrorMessageKeys {
+
+$constants
+
+    private ErrorMessageKeys() {
+    }
+}
+''')
+
+_CONTROLLER = Template('''package $package.controller;
+
+import io.swagger.v3.oas.annotations.Operation;
+import io.swagger.v3.oas.annotations.tags.Tag;
+import $package.dto.response.${Name}Response;
+import $package.service.${Name}Service;
+import lombok.RequiredArgsConstructor;
+import org.springframework.http.ResponseEntity;
+import org.springframework.web.bind.annotation.GetMapping;
+import org.springframework.web.bind.annotation.PathVariable;
+import org.springframework.web.bind.annotation.RequestMapping;
+import org.springframework.web.bind.annotation.RestController;
+
+/**
+ * HTTP endpoints for ${name} records.
+ */
+@Tag(name = "${Name}")
+@RestController
+@RequiredArgsConstructor
+@RequestMapping("/api/v1/${name}s")
+public class ${Name}Controller {
+
+    private final ${Name}Service ${name}Service;
+
+    /**
+     * Returns one ${name} by its business code.
+     */
+$operation    @GetMapping("/{code}")
+    public ResponseEntity<${Name}Response> get(@PathVariable String code) {
+        // Missing codes surface as 404 through the exception handler.
+        return ResponseEntity.of(${name}Service.findByCode(code));
+    }
+}
+''')
+
+_SERVICE = Template('''package $package.service;
+
+import $package.dto.response.${Name}Response;
+import java.util.Optional;
+
+public interface ${Name}Service {
+
+    /**
+     * Finds an active ${name} by its business code.
+     *
+     * @param code business code of the ${name}
+     * @return the mapped ${name}, or empty when it is archived or missing
+     */
+    Optional<${Name}Response> findByCode(String code);
+}
+''')
+
+_SERVICE_IMPL = Template('''package $package.service.impl;
+
+import $base.common.error.ErrorMessageKeys;
+import $package.dto.response.${Name}Response;
+import $package.exception.${Name}NotFoundException;
+import $package.mapper.${Name}Mapper;
+import $package.repository.${Name}Repository;
+import $package.service.${Name}Service;
+import java.util.Optional;
+import lombok.RequiredArgsConstructor;
+import org.apache.commons.lang3.StringUtils;
+import org.apache.commons.lang3.Strings;
+import org.springframework.stereotype.Service;
+import org.springframework.transaction.annotation.Transactional;
+
+@Service
+@RequiredArgsConstructor
+public class ${Name}ServiceImpl implements ${Name}Service {
+
+    private static final String ARCHIVED_CODE = "ARCHIVED";
+
+    private final ${Name}Repository repository;
+    private final ${Name}Mapper mapper;
+
+    /**
+     * Finds an active ${name} by its business code.
+     *
+     * @param code business code of the ${name}
+     * @return the mapped ${name}, or empty when it is archived or missing
+     */
+    @Override
+    @Transactional(readOnly = true)
+    public Optional<${Name}Response> findByCode(String code) {
+$guard_comment        if (StringUtils.isBlank(code)) {
+            // Blank codes can never match a stored record.
+            throw new ${Name}NotFoundException($message);
+        }
+$normalize$branch    }
+}
+''')
+
+_ENTITY = Template('''package $package.entity;
+
+import $base.common.entity.BaseAuditEntity;
+import jakarta.persistence.Column;
+import jakarta.persistence.Entity;
+import jakarta.persistence.EnumType;
+import jakarta.persistence.Enumerated;
+import jakarta.persistence.FetchType;
+import jakarta.persistence.GeneratedValue;
+import jakarta.persistence.GenerationType;
+import jakarta.persistence.Id;
+import jakarta.persistence.JoinColumn;
+import jakarta.persistence.ManyToOne;
+import jakarta.persistence.Table;
+import jakarta.persistence.Version;
+import lombok.Data;
+import lombok.Getter;
+import lombok.Setter;
+
+${lombok}@Entity
+@Table(name = "${table}")
+public class ${Name}Entity extends BaseAuditEntity {
+
+    @Id
+    @GeneratedValue(strategy = GenerationType.IDENTITY)
+    private Long id;
+
+    @Column(name = "code", nullable = false, unique = true)
+    private String code;
+
+    @Enumerated(EnumType.STRING)
+    @Column(name = "status", nullable = false)
+    private ${Name}Status status;
+
+    @ManyToOne($fetch)
+    @JoinColumn(name = "owner_id")
+    private ${Name}Entity owner;
+
+    @Version
+    private Long version;
+
+    public enum ${Name}Status {
+        ACTIVE,
+        ARCHIVED
+    }
+}
+''')
+
+_REPOSITORY = Template('''package $package.repository;
+
+import $package.entity.${Name}Entity;
+import java.util.Optional;
+import org.springframework.data.jpa.repository.JpaRepository;
+import org.springframework.data.jpa.repository.Query;
+import org.springframework.data.repository.query.Param;
+
+public interface ${Name}Repository extends JpaRepository<${Name}Entity, Long> {
+
+    @Query(
+        value = """
+            $query
+            """,
+        nativeQuery = true
+    )
+    Optional<${Name}Entity> findActiveByCode(@Param("code") String code);
+
+    @Query(
+        value = """
+            SELECT COUNT(*) FROM ${table}
+            WHERE owner_id = :ownerId AND deleted = FALSE
+            """,
+        nativeQuery = true
+    )
+    long countActiveByOwnerId(@Param("ownerId") Long ownerId);
+}
+''')
+
+_REQUEST = Template('''package $package.dto.request;
+
+import jakarta.validation.constraints.NotBlank;
+import jakarta.validation.constraints.Size;
+import lombok.Builder;
+
+@Builder
+public record ${Name}CreateRequest(
+    @NotBlank(message = ValidationMessages.REQUIRED) @Size(max = 64, message = ValidationMessages.TOO_LONG) String code,
+    @Size(max = 255, message = ValidationMessages.TOO_LONG) String description
+) {
+
+    public static final class ValidationMessages {
+        public static final String REQUIRED = "validation.required";
+        public static final String TOO_LONG = "validation.too-long";
+
+        private ValidationMessages() {
+        }
+    }
+}
+''')
+
+_RESPONSE = Template('''package $package.dto.response;
+
+import lombok.Builder;
+
+@Builder
+public record ${Name}Response(Long id, String code, String status) {
+}
+''')
+
+_MAPPER = Template('''package $package.mapper;
+
+import $package.dto.response.${Name}Response;
+import $package.entity.${Name}Entity;
+import org.mapstruct.Mapper;
+
+@Mapper(componentModel = "spring")
+public interface ${Name}Mapper {
+
+    ${Name}Response toResponse(${Name}Entity entity);
+}
+''')
+
+_EXCEPTION = Template('''package $package.exception;
+
+public class ${Name}NotFoundException extends RuntimeException {
+
+${serial}    public ${Name}NotFoundException(String messageKey) {
+        super(messageKey);
+    }
+}
+''')
+
+_TEST = Template('''package $package.service.impl;
+
+import static org.assertj.core.api.Assertions.assertThat;
+import static org.mockito.Mockito.when;
+
+import $package.mapper.${Name}Mapper;
+import $package.repository.${Name}Repository;
+import java.util.Optional;
+import org.junit.jupiter.api.Test;
+import org.junit.jupiter.api.extension.ExtendWith;
+import org.mockito.InjectMocks;
+import org.mockito.Mock;
+import org.mockito.junit.jupiter.MockitoExtension;
+
+@ExtendWith(MockitoExtension.class)
+class ${Name}ServiceImplTest {
+
+    @Mock
+    private ${Name}Repository repository;
+
+    @Mock
+    private ${Name}Mapper mapper;
+
+    @InjectMocks
+    private ${Name}ServiceImpl service;
+
+    @Test
+    void findByCodeReturnsEmptyWhenMissing() {
+        when(repository.findActiveByCode("A-1")).thenReturn(Optional.empty());
+
+        assertThat(service.findByCode("A-1")).isEmpty();
+    }
+}
+''')
+
+_SHARED_FILES = (
+    ("com/lumos/common/entity/BaseAuditEntity.java", _BASE_ENTITY),
+)
+
+# (source root, directory under the feature package, class suffix, renderer)
+_FEATURE_FILES = (
+    (MAIN_JAVA, "controller", "Controller", _render_controller),
+    (MAIN_JAVA, "service", "Service", _render_service),
+    (MAIN_JAVA, "service/impl", "ServiceImpl", _render_service_impl),
+    (MAIN_JAVA, "entity", "Entity", _render_entity),
+    (MAIN_JAVA, "repository", "Repository", _render_repository),
+    (MAIN_JAVA, "dto/request", "CreateRequest", _render_request),
+    (MAIN_JAVA, "dto/response", "Response", _render_response),
+    (MAIN_JAVA, "mapper", "Mapper", _render_mapper),
+    (MAIN_JAVA, "exception", "NotFoundException", _render_exception),
+    (TEST_JAVA, "service/impl", "ServiceImplTest", _render_test),
+)
@@ -0,0 +1,119 @@
+"""
+Benchmark runner for the backend guard.
+
+End-to-end numbers come from running the guard entry point in a child
+process: wall time, CPU time and peak RSS as reported by wait4, plus
+violations per second from the JSON report. Per-rule numbers come from
+checking the loaded corpus in process with one rule at a time, after every
+file has been lexed and indexed once, so each rule is charged only for its
+own work.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from backend_guard import core
+from backend_guard.discovery import SourceDiscovery
+from backend_guard.read_ahead import ReadStats
+from backend_guard.rules import load_rules
+
+
+RESULT_SCHEMA_VERSION = 1
+GUARD_SCRIPT = Path(__file__).resolve().parent.parent / "verify_backend_checklists.py"
+
+
+def run_benchmark(root: Path, repeat: int, guard_args: list[str], time_rules: bool = True) -> dict:
+    runs = [_run_guard_once(root, guard_args) for _ in range(max(1, repeat))]
+    wall = statistics.median(run["wall_seconds"] for run in runs)
+    violations = runs[-1]["violations"]
+    result = {
+        "schema": RESULT_SCHEMA_VERSION,
+        "python": platform.python_version(),
+        "guard_args": guard_args,
+        "corpus": _describe_corpus(root),
+        "end_to_end": {
+            "wall_seconds": wall,
+            "cpu_seconds": statistics.median(run["cpu_seconds"] for run in runs),
+            "peak_rss_kb": max(run["peak_rss_kb"] for run in runs),
+            "violations": violations,
+            "violations_per_second": violations / wall if wall > 0 else 0.0,
+            "runs": runs,
+        },
+        "rules": {},
+    }
+    if time_rules:
+        result["prepare_seconds"], result["rules"] = _time_rules(root)
+    return result
+
+
+def write_result(path: Path, result: dict) -> None:
+    path.write_text(json.dumps(result, ensure_ascii=True, indent=2) + "\n", encoding="utf-8")
+
+
+def load_result(path: Path) -> dict:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _run_guard_once(root: Path, guard_args: list[str]) -> dict:
+    command = [sys.executable, str(GUARD_SCRIPT), "--root", str(root), "--no-cache", *guard_args]
+    started = time.perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    # wait4 reports the usage of this child alone, unlike RUSAGE_CHILDREN.
+    _, status, usage = os.wait4(process.pid, 0)
+    wall = time.perf_counter() - started
+    process.returncode = os.waitstatus_to_exitcode(status)
+    return {
+        "wall_seconds": wall,
+        "cpu_seconds": usage.ru_utime + usage.ru_stime,
+        "peak_rss_kb": usage.ru_maxrss,
+        "violations": _report_total(root),
+        "exit_code": process.returncode,
+    }
+
+
+def _report_total(root: Path) -> int:
+    try:
+        payload = json.loads((root / core.REPORT_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return 0
+    return int(payload.get("summary", {}).get("total", 0))
+
+
+def _describe_corpus(root: Path) -> dict:
+    discovery = SourceDiscovery(root, core.JAVA_SOURCE_ROOTS, core.JAVA_EXTENSION, core.DEFAULT_EXCLUDE_GLOBS)
+    rel_paths = discovery.discover()
+    size = sum((root / rel_path).stat().st_size for rel_path in rel_paths)
+    return {"root": str(root), "java_files": len(rel_paths), "bytes": size}
+
+
+def _time_rules(root: Path) -> tuple[float, dict[str, float]]:
+    discovery = SourceDiscovery(root, core.JAVA_SOURCE_ROOTS, core.JAVA_EXTENSION, core.DEFAULT_EXCLUDE_GLOBS)
+    java_files = core.collect_java_files(discovery, core.DEFAULT_PREFETCH_DEPTH, ReadStats())
+    project_ctx = core.ProjectContext(root=root, java_files=java_files, strict=False, only_filters=set())
+
+    started = time.process_time()
+    for file_ctx in java_files:
+        file_ctx.lexed
+        file_ctx.line_index
+        file_ctx.tags
+    prepare = time.process_time() - started
+
+    timings: dict[str, float] = {}
+    for rule in load_rules():
+        started = time.process_time()
+        if isinstance(rule, core.ProjectRule):
+            core.run_project_rules([rule], project_ctx.index)
+        else:
+            engine = core.RuleEngine([rule])
+            for file_ctx in java_files:
+                engine.check(file_ctx, project_ctx)
+        timings[rule.name] = time.process_time() - started
+    return prepare, timings
@@ -0,0 +1,53 @@
+"""
+Start-up budget check for the backend guard.
+
+Each sample runs a fresh interpreter that imports the guard and loads the
+rules a selection needs, which is the fixed cost paid before the first file
+is read. The median over the samples is compared with a budget so a new
+eager import or an expensive module-level pattern fails the check.
+"""
+
+from __future__ import annotations
+
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+
+DEFAULT_STARTUP_BUDGET_MS = 60.0
+TOOL_DIR = Path(__file__).resolve().parent.parent
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from backend_guard import core
+imported = time.perf_counter()
+from backend_guard.rules import load_rules, resolve_selection
+only = set(sys.argv[1].split(",")) - {""}
+rules = load_rules(resolve_selection(only)) if only else load_rules()
+loaded = time.perf_counter()
+print(json.dumps({"import_ms": (imported - started) * 1000, "total_ms": (loaded - started) * 1000, "rules": len(rules)}))
+"""
+
+
+def measure_startup(only: str, repeat: int) -> dict:
+    samples = [_probe_once(only) for _ in range(max(1, repeat))]
+    return {
+        "only": only,
+        "rules": samples[-1]["rules"],
+        "import_ms": statistics.median(sample["import_ms"] for sample in samples),
+        "total_ms": statistics.median(sample["total_ms"] for sample in samples),
+    }
+
+
+def _probe_once(only: str) -> dict:
+    completed = subprocess.run(
+        [sys.executable, "-c", _PROBE, only],
+        cwd=TOOL_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout)
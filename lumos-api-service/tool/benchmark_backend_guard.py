@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Backend guard benchmark entrypoint.
+
+Run:
+  python tool/benchmark_backend_guard.py generate --files 10k --out /tmp/guard-bench-10k
+  python tool/benchmark_backend_guard.py run --root /tmp/guard-bench-10k --output bench.json
+  python tool/benchmark_backend_guard.py run --root /tmp/guard-bench-10k --baseline bench.json
+  python tool/benchmark_backend_guard.py compare bench.json bench-new.json
+  python tool/benchmark_backend_guard.py startup --only i18n --budget-ms 60
+"""
+
+import argparse
+import shlex
+import shutil
+import sys
+from pathlib import Path
+
+from backend_guard_bench.baseline import DEFAULT_TOLERANCE, compare_results, corpus_mismatch, format_changes
+from backend_guard_bench.corpus import CORPUS_MARKER, DEFAULT_DEFECT_RATE, generate_corpus, parse_file_count
+from backend_guard_bench.runner import load_result, run_benchmark, write_result
+from backend_guard_bench.startup import DEFAULT_STARTUP_BUDGET_MS, measure_startup
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the backend checklist guard.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="Write a synthetic Spring Boot corpus.")
+    generate.add_argument(
+        "--files",
+        type=_file_count,
+        default="1k",
+        help="Number of Java files, e.g. 1000, 10k or 100k. Default: 1k.",
+    )
+    generate.add_argument(
+        "--out",
+        required=True,
+        help="Target directory. An earlier generated corpus there is replaced; any other non-empty path needs --force.",
+    )
+    generate.add_argument("--force", action="store_true", help="Replace --out even if it is not a generated corpus.")
+    generate.add_argument("--seed", type=int, default=0, help="Random seed. Default: 0.")
+    generate.add_argument(
+        "--defect-rate",
+        type=float,
+        default=DEFAULT_DEFECT_RATE,
+        help=f"Share of features seeded with checklist defects. Default: {DEFAULT_DEFECT_RATE}.",
+    )
+
+    run = commands.add_parser("run", help="Time the guard on a corpus.")
+    run.add_argument("--root", required=True, help="Corpus root directory.")
+    run.add_argument("--repeat", type=int, default=3, help="End-to-end runs; the median is reported. Default: 3.")
+    run.add_argument("--guard-args", default="", help="Extra guard arguments, e.g. '--stream --jobs 4'.")
+    run.add_argument("--skip-rules", action="store_true", help="Skip the per-rule in-process timings.")
+    run.add_argument("--output", default="", help="Write the result JSON to this path.")
+    run.add_argument("--baseline", default="", help="Compare against a stored result and fail on regressions.")
+    run.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help=f"Allowed slowdown. Default: {DEFAULT_TOLERANCE}.")
+
+    compare = commands.add_parser("compare", help="Compare two stored results.")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help=f"Allowed slowdown. Default: {DEFAULT_TOLERANCE}.")
+
+    startup = commands.add_parser("startup", help="Time importing the guard and loading its rules.")
+    startup.add_argument("--only", default="", help="Rule ids or groups to load, as for the guard's --only. Default: every rule.")
+    startup.add_argument("--repeat", type=int, default=5, help="Fresh interpreters to time; the median is reported. Default: 5.")
+    startup.add_argument(
+        "--budget-ms",
+        type=float,
+        default=DEFAULT_STARTUP_BUDGET_MS,
+        help=f"Fail when the median start-up exceeds this many milliseconds. Default: {DEFAULT_STARTUP_BUDGET_MS:g}.",
+    )
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        target = Path(args.out).resolve()
+        if target.is_file() or (target.is_dir() and any(target.iterdir())):
+            if not args.force and not (target / CORPUS_MARKER).is_file():
+                parser.error(f"{target} is not a generated corpus ({CORPUS_MARKER} is missing); pass --force to replace it.")
+            if target.is_dir():
+                shutil.rmtree(target)
+            else:
+                target.unlink()
+        summary = generate_corpus(target, args.files, args.seed, args.defect_rate)
+        print(
+            f"Generated {summary.java_files} Java files ({summary.features} features, "
+            f"{summary.defective_features} with defects, {summary.bytes_written} bytes) in {summary.root}"
+        )
+        return 0
+
+    if args.command == "run":
+        result = run_benchmark(Path(args.root).resolve(), args.repeat, shlex.split(args.guard_args), not args.skip_rules)
+        _print_result(result)
+        if args.output != "":
+            write_result(Path(args.output), result)
+        if args.baseline == "":
+            return 0
+        return _report_comparison(load_result(Path(args.baseline)), result, args.tolerance)
+
+    if args.command == "startup":
+        result = measure_startup(args.only, args.repeat)
+        print(
+            f"Start-up ({args.only or 'every rule'}, {result['rules']} rules): "
+            f"import={result['import_ms']:.1f}ms, total={result['total_ms']:.1f}ms, budget={args.budget_ms:g}ms"
+        )
+        if result["total_ms"] > args.budget_ms:
+            print("Start-up exceeds the budget.")
+            return 1
+        return 0
+
+    return _report_comparison(load_result(Path(args.baseline)), load_result(Path(args.current)), args.tolerance)
+
+
+def _file_count(raw_value: str) -> int:
+    try:
+        return parse_file_count(raw_value)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error)) from None
+
+
+def _print_result(result: dict) -> None:
+    corpus = result["corpus"]
+    end_to_end = result["end_to_end"]
+    print(f"Corpus: {corpus['java_files']} files, {corpus['bytes']} bytes")
+    print(
+        f"End to end: wall={end_to_end['wall_seconds']:.3f}s, cpu={end_to_end['cpu_seconds']:.3f}s, "
+        f"peak_rss={end_to_end['peak_rss_kb']} KB, violations={end_to_end['violations']} "
+        f"({end_to_end['violations_per_second']:.0f}/s)"
+    )
+    if len(result["rules"]) == 0:
+        return
+    print(f"Lex and index: {result['prepare_seconds']:.3f}s")
+    for name, seconds in sorted(result["rules"].items(), key=lambda item: -item[1]):
+        print(f"  {seconds:8.4f}s  {name}")
+
+
+def _report_comparison(baseline: dict, current: dict, tolerance: float) -> int:
+    mismatch = corpus_mismatch(baseline, current)
+    if mismatch is not None:
+        print(f"Warning: {mismatch}")
+    changes = compare_results(baseline, current)
+    for line in format_changes(changes, tolerance):
+        print(line)
+    regressions = [change for change in changes if change.regressed(tolerance)]
+    if len(regressions) > 0:
+        print(f"{len(regressions)} metric(s) regressed beyond {tolerance:.0%}.")
+        return 1
+    print("No regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,9 +5,17 @@ Backend checklist guard entrypoint.
 Run:
   python tool/verify_backend_checklists.py
   python tool/verify_backend_checklists.py --strict
+  python tool/verify_backend_checklists.py --watch
+  python tool/verify_backend_checklists.py --query
 """
 
-from backend_guard.core import main
+import sys
+
+if "--query" in sys.argv[1:] or "--stop-daemon" in sys.argv[1:]:
+    # Daemon clients skip loading the rules, so a query answers in milliseconds.
+    from backend_guard.watch import query_main as main
+else:
+    from backend_guard.core import main
 
 
 if __name__ == "__main__":